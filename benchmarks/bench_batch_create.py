@@ -0,0 +1,68 @@
+"""
+Compares creating combination shape keys one at a time, as the New Combination operator did
+before batch creation, against the batch creation API.
+
+    blender -b --factory-startup --python benchmarks/bench_batch_create.py -- [--combinations N] [--drivers D]
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import common
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--shapes", type=int, default=100)
+    parser.add_argument("--combinations", type=int, default=200)
+    parser.add_argument("--drivers", type=int, default=2)
+    args = parser.parse_args(common.script_args())
+
+    common.scene_reset()
+    addon = common.addon_enable()
+    from combination_shape_key.lib.driver_utils import driver_ensure
+    from combination_shape_key.app.create import (CombinationSpec,
+                                                  combination_shape_keys_create,
+                                                  driver_variables_create,
+                                                  manager_create,
+                                                  owner_id_type)
+
+    layout = common.combination_layout(args.shapes, args.combinations, args.drivers)
+    results = {}
+
+    def targets_create(name):
+        # Target shape keys are created before timing so both paths only time the combinations
+        object = common.rig_create(100, args.shapes, name)
+        for index in range(args.combinations):
+            object.shape_key_add(name=f'combination_{index:04d}', from_mix=False)
+        return object.data.shape_keys
+
+    def single_create(key, name, drivers):
+        # The steps of the operator's execute_internal before it delegated to the batch API:
+        # one manager, driver and update per combination, without up front validation
+        manager = manager_create(key, name)
+        fcurve = driver_ensure(key, manager.data_path)
+        driver_variables_create(fcurve.driver, key, manager, drivers, owner_id_type(key))
+        manager.update()
+
+    key = targets_create("Single")
+    with common.timer(results, "single"):
+        for index, drivers in enumerate(layout):
+            single_create(key, f'combination_{index:04d}', drivers)
+
+    key = targets_create("Batch")
+    with common.timer(results, "batch"):
+        combination_shape_keys_create(key, [CombinationSpec(f'combination_{index:04d}', drivers)
+                                            for index, drivers in enumerate(layout)])
+
+    results["speedup"] = results["single"] / results["batch"] if results["batch"] else 0.0
+    print(json.dumps({"arguments": vars(args), "seconds": results}, indent=2))
+    addon.unregister()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Times the poll() of the combination operators and panel against the number of drivers on a Key.
+
+    blender -b --factory-startup --python benchmarks/bench_poll.py -- [--counts 50 100 250 500 1000] [--calls 1000]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import common
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--counts", type=int, nargs="+", default=[50, 100, 250, 500, 1000])
+    parser.add_argument("--calls", type=int, default=1000)
+    args = parser.parse_args(common.script_args())
+
+    common.scene_reset()
+    addon = common.addon_enable()
+    import bpy
+    from combination_shape_key.app.create import CombinationSpec, combination_shape_keys_create
+
+    pollers = {
+        "driver_add": addon.CombinationShapeKeyDriverAdd,
+        "driver_remove": addon.CombinationShapeKeyDriverRemove,
+        "drivers_solo": addon.CombinationShapeKeyDriversSolo,
+        "drivers_remove": addon.CombinationShapeKeyDriversRemove,
+        "drivers_select": addon.CombinationShapeKeyDriversSelect,
+        "duplicate_mirror": addon.CombinationShapeKeyDuplicateMirror,
+        "settings_panel": addon.CombinationShapeKeySettings,
+        }
+
+    results = []
+    for count in args.counts:
+        common.scene_reset()
+        object = common.rig_create(100, 8, f'Poll{count}')
+        for index in range(count):
+            object.shape_key_add(name=f'combination_{index:04d}_L', from_mix=False)
+        key = object.data.shape_keys
+        layout = common.combination_layout(8, count, 2)
+        combination_shape_keys_create(key, [CombinationSpec(f'combination_{index:04d}_L', drivers)
+                                            for index, drivers in enumerate(layout)])
+
+        # The last combination is the worst case for a linear search
+        object.active_shape_key_index = len(key.key_blocks) - 1
+        context = bpy.context
+
+        timings = {}
+        for name, cls in pollers.items():
+            start = time.perf_counter()
+            for _ in range(args.calls):
+                cls.poll(context)
+            timings[name] = (time.perf_counter() - start) / args.calls * 1e6
+
+        results.append({"drivers": len(key.animation_data.drivers), "microseconds_per_poll": timings})
+
+    print(json.dumps({"arguments": vars(args), "results": results}, indent=2))
+    addon.unregister()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Checks and times driver variable naming on generated all-pairs rigs.
+
+    blender -b --factory-startup --python benchmarks/bench_variables.py -- [--shapes 48] [--inputs 1200]
+
+Creates a combination for every pair of --shapes shape keys, then grows a single combination
+to --inputs driver shape keys through the driver_add operator, removing and re-adding inputs
+along the way. Fails if any driver has duplicate or reserved variable names or an invalid
+expression, and reports the cost per added variable.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from itertools import combinations
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import common
+
+
+def drivers_check(key) -> int:
+    """Asserts that the variable names of every combination driver are unique and allowed"""
+    from combination_shape_key.app.naming import RESERVED_NAMES
+    count = 0
+    for fcurve in key.animation_data.drivers:
+        driver = fcurve.driver
+        names = [variable.name for variable in driver.variables]
+        assert len(names) == len(set(names)), f'duplicate variable names in {fcurve.data_path}'
+        assert not RESERVED_NAMES.intersection(names), f'reserved variable name in {fcurve.data_path}'
+        assert driver.is_valid, f'invalid driver {fcurve.data_path}'
+        count += len(names)
+    return count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--shapes", type=int, default=48)
+    parser.add_argument("--inputs", type=int, default=1200)
+    parser.add_argument("--removals", type=int, default=100)
+    args = parser.parse_args(common.script_args())
+
+    common.scene_reset()
+    addon = common.addon_enable()
+    import bpy
+    from combination_shape_key.app.create import CombinationSpec, combination_shape_keys_create
+    results = {}
+
+    # All-pairs rig
+    object = common.rig_create(100, args.shapes, "AllPairs")
+    key = object.data.shape_keys
+    names = [f'shape_{index:04d}' for index in range(args.shapes)]
+    specs = []
+    for a, b in combinations(names, 2):
+        object.shape_key_add(name=f'{a}_{b}', from_mix=False)
+        specs.append(CombinationSpec(f'{a}_{b}', (a, b)))
+    with common.timer(results, "all_pairs_create"):
+        combination_shape_keys_create(key, specs)
+    results["all_pairs_combinations"] = len(specs)
+    results["all_pairs_variables"] = drivers_check(key)
+
+    # One combination with many inputs, grown one variable at a time
+    common.scene_reset()
+    object = common.rig_create(100, args.inputs + 1, "ManyInputs")
+    key = object.data.shape_keys
+    target = f'shape_{args.inputs:04d}'
+    combination_shape_keys_create(key, [CombinationSpec(target, ("shape_0000",))])
+    object.active_shape_key_index = key.key_blocks.find(target)
+
+    start = time.perf_counter()
+    for index in range(1, args.inputs):
+        bpy.ops.combination_shape_key.driver_add('EXEC_DEFAULT', name=f'shape_{index:04d}')
+    results["driver_add_mean"] = (time.perf_counter() - start) / max(1, args.inputs - 1)
+
+    # Remove inputs from the middle and add them back so that released names are reused
+    manager = key.combination_shape_keys[target]
+    removed = []
+    for _ in range(args.removals):
+        item = manager.inputs.shapes[len(manager.inputs.shapes) // 2]
+        removed.append(item.name)
+        bpy.ops.combination_shape_key.driver_remove('EXEC_DEFAULT', index=item.index)
+    for name in removed:
+        bpy.ops.combination_shape_key.driver_add('EXEC_DEFAULT', name=name)
+
+    results["many_inputs_variables"] = drivers_check(key)
+    results["many_inputs_shapes"] = len(manager.inputs.shapes)
+    results["many_inputs_evaluation_path"] = manager.evaluation_path
+    assert results["many_inputs_shapes"] == args.inputs
+
+    print(json.dumps({"arguments": vars(args), "results": results}, indent=2))
+    addon.unregister()
+
+
+if __name__ == "__main__":
+    main()
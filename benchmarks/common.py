@@ -0,0 +1,66 @@
+"""
+Shared helpers for the headless benchmarks. Run the benchmarks with Blender, e.g.
+
+    blender -b --factory-startup --python benchmarks/bench_batch_create.py -- --combinations 200
+"""
+
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Sequence
+
+import bpy
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def addon_enable():
+    """Imports and registers the addon from this checkout"""
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    import combination_shape_key
+    try:
+        combination_shape_key.register()
+    except ValueError:
+        pass # already registered
+    return combination_shape_key
+
+
+def script_args() -> List[str]:
+    """The command line arguments following '--'"""
+    argv = sys.argv
+    return argv[argv.index("--")+1:] if "--" in argv else []
+
+
+def scene_reset() -> None:
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+
+
+def rig_create(vertices: int, shapes: int, name: str="BenchRig") -> 'bpy.types.Object':
+    """Creates a grid mesh object with roughly the given vertex count and shape keys"""
+    side = max(2, int(vertices ** 0.5))
+    mesh = bpy.data.meshes.new(name)
+    coords = [((x / side) - 0.5, (y / side) - 0.5, 0.0) for y in range(side) for x in range(side)]
+    mesh.from_pydata(coords, [], [])
+    object = bpy.data.objects.new(name, mesh)
+    bpy.context.scene.collection.objects.link(object)
+    bpy.context.view_layer.objects.active = object
+    object.shape_key_add(name="Basis", from_mix=False)
+    for index in range(shapes):
+        object.shape_key_add(name=f'shape_{index:04d}', from_mix=False)
+    return object
+
+
+def combination_layout(shapes: int, combinations: int, drivers: int) -> List[Sequence[str]]:
+    """Deterministic driver shape names for each combination"""
+    names = [f'shape_{index:04d}' for index in range(shapes)]
+    return [[names[(index * drivers + offset) % shapes] for offset in range(drivers)]
+            for index in range(combinations)]
+
+
+@contextmanager
+def timer(results: Dict[str, float], name: str) -> Iterator[None]:
+    start = time.perf_counter()
+    yield
+    results[name] = time.perf_counter() - start
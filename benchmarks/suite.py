@@ -0,0 +1,250 @@
+"""
+Headless benchmark suite for combination rigs of configurable size.
+
+    blender -b --factory-startup --python benchmarks/suite.py -- \
+        --vertices 20000 --shapes 100 --combinations 200 --drivers 2 --frames 100 --output results.json
+
+Generates a synthetic rig with N vertices, M shape keys and K combinations of D drivers each,
+then measures creation, rename callback latency, load_post setup, panel draw, an export and
+import round trip, offline evaluation with exact activation curves and with lookup tables and
+per-frame playback cost for every combination mode. Results are written as JSON.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import common
+
+
+class NullLayout:
+    """Stands in for UILayout when drawing panels without a user interface"""
+
+    def __getattr__(self, _):
+        return self
+
+    def __setattr__(self, name, value):
+        pass
+
+    def __call__(self, *args, **kwargs):
+        return self
+
+
+def rig_build(args, name="SuiteRig"):
+    from combination_shape_key.app.create import CombinationSpec, combination_shape_keys_create
+    object = common.rig_create(args.vertices, args.shapes, name)
+    for index in range(args.combinations):
+        object.shape_key_add(name=f'combination_{index:04d}', from_mix=False)
+    key = object.data.shape_keys
+    layout = common.combination_layout(args.shapes, args.combinations, args.drivers)
+    combination_shape_keys_create(key, [CombinationSpec(f'combination_{index:04d}', drivers)
+                                        for index, drivers in enumerate(layout)])
+    return object
+
+
+def bench_create(args, results):
+    import bpy
+    layout = common.combination_layout(args.shapes, args.combinations, args.drivers)
+
+    # CombinationShapeKeyCreate.execute_internal through the drivers_select operator
+    object = common.rig_create(args.vertices, args.shapes, "CreateSingle")
+    key = object.data.shape_keys
+    for index in range(args.combinations):
+        object.shape_key_add(name=f'combination_{index:04d}', from_mix=False)
+    start = time.perf_counter()
+    for index, drivers in enumerate(layout):
+        object.active_shape_key_index = key.key_blocks.find(f'combination_{index:04d}')
+        selected = set(drivers)
+        bpy.ops.combination_shape_key.drivers_select('EXEC_DEFAULT',
+                                                     shapes=[{"name": shape.name, "is_selected": shape.name in selected}
+                                                             for shape in key.key_blocks[1:]])
+    results["create_execute_internal"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    rig_build(args, "CreateBatch")
+    results["create_batch"] = time.perf_counter() - start
+
+
+def bench_rename(args, results, object):
+    from combination_shape_key.app.bus import shape_key_name_callback
+    key = object.data.shape_keys
+    blocks = key.key_blocks
+    samples = []
+    for index in range(min(args.renames, args.combinations)):
+        shape = blocks[f'combination_{index:04d}']
+        shape.name = f'renamed_{index:04d}'
+        start = time.perf_counter()
+        shape_key_name_callback()
+        samples.append(time.perf_counter() - start)
+        shape.name = f'combination_{index:04d}'
+        shape_key_name_callback()
+    results["rename_callback_mean"] = sum(samples) / len(samples) if samples else 0.0
+    results["rename_callback_max"] = max(samples, default=0.0)
+
+
+def bench_load(args, results):
+    import bpy
+    from combination_shape_key.app import setup
+    path = os.path.join(tempfile.gettempdir(), "combination_shape_key_bench.blend")
+    bpy.ops.wm.save_as_mainfile(filepath=path, check_existing=False)
+
+    start = time.perf_counter()
+    bpy.ops.wm.open_mainfile(filepath=path)
+    results["load_post_blocking"] = time.perf_counter() - start
+
+    # Timers do not run while a script is executing, so drain the setup queue manually
+    start = time.perf_counter()
+    steps = 0
+    while setup.setup_step() is not None:
+        steps += 1
+    results["load_setup_total"] = time.perf_counter() - start
+    results["load_setup_steps"] = steps
+    results["load_setup_stats"] = dict(setup.SETUP_STATS)
+    os.remove(path)
+
+
+def bench_panel(args, results, object):
+    import bpy
+    from combination_shape_key.gui.settings import CombinationShapeKeySettings
+
+    class PanelProxy:
+        layout = NullLayout()
+        section = CombinationShapeKeySettings.section
+
+    key = object.data.shape_keys
+    object.active_shape_key_index = key.key_blocks.find("combination_0000")
+    context = bpy.context
+    proxy = PanelProxy()
+
+    start = time.perf_counter()
+    for _ in range(args.draws):
+        if CombinationShapeKeySettings.poll(context):
+            CombinationShapeKeySettings.draw(proxy, context)
+    results["panel_draw_mean"] = (time.perf_counter() - start) / args.draws
+
+
+def bench_exchange(args, results, object):
+    from combination_shape_key.app.exchange import (combinations_export,
+                                                    combinations_import,
+                                                    combinations_read,
+                                                    combinations_write)
+    key = object.data.shape_keys
+    path = os.path.join(tempfile.gettempdir(), "combination_shape_key_bench.npz")
+
+    start = time.perf_counter()
+    data, arrays = combinations_export(key, include_deltas=True)
+    combinations_write(path, data, arrays)
+    results["exchange_export"] = time.perf_counter() - start
+
+    target = common.rig_create(args.vertices, args.shapes, "ExchangeRig")
+    start = time.perf_counter()
+    data, arrays = combinations_read(path)
+    combinations_import(target, data, arrays)
+    results["exchange_import"] = time.perf_counter() - start
+    os.remove(path)
+
+
+def bench_evaluate(args, results, object):
+    import numpy as np
+    from combination_shape_key.app.evaluate import combination_settings
+    from combination_shape_key.lib.evaluator import evaluate
+    managers = object.data.shape_keys.combination_shape_keys
+    settings = [combination_settings(manager) for manager in managers]
+    rng = np.random.default_rng(0)
+    inputs = [rng.random((args.drivers, args.frames)) for _ in settings]
+
+    for name, exact in (("evaluate_exact", True), ("evaluate_lookup", False)):
+        start = time.perf_counter()
+        evaluate(settings, inputs, exact=exact)
+        results[name] = time.perf_counter() - start
+
+
+def bench_playback(args, results, object):
+    import bpy
+    from combination_shape_key.api.combination_shape_key import MODE_ITEMS, MODE_INDEX
+    scene = bpy.context.scene
+    key = object.data.shape_keys
+    rng = random.Random(0)
+
+    for index in range(args.shapes):
+        shape = key.key_blocks[f'shape_{index:04d}']
+        for frame in range(1, args.frames + 1, 10):
+            shape.value = rng.random()
+            shape.keyframe_insert("value", frame=frame)
+
+    def playback():
+        start = time.perf_counter()
+        for frame in range(1, args.frames + 1):
+            scene.frame_set(frame)
+        return (time.perf_counter() - start) / args.frames
+
+    managers = key.combination_shape_keys
+    drivers = key.animation_data.drivers
+
+    for fcurve in drivers:
+        fcurve.mute = True
+    results["playback_drivers_muted"] = playback()
+    for fcurve in drivers:
+        fcurve.mute = False
+
+    for mode, *_ in MODE_ITEMS:
+        for manager in managers:
+            manager["mode"] = MODE_INDEX[mode]
+            manager.driver_update()
+        results[f'playback_{mode.lower()}'] = playback()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--vertices", type=int, default=10000)
+    parser.add_argument("--shapes", type=int, default=50)
+    parser.add_argument("--combinations", type=int, default=100)
+    parser.add_argument("--drivers", type=int, default=2)
+    parser.add_argument("--frames", type=int, default=100)
+    parser.add_argument("--renames", type=int, default=20)
+    parser.add_argument("--draws", type=int, default=200)
+    parser.add_argument("--output", default="")
+    args = parser.parse_args(common.script_args())
+
+    common.scene_reset()
+    addon = common.addon_enable()
+    results = {}
+
+    bench_create(args, results)
+
+    common.scene_reset()
+    object = rig_build(args)
+    bench_rename(args, results, object)
+    bench_panel(args, results, object)
+    bench_exchange(args, results, object)
+    bench_evaluate(args, results, object)
+    bench_load(args, results)
+
+    import bpy
+    object = bpy.data.objects["SuiteRig"]
+    bpy.context.view_layer.objects.active = object
+    bench_playback(args, results, object)
+
+    report = {
+        "addon_version": list(addon.bl_info["version"]),
+        "blender_version": list(bpy.app.version),
+        "arguments": vars(args),
+        "seconds": results,
+        }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(text)
+    print(text)
+    addon.unregister()
+
+
+if __name__ == "__main__":
+    main()
@@ -45,18 +45,42 @@ from .lib.curve_mapping import (BLCMAP_CurvePointProperties,
 from .api.activation_curve import CombinationShapeKeyActivationCurve
 from .api.combination_shape_key import CombinationShapeKey
 from .api.combination_shape_key_target import CombinationShapeKeyTarget
+from .api.combination_shape_key_spec import CombinationShapeKeySpec
+from .api.combination_shape_key_profile import CombinationShapeKeyProfileItem
+from .api.combination_shape_key_list import CombinationShapeKeyListItem
 from .ops.new import CombinationShapeKeyNew
+from .ops.batch_new import CombinationShapeKeyBatchNew
 from .ops.drivers_select import CombinationShapeKeyDriversSelect
 from .ops.duplicate_mirror import CombinationShapeKeyDuplicateMirror
+from .ops.mirror_all import CombinationShapeKeysMirror
 from .ops.drivers_remove import CombinationShapeKeyDriversRemove
 from .ops.drivers_solo import CombinationShapeKeyDriversSolo
 from .ops.driver_add import CombinationShapeKeyDriverAdd
 from .ops.driver_remove import CombinationShapeKeyDriverRemove
+from .ops.bake import CombinationShapeKeysBake, CombinationShapeKeysUnbake
+from .ops.sparse import CombinationShapeKeyRegionAssign, CombinationShapeKeysCompact, CombinationShapeKeyAnalyse
+from .ops.extract import CombinationShapeKeyCorrectiveExtract
+from .ops.flatten import CombinationShapeKeyFlatten
+from .ops.store import CombinationShapeKeysStoreMigrate
+from .ops.exchange import CombinationShapeKeysExport, CombinationShapeKeysImport
+from .ops.manage import (CombinationShapeKeysBulkEdit,
+                         CombinationShapeKeysListRefresh,
+                         CombinationShapeKeysListSelect)
+from .ops.validate import CombinationShapeKeysValidate
+from .ops.profile import CombinationShapeKeysProfile, CombinationShapeKeysProfileExport
 from .gui.target_list import CombinationShapeKeyTargetList
 from .gui.settings import CombinationShapeKeySettings
+from .gui.profile import CombinationShapeKeyProfileList, CombinationShapeKeyProfile
+from .gui.manager import CombinationShapeKeyManagerList, CombinationShapeKeyManager
 from .gui.menu import draw_menu_items
 from .app.bus import MESSAGE_BROKER, shape_key_name_callback
-from .app.setup import try_setup_combination_shape_keys, setup_combination_shape_keys
+from .app.index import combination_index_invalidate
+from .app.inputs import combination_inputs_invalidate
+from .app.naming import variable_allocators_clear
+from .app.lod import LOD_EPSILON, is_lod_enabled, lod_clear, lod_enable, lod_toggle
+from .app.mirror import symmetry_maps_clear
+from .app.preview import preview_clear
+from .app.setup import setup_combination_shape_keys, setup_step
 
 
 def classes():
@@ -74,38 +98,75 @@ def classes():
         CombinationShapeKeyActivationCurve,
         CombinationShapeKey,
         CombinationShapeKeyTarget,
+        CombinationShapeKeySpec,
+        CombinationShapeKeyProfileItem,
+        CombinationShapeKeyListItem,
         CombinationShapeKeyNew,
+        CombinationShapeKeyBatchNew,
         CombinationShapeKeyDriversSelect,
         CombinationShapeKeyDuplicateMirror,
+        CombinationShapeKeysMirror,
         CombinationShapeKeyDriversRemove,
         CombinationShapeKeyDriversSolo,
         CombinationShapeKeyDriverAdd,
         CombinationShapeKeyDriverRemove,
+        CombinationShapeKeysBake,
+        CombinationShapeKeysUnbake,
+        CombinationShapeKeyRegionAssign,
+        CombinationShapeKeysCompact,
+        CombinationShapeKeyAnalyse,
+        CombinationShapeKeyCorrectiveExtract,
+        CombinationShapeKeyFlatten,
+        CombinationShapeKeysStoreMigrate,
+        CombinationShapeKeysExport,
+        CombinationShapeKeysImport,
+        CombinationShapeKeysListRefresh,
+        CombinationShapeKeysListSelect,
+        CombinationShapeKeysBulkEdit,
+        CombinationShapeKeysValidate,
+        CombinationShapeKeysProfile,
+        CombinationShapeKeysProfileExport,
         CombinationShapeKeyTargetList,
         CombinationShapeKeySettings,
+        CombinationShapeKeyProfileList,
+        CombinationShapeKeyProfile,
+        CombinationShapeKeyManagerList,
+        CombinationShapeKeyManager,
         ]
 
 
 @bpy.app.handlers.persistent
 def load_post_handler(_=None) -> None:
+    combination_index_invalidate()
+    combination_inputs_invalidate()
+    variable_allocators_clear()
+    lod_clear()
+    lod_enable(is_lod_enabled())
+    symmetry_maps_clear()
+    preview_clear()
     bpy.msgbus.clear_by_owner(MESSAGE_BROKER)
     bpy.msgbus.subscribe_rna(key=(bpy.types.ShapeKey, "name"),
                              owner=MESSAGE_BROKER,
                              args=tuple(),
                              notify=shape_key_name_callback)
 
-    # On initial load accessing bpy.data.shape_keys will raise AttributeError.
-    # Retry after 5 seconds.
-    try:
-        setup_combination_shape_keys()
-    except AttributeError:
-        bpy.app.timers.register(try_setup_combination_shape_keys, first_interval=5)
+    # Combinations are set up lazily in small time slices so that loading large files
+    # is not delayed, and on demand when an operator accesses a Key
+    setup_combination_shape_keys()
+
+
+@bpy.app.handlers.persistent
+def undo_post_handler(*_) -> None:
+    # Undo and redo restore managers and drivers without notifying the caches, and may do so
+    # without changing the counts the index checks for staleness
+    combination_index_invalidate()
+    combination_inputs_invalidate()
 
 
 def register():
     from bpy.utils import register_class
-    from bpy.types import Key
-    from bpy.props import CollectionProperty
+    from bpy.types import Key, WindowManager
+    from bpy.props import BoolProperty, CollectionProperty, FloatProperty, IntProperty
 
     BLCMAP_OT_curve_copy.bl_idname = "combination_shape_key.curve_copy"
     BLCMAP_OT_curve_paste.bl_idname = "combination_shape_key.curve_paste"
@@ -125,28 +186,110 @@ def register():
         options=set()
         )
 
+    WindowManager.combination_shape_key_preview = BoolProperty(
+        name="Fast Preview",
+        description=("Defer activation curve updates while combination settings are being "
+                     "edited and show a preview of the response instead"),
+        default=False,
+        options=set()
+        )
+
+    WindowManager.combination_shape_key_lod = BoolProperty(
+        name="Auto-Mute Idle Combinations",
+        description=("During playback, mute combinations whose driver shape keys are inactive "
+                     "and restore them when the driver shape keys become active again"),
+        default=False,
+        options=set(),
+        update=lod_toggle
+        )
+
+    WindowManager.combination_shape_key_lod_epsilon = FloatProperty(
+        name="Threshold",
+        description="Driver shape key values below which a driver shape key counts as inactive",
+        min=0.0,
+        max=0.1,
+        default=LOD_EPSILON,
+        precision=5,
+        options=set()
+        )
+
+    WindowManager.combination_shape_key_list = CollectionProperty(
+        name="Combinations",
+        type=CombinationShapeKeyListItem,
+        options=set()
+        )
+
+    WindowManager.combination_shape_key_list_index = IntProperty(
+        name="Combination Index",
+        min=0,
+        default=0,
+        options=set()
+        )
+
+    WindowManager.combination_shape_key_profile = CollectionProperty(
+        name="Combination Profile",
+        type=CombinationShapeKeyProfileItem,
+        options=set()
+        )
+
+    WindowManager.combination_shape_key_profile_index = IntProperty(
+        name="Combination Profile Index",
+        min=0,
+        default=0,
+        options=set()
+        )
+
     bpy.types.MESH_MT_shape_key_context_menu.append(draw_menu_items)
     bpy.app.handlers.load_post.append(load_post_handler)
+    bpy.app.handlers.undo_post.append(undo_post_handler)
+    bpy.app.handlers.redo_post.append(undo_post_handler)
     load_post_handler() # Ensure messages are subscribed to on first install
 
 
 def unregister():
     import sys
     from operator import itemgetter
-    from bpy.types import Key
+    from bpy.types import Key, WindowManager
     from bpy.utils import unregister_class
 
     bpy.msgbus.clear_by_owner(MESSAGE_BROKER)
     bpy.app.handlers.load_post.remove(load_post_handler)
+    bpy.app.handlers.undo_post.remove(undo_post_handler)
+    bpy.app.handlers.redo_post.remove(undo_post_handler)
     bpy.types.MESH_MT_shape_key_context_menu.remove(draw_menu_items)
 
     from .lib import update
     update.unregister()
 
+    preview_clear()
+    lod_enable(False)
+
+    if bpy.app.timers.is_registered(setup_step):
+        bpy.app.timers.unregister(setup_step)
+
     try:
         del Key.combination_shape_keys
     except: pass
 
+    try:
+        del WindowManager.combination_shape_key_preview
+    except: pass
+
+    try:
+        del WindowManager.combination_shape_key_lod
+        del WindowManager.combination_shape_key_lod_epsilon
+    except: pass
+
+    try:
+        del WindowManager.combination_shape_key_list
+        del WindowManager.combination_shape_key_list_index
+    except: pass
+
+    try:
+        del WindowManager.combination_shape_key_profile
+        del WindowManager.combination_shape_key_profile_index
+    except: pass
+
     for cls in reversed(classes()):
         unregister_class(cls)
 
@@ -7,21 +7,54 @@ from bpy.props import (BoolProperty,
                        IntProperty,
                        PointerProperty,
                        StringProperty)
-from ..lib.curve_mapping import to_bezier, keyframe_points_assign, BLCMAP_Curve
+from ..lib.curve_mapping import to_bezier, BLCMAP_Curve
 from ..lib.driver_utils import driver_ensure
-from ..lib.idprop_utils import idprop_ensure
+from ..app.compile import driver_compile, driver_evaluation_path
+from ..app.fold import is_curve_foldable
+from ..app.store import factor_path, factors_ensure
+from ..app.keyframes import keyframes_clear, keyframes_sync
+from ..app.preview import fcurve_update_defer, is_preview_enabled
+from ..app.index import combination_driver_find
+from ..app.inputs import CombinationInputs, combination_inputs, combination_inputs_invalidate
 from .activation_curve import CombinationShapeKeyActivationCurve
 if TYPE_CHECKING:
-    from bpy.types import Context
+    from bpy.types import Context, FCurve
 
+MODE_ITEMS = [
+    ('MULTIPLY', "Multiply", "Multiply the driver values"          , 'NONE', 0),
+    ('MIN'     , "Lowest"  , "Use the lowest driver value"         , 'NONE', 1),
+    ('MAX'     , "Highest" , "Use the highest driver value"        , 'NONE', 2),
+    ('AVERAGE' , "Average" , "Use the average of the driver values", 'NONE', 3),
+    ]
+
+MODE_INDEX = {item[0]: item[4] for item in MODE_ITEMS}
 
 class CombinationShapeKey(PropertyGroup):
     """Manages and stores settings for a combination shape key"""
 
-    def fcurve_update(self, _: Optional['Context']=None) -> None:
-        """Updates the combination shape key fcurve keyframes"""
+    def fcurve_update(self, context: Optional['Context']=None) -> None:
+        """
+        Updates the combination shape key fcurve keyframes, or schedules the update when
+        fast preview is enabled
+        """
+        if is_preview_enabled(context):
+            fcurve_update_defer(self)
+        else:
+            self.fcurve_apply()
+
+    def fcurve_apply(self) -> None:
+        """Writes the combination shape key fcurve keyframes, or the folded driver expression"""
         if self.is_valid:
             fcurve = driver_ensure(self.id_data, self.data_path)
+            if self.get("folded", False) or is_curve_foldable(self):
+                # The folded expression depends on the activation settings
+                driver_compile(self, fcurve)
+            self.keyframes_write(fcurve)
+
+    def keyframes_write(self, fcurve: 'FCurve') -> None:
+        if self.get("folded", False):
+            keyframes_clear(fcurve)
+        else:
             acurve: BLCMAP_Curve = self.activation_curve.curve
 
             bezier = to_bezier(acurve.points,
@@ -29,50 +62,37 @@ class CombinationShapeKey(PropertyGroup):
                                y_range=(0.0, self.target_value),
                                extrapolate=not self.clamp)
 
-            keyframe_points_assign(fcurve.keyframe_points, bezier)
+            keyframes_sync(fcurve, bezier)
 
     def driver_update(self, _: Optional['Context']=None) -> None:
         """Updates the combination shape key driver"""
 
         if self.is_valid:
             fc = driver_ensure(self.id_data, self.data_path)
-            dr = fc.driver
-            dr.type = 'SCRIPTED'
             fc.mute = self.mute
-
-            keys = tuple(var.name for var in dr.variables[3:])
-
-            if len(keys) == 0:
-                dr.expression = "0.0"
-            else:
-                mode = self.mode
-
-                w = dr.variables[1]
-                i = dr.variables[2]
-
-                if mode == 'MULTIPLY':
-                    dr.expression = f'{w.name}*{i.name}*{"*".join(keys)}'
-                elif mode == 'MIN':
-                    dr.expression = f'{w.name}*{i.name}*min({",".join(keys)})'
-                elif mode == 'MAX':
-                    dr.expression = f'{w.name}*{i.name}*max({",".join(keys)})'
-                else:
-                    dr.expression = f'{w.name}*{i.name}*(({"+".join(keys)})/{str(float(len(keys)))})'
+            folded = self.get("folded", False)
+            driver_compile(self, fc)
+            if self.get("folded", False) != folded:
+                self.keyframes_write(fc)
+            combination_inputs_invalidate(self.id_data, self.identifier)
 
     def id_properties_create(self) -> None:
         """
         Ensures required id-properties exist
         """
-        idprop_ensure(self.id_data.user, self.weight_property_name)
-        idprop_ensure(self.id_data.user, self.influence_property_name)
+        factors_ensure(self)
 
     def update(self, context: Optional['Context']=None) -> None:
         """
         Ensures id-properties exist and updates the fcurve and driver for the combination shape key
         """
         self.id_properties_create()
-        self.fcurve_update()
-        self.driver_update()
+        if self.is_valid:
+            fcurve = driver_ensure(self.id_data, self.data_path)
+            fcurve.mute = self.mute
+            driver_compile(self, fcurve)
+            self.keyframes_write(fcurve)
+            combination_inputs_invalidate(self.id_data, self.identifier)
 
     active_driver_index: IntProperty(
         name="Combination Shape Key Driver",
@@ -110,13 +130,38 @@ class CombinationShapeKey(PropertyGroup):
         options={'HIDDEN'}
         )
 
+    @property
+    def evaluation_path(self) -> str:
+        """
+        The path Blender uses to evaluate the driver, one of 'SIMPLE', 'NATIVE' or 'PYTHON', or
+        'NONE' if there is no driver
+        """
+        fcurve = combination_driver_find(self.id_data, self.identifier) if self.is_valid else None
+        return driver_evaluation_path(self, fcurve)
+
+    @property
+    def inputs(self) -> Optional[CombinationInputs]:
+        """Cached view of the driver shape keys and variables, or None if there is no driver"""
+        return combination_inputs(self)
+
+    @property
+    def is_folded(self) -> bool:
+        """Whether or not the activation curve is evaluated by the driver expression"""
+        return bool(self.get("folded", False))
+
+    @property
+    def use_shared_store(self) -> bool:
+        """Whether the weight and influence are kept in the Key's shared store or on the owner"""
+        return self.get("slot") is not None
+
     @property
     def influence_property_name(self) -> str:
         return f'influence_{self.identifier}'
 
     @property
     def influence_property_path(self) -> str:
-        return f'["{self.influence_property_name}"]'
+        """The path to the influence property, relative to the ID that stores it"""
+        return factor_path(self, "influence")
 
     @property
     def is_valid(self) -> bool:
@@ -126,12 +171,7 @@ class CombinationShapeKey(PropertyGroup):
     mode: EnumProperty(
         name="Mode",
         description="The method to use when calculating the combination shape key's value",
-        items=[
-            ('MULTIPLY', "Multiply", "Multiply the driver values"          , 'NONE', 0),
-            ('MIN'     , "Lowest"  , "Use the lowest driver value"         , 'NONE', 1),
-            ('MAX'     , "Highest" , "Use the highest driver value"        , 'NONE', 2),
-            ('AVERAGE' , "Average" , "Use the average of the driver values", 'NONE', 3),
-            ],
+        items=MODE_ITEMS,
         default='MULTIPLY',
         options=set(),
         update=driver_update
@@ -158,6 +198,15 @@ class CombinationShapeKey(PropertyGroup):
         update=fcurve_update
         )
 
+    use_curve_folding: BoolProperty(
+        name="Fold Curve",
+        description=("Evaluate linear and smoothstep activation curves in the driver expression "
+                     "instead of through fcurve keyframes"),
+        default=True,
+        options=set(),
+        update=update
+        )
+
     target_value: FloatProperty(
         name="Goal",
         description=("The target value for the combination shape key when all driver shape keys "
@@ -176,4 +225,5 @@ class CombinationShapeKey(PropertyGroup):
 
     @property
     def weight_property_path(self) -> str:
-        return f'["{self.weight_property_name}"]'
+        """The path to the weight property, relative to the ID that stores it"""
+        return factor_path(self, "weight")
@@ -0,0 +1,45 @@
+
+from bpy.types import PropertyGroup
+from bpy.props import BoolProperty, FloatProperty, IntProperty, StringProperty
+
+
+class CombinationShapeKeyListItem(PropertyGroup):
+    """A combination shape key in the scene-wide combination list"""
+
+    key: StringProperty(
+        name="Key",
+        description="Name of the shape key datablock the combination belongs to",
+        options=set()
+        )
+
+    identifier: StringProperty(
+        name="Identifier",
+        description="Identifier of the combination's manager",
+        options={'HIDDEN'}
+        )
+
+    mode: StringProperty(
+        name="Mode",
+        description="The combination's mode when the list was refreshed",
+        options=set()
+        )
+
+    radius: FloatProperty(
+        name="Radius",
+        description="The combination's radius when the list was refreshed",
+        precision=3,
+        options=set()
+        )
+
+    variable_count: IntProperty(
+        name="Drivers",
+        description="Number of driver shape keys",
+        options=set()
+        )
+
+    is_selected: BoolProperty(
+        name="Selected",
+        description="Include the combination in bulk edits",
+        default=False,
+        options=set()
+        )
@@ -0,0 +1,46 @@
+
+from bpy.types import PropertyGroup
+from bpy.props import FloatProperty, IntProperty, StringProperty
+
+
+class CombinationShapeKeyProfileItem(PropertyGroup):
+    """Measured evaluation cost of a combination shape key"""
+
+    key: StringProperty(
+        name="Key",
+        description="Name of the shape key datablock the combination belongs to",
+        options=set()
+        )
+
+    evaluation_path: StringProperty(
+        name="Evaluation",
+        description="The path Blender uses to evaluate the combination's driver",
+        options=set()
+        )
+
+    variable_count: IntProperty(
+        name="Variables",
+        description="Number of driver shape keys",
+        options=set()
+        )
+
+    driver_cost: FloatProperty(
+        name="Driver",
+        description="Time per frame spent evaluating the driver and activation curve (microseconds)",
+        precision=1,
+        options=set()
+        )
+
+    blend_cost: FloatProperty(
+        name="Blend",
+        description="Time per frame spent blending the shape key (microseconds)",
+        precision=1,
+        options=set()
+        )
+
+    total_cost: FloatProperty(
+        name="Total",
+        description="Total time per frame (microseconds)",
+        precision=1,
+        options=set()
+        )
@@ -0,0 +1,49 @@
+
+from bpy.types import PropertyGroup
+from bpy.props import BoolProperty, CollectionProperty, EnumProperty, FloatProperty
+from .combination_shape_key import MODE_ITEMS
+from .combination_shape_key_target import CombinationShapeKeyTarget
+
+
+class CombinationShapeKeySpec(PropertyGroup):
+    """Describes a combination shape key to be created by a batch operation"""
+
+    clamp: BoolProperty(
+        name="Clamp",
+        description="Limits the driven target value to be between 0 and the defined target value",
+        default=True,
+        options=set()
+        )
+
+    drivers: CollectionProperty(
+        name="Drivers",
+        description="Shape keys that drive the combination shape key",
+        type=CombinationShapeKeyTarget,
+        options=set()
+        )
+
+    mode: EnumProperty(
+        name="Mode",
+        description="The method to use when calculating the combination shape key's value",
+        items=MODE_ITEMS,
+        default='MULTIPLY',
+        options=set()
+        )
+
+    radius: FloatProperty(
+        name="Radius",
+        min=0.0,
+        max=1.0,
+        default=1.0,
+        precision=3,
+        options=set()
+        )
+
+    target_value: FloatProperty(
+        name="Goal",
+        min=0.0,
+        max=10.0,
+        default=1.0,
+        precision=3,
+        options=set()
+        )
@@ -0,0 +1,251 @@
+
+from typing import Dict, List, Optional, Sequence, TYPE_CHECKING
+import math
+import numpy as np
+import bpy
+from ..lib.driver_utils import driver_ensure, driver_find, driver_remove
+from ..lib.evaluator import (INTERPOLATION_LINEAR,
+                             SOURCE_FCURVE,
+                             SOURCE_FRAMES,
+                             bezier_array,
+                             evaluate,
+                             input_sources,
+                             keyframes_evaluate)
+from .compile import stages_clear
+from .create import driver_variables_create, owner_id_type
+from .evaluate import combination_driver_names, combination_settings
+if TYPE_CHECKING:
+    from bpy.types import Action, FCurve, Key, Scene
+    from ..api.combination_shape_key import CombinationShapeKey
+
+BAKE_DRIVER_ACTIONS = [
+    ('NONE'  , "Keep"  , "Leave the drivers in place (the drivers override the baked keyframes)", 'NONE', 0),
+    ('MUTE'  , "Mute"  , "Mute the drivers so that the baked keyframes are used"                , 'NONE', 1),
+    ('REMOVE', "Remove", "Remove the drivers. They can be restored from the combination settings", 'NONE', 2),
+    ]
+
+_NATIVE_INTERPOLATION = {'CONSTANT', 'LINEAR', 'BEZIER'}
+
+
+def fcurve_sample(fcurve: 'FCurve', frames: np.ndarray) -> np.ndarray:
+    """
+    Samples fcurve at frames. Keyframes are evaluated in bulk with NumPy unless the fcurve uses
+    modifiers or easing interpolation, in which case fcurve.evaluate is used per frame.
+    """
+    points = fcurve.keyframe_points
+    count = len(points)
+    if count == 0 or len(fcurve.modifiers) or any(p.interpolation not in _NATIVE_INTERPOLATION for p in points):
+        return np.fromiter((fcurve.evaluate(frame) for frame in frames), dtype=np.float64, count=len(frames))
+
+    data = np.empty((3, count * 2))
+    points.foreach_get("co", data[0])
+    points.foreach_get("handle_left", data[1])
+    points.foreach_get("handle_right", data[2])
+    interpolation = np.empty(count, dtype=np.int32)
+    points.foreach_get("interpolation", interpolation)
+
+    bezier = bezier_array(data.reshape(3, count, 2).transpose(1, 0, 2))
+    return keyframes_evaluate(bezier, interpolation, frames, extrapolate=fcurve.extrapolation == 'LINEAR')
+
+
+def is_animation_layered(key: 'Key') -> bool:
+    """Whether the Key's animation is evaluated through NLA rather than from its action alone"""
+    animdata = key.animation_data
+    return animdata is not None and (animdata.use_tweak_mode
+                                     or (animdata.use_nla and any(not track.mute for track in animdata.nla_tracks)))
+
+
+def shape_values_step(scene: 'Scene', key: 'Key', names: Sequence[str], frames: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Samples the values of the named shape keys by setting each frame and reading the values the
+    depsgraph evaluated. The current frame is restored afterwards.
+    """
+    blocks = key.key_blocks
+    values = np.empty((len(names), len(frames)))
+    current = scene.frame_current
+    subframe = scene.frame_subframe
+    try:
+        for column, frame in enumerate(frames.tolist()):
+            whole = math.floor(frame)
+            scene.frame_set(int(whole), subframe=frame - whole)
+            for row, name in enumerate(names):
+                values[row, column] = blocks[name].value
+    finally:
+        scene.frame_set(current, subframe=subframe)
+    return dict(zip(names, values))
+
+
+def shape_values_sample(key: 'Key',
+                        names: Sequence[str],
+                        frames: np.ndarray,
+                        scene: Optional['Scene']=None) -> Dict[str, np.ndarray]:
+    """
+    Samples the values of the named shape keys over frames. Values are read from the Key's
+    action in bulk where possible. Driven shape keys, and all shape keys of a Key animated
+    through NLA, are sampled by stepping scene (the context scene by default) through the frames.
+    """
+    animdata = key.animation_data
+    action = animdata.action if animdata is not None else None
+    fcurves = {}
+    if action is not None:
+        for name in names:
+            fcurve = action.fcurves.find(f'key_blocks["{name}"].value')
+            if fcurve is not None and not fcurve.mute:
+                fcurves[name] = fcurve
+    driven = set()
+    if animdata is not None:
+        driven = {fcurve.data_path[12:-8] for fcurve in animdata.drivers
+                  if not fcurve.mute and fcurve.data_path.startswith('key_blocks["')}
+
+    sources = input_sources(names, fcurves, driven, is_animation_layered(key))
+    stepped = [name for name in names if sources[name] == SOURCE_FRAMES and name in key.key_blocks]
+    result = shape_values_step(scene or bpy.context.scene, key, stepped, frames) if stepped else {}
+
+    blocks = key.key_blocks
+    for name in names:
+        if name in result:
+            continue
+        if sources[name] == SOURCE_FCURVE:
+            result[name] = fcurve_sample(fcurves[name], frames)
+        else:
+            shape = blocks.get(name)
+            result[name] = np.full(len(frames), shape.value if shape else 0.0)
+    return result
+
+
+def combinations_evaluate(key: 'Key',
+                          managers: Sequence['CombinationShapeKey'],
+                          frames: np.ndarray,
+                          scene: Optional['Scene']=None) -> Dict[str, np.ndarray]:
+    """
+    Evaluates managers over frames from the animation of their driver shape keys, sampled with
+    shape_values_sample. Combinations driven by other combinations are evaluated after the
+    combinations they depend on.
+    """
+    drivers = {manager.name: combination_driver_names(manager) for manager in managers}
+    pending = {manager.name: manager for manager in managers}
+    inputs = shape_values_sample(key, {name for names in drivers.values() for name in names if name not in pending}, frames, scene)
+
+    while pending:
+        ready = [manager for name, manager in pending.items() if not any(n in pending for n in drivers[name])]
+        if not ready:
+            # Dependency cycle, evaluate the remainder from their current values
+            ready = list(pending.values())
+            for manager in ready:
+                for name in drivers[manager.name]:
+                    shape = key.key_blocks.get(name)
+                    inputs.setdefault(name, np.full(len(frames), shape.value if shape else 0.0))
+
+        values = evaluate([combination_settings(manager) for manager in ready],
+                          [np.array([inputs[name] for name in drivers[manager.name]]).reshape(-1, len(frames))
+                           for manager in ready],
+                          frames=len(frames),
+                          # Baked keyframes tolerate the lookup's error, see lib/evaluator.py
+                          exact=False)
+
+        for manager, row in zip(ready, values):
+            inputs[manager.name] = row
+            del pending[manager.name]
+
+    return {manager.name: inputs[manager.name] for manager in managers}
+
+
+def action_ensure(key: 'Key') -> 'Action':
+    animdata = key.animation_data or key.animation_data_create()
+    action = animdata.action
+    if action is None:
+        action = animdata.action = bpy.data.actions.new(f'{key.name}Action')
+    return action
+
+
+def keyframes_write(action: 'Action', data_path: str, frames: np.ndarray, values: np.ndarray) -> 'FCurve':
+    """Replaces the fcurve at data_path in action with linear keyframes for values"""
+    fcurve = action.fcurves.find(data_path)
+    if fcurve is not None:
+        action.fcurves.remove(fcurve)
+    fcurve = action.fcurves.new(data_path, action_group="Combination Shape Keys")
+
+    count = len(frames)
+    co = np.empty(count * 2)
+    co[0::2] = frames
+    co[1::2] = values
+
+    points = fcurve.keyframe_points
+    points.add(count)
+    points.foreach_set("co", co)
+    points.foreach_set("interpolation", np.full(count, INTERPOLATION_LINEAR, dtype=np.int32))
+    fcurve.update()
+    return fcurve
+
+
+def combinations_bake(key: 'Key',
+                      frame_start: int,
+                      frame_end: int,
+                      step: int=1,
+                      driver_action: str='MUTE',
+                      managers: Optional[Sequence['CombinationShapeKey']]=None,
+                      scene: Optional['Scene']=None) -> int:
+    """
+    Bakes the values of the combination shape keys of key to keyframes for the frame range and
+    mutes or removes their drivers. Driven inputs and inputs animated through NLA are sampled by
+    stepping scene through the frames. Returns the number of combinations baked.
+    """
+    if managers is None:
+        managers = [manager for manager in key.combination_shape_keys if manager.is_valid]
+    if not managers:
+        return 0
+
+    frames = np.arange(frame_start, frame_end + 1, max(1, step), dtype=np.float64)
+    values = combinations_evaluate(key, managers, frames, scene)
+    action = action_ensure(key)
+
+    for manager in managers:
+        keyframes_write(action, manager.data_path, frames, values[manager.name])
+        fcurve = driver_find(key, manager.data_path)
+        if fcurve is not None:
+            if driver_action == 'MUTE':
+                fcurve.mute = True
+            elif driver_action == 'REMOVE':
+                manager["baked_drivers"] = list(combination_driver_names(manager))
+                stages_clear(manager, fcurve.driver)
+                driver_remove(key, manager.data_path)
+        manager["baked"] = True
+
+    return len(managers)
+
+
+def combinations_unbake(key: 'Key', managers: Optional[Sequence['CombinationShapeKey']]=None) -> int:
+    """
+    Removes baked keyframes and restores the drivers of baked combination shape keys.
+    Returns the number of combinations restored.
+    """
+    if managers is None:
+        managers = [manager for manager in key.combination_shape_keys if manager.get("baked")]
+
+    animdata = key.animation_data
+    action = animdata.action if animdata is not None else None
+    id_type = owner_id_type(key)
+    restored: List['CombinationShapeKey'] = []
+
+    for manager in managers:
+        if not manager.get("baked") or not manager.is_valid:
+            continue
+
+        if action is not None:
+            fcurve = action.fcurves.find(manager.data_path)
+            if fcurve is not None:
+                action.fcurves.remove(fcurve)
+
+        fcurve = driver_find(key, manager.data_path)
+        if fcurve is None:
+            fcurve = driver_ensure(key, manager.data_path)
+            driver_variables_create(fcurve.driver, key, manager, tuple(manager.get("baked_drivers", ())), id_type)
+
+        for name in ("baked", "baked_drivers"):
+            if name in manager:
+                del manager[name]
+
+        manager.update()
+        restored.append(manager)
+
+    return len(restored)
@@ -1,20 +1,55 @@
 
+from typing import TYPE_CHECKING
 import bpy
-from ..lib.driver_utils import driver_find
+from .index import combination_index, combination_driver_find, combination_index_invalidate
+from .inputs import combination_inputs_invalidate
+if TYPE_CHECKING:
+    from bpy.types import Key
 
 MESSAGE_BROKER = object()
 
+
+def shape_key_rename_resolve(key: 'Key') -> bool:
+    """
+    Updates the names of combination shape key managers whose target shape key has been renamed.
+    Returns True if any manager was updated.
+    """
+    index = combination_index(key)
+    names = index.names
+    if not names:
+        return False
+
+    missing = names.keys() - set(key.key_blocks.keys())
+    if not missing:
+        return False
+
+    renamed = False
+    for name in missing:
+        identifier = names[name]
+        manager = index.manager(key, identifier)
+        fcurve = combination_driver_find(key, identifier)
+        if manager is not None and fcurve is not None:
+            # Blender updates driver data paths when a shape key is renamed
+            # so the driver holds the new name of the target shape key.
+            data_path = fcurve.data_path
+            if data_path.endswith('"].value'):
+                manager["name"] = data_path[12:-8]
+                renamed = True
+
+    combination_index_invalidate(key)
+    return renamed
+
+
 def shape_key_name_callback():
-    for key in bpy.data.shape_keys:
-        if key.is_property_set("combination_shape_keys"):
-            for shape in key.key_blocks:
-                fcurve = driver_find(key, f'key_blocks["{shape.name}"].value')
-                if fcurve is not None and len(fcurve.driver.variables):
-                    variable = fcurve.driver.variables[0]
-                    if variable is not None and variable.type == 'SINGLE_PROP':
-                        target = variable.targets[0]
-                        if target.id_type == 'KEY' and target.id == key and target.data_path == "reference_key.value":
-                            identifier = variable.name
-                            manager = next((x for x in key.combination_shape_keys if x.get("identifier", "") == identifier), None)
-                            if manager:
-                                manager["name"] = shape.name
+    # Renaming a driver shape key changes the parsed inputs of its combinations
+    combination_inputs_invalidate()
+
+    # The message bus does not say which shape key was renamed. Shape keys are renamed from the
+    # UI on the active object so only its Key is resolved. Renames made elsewhere, e.g. from
+    # Python, are resolved by the validate operator.
+    object = getattr(bpy.context, "object", None)
+    if object is not None:
+        data = getattr(object, "data", None)
+        key = getattr(data, "shape_keys", None)
+        if key is not None and key.is_property_set("combination_shape_keys"):
+            shape_key_rename_resolve(key)
@@ -0,0 +1,203 @@
+
+from typing import List, Optional, Sequence, TYPE_CHECKING
+from ..lib.driver_utils import driver_ensure, driver_find, driver_remove
+from .fold import curve_fold
+from .inputs import combination_inputs_invalidate
+if TYPE_CHECKING:
+    from bpy.types import Driver, DriverVariable, DriverVariables, FCurve
+    from ..api.combination_shape_key import CombinationShapeKey
+
+# ChannelDriver.expression is a fixed size char[256] buffer. Longer expressions are
+# truncated, which breaks the expression and forces evaluation through Python.
+EXPRESSION_MAX_LENGTH = 255
+
+EVALUATION_PATHS = {
+    'SIMPLE': "Simple Expression",
+    'NATIVE': "Native (Staged)",
+    'PYTHON': "Python",
+    'NONE'  : "No Driver",
+    }
+
+
+def is_shape_variable(variable: 'DriverVariable') -> bool:
+    return variable.targets[0].data_path.startswith('key_blocks[')
+
+
+def combination_expression(mode: str, factors: Sequence[str], keys: Sequence[str]) -> str:
+    """
+    Returns the driver expression for mode. Only uses operators and functions supported by
+    Blender's simple expression evaluator (min and max accept any number of arguments).
+    """
+    if len(keys) == 0:
+        return "0.0"
+
+    if mode == 'MULTIPLY':
+        value = "*".join(keys)
+    elif mode == 'MIN':
+        value = f'min({",".join(keys)})' if len(keys) > 1 else keys[0]
+    elif mode == 'MAX':
+        value = f'max({",".join(keys)})' if len(keys) > 1 else keys[0]
+    else:
+        value = f'(({"+".join(keys)})/{str(float(len(keys)))})'
+
+    return "*".join(tuple(factors) + (value,))
+
+
+def stage_property_name(manager: 'CombinationShapeKey', index: int) -> str:
+    return f'{manager.identifier}_stage_{index}'
+
+
+def stage_variable_name(index: int) -> str:
+    return f's{index}_'
+
+
+def variable_copy(source: 'DriverVariable', variables: 'DriverVariables') -> None:
+    variable = variables.new()
+    variable.type = 'SINGLE_PROP'
+    variable.name = source.name
+    variable.targets[0].id_type = source.targets[0].id_type
+    variable.targets[0].id = source.targets[0].id
+    variable.targets[0].data_path = source.targets[0].data_path
+
+
+def stages_clear(manager: 'CombinationShapeKey', driver: 'Driver') -> None:
+    """
+    Removes the stage drivers, properties and variables of a staged combination driver and
+    moves the shape variables held by the stage drivers back to the combination driver, in
+    their original order
+    """
+    count = manager.get("stages", 0)
+    if count:
+        key = manager.id_data
+        variables = driver.variables
+        names = {stage_variable_name(index) for index in range(count)}
+        for variable in reversed(tuple(variables)):
+            if variable.name in names:
+                variables.remove(variable)
+        existing = {variable.name for variable in variables}
+        for index in range(count):
+            name = stage_property_name(manager, index)
+            stage = driver_find(key, f'["{name}"]')
+            if stage is not None:
+                for variable in stage.driver.variables:
+                    if variable.name not in existing:
+                        variable_copy(variable, variables)
+            driver_remove(key, f'["{name}"]')
+            try:
+                del key[name]
+            except KeyError: pass
+        manager["stages"] = 0
+
+
+def driver_unstage(manager: 'CombinationShapeKey', fcurve: 'FCurve') -> None:
+    """
+    Moves the shape variables of a staged combination driver back to it so that they can be
+    edited by index. The next driver_compile stages the driver again if required.
+    """
+    if manager.get("stages", 0):
+        stages_clear(manager, fcurve.driver)
+        combination_inputs_invalidate(manager.id_data, manager.identifier)
+
+
+def stages_chunk(mode: str, variables: Sequence['DriverVariable']) -> List[Sequence['DriverVariable']]:
+    if mode != 'MULTIPLY':
+        # Native MIN, MAX and AVERAGE drivers have no expression length limit
+        return [variables]
+
+    chunks = []
+    chunk = []
+    length = -1
+    for variable in variables:
+        size = len(variable.name) + 1
+        if chunk and length + size > EXPRESSION_MAX_LENGTH:
+            chunks.append(chunk)
+            chunk = []
+            length = -1
+        chunk.append(variable)
+        length += size
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def stages_build(manager: 'CombinationShapeKey', driver: 'Driver', shapes: Sequence['DriverVariable']) -> List[str]:
+    """
+    Builds the stage drivers for a combination whose expression is too long to be evaluated
+    as a simple expression. MIN, MAX and AVERAGE use a single native driver, MULTIPLY uses
+    as many simple expression products as are required. The shape variables are moved to the
+    stage drivers so the combination driver only depends on the stages. Returns the stage
+    variable names.
+    """
+    key = manager.id_data
+    mode = manager.mode
+    variables = driver.variables
+    moved = [variable.name for variable in shapes]
+    names = []
+
+    for index, chunk in enumerate(stages_chunk(mode, shapes)):
+        prop = stage_property_name(manager, index)
+        key[prop] = 0.0
+
+        stage = driver_ensure(key, f'["{prop}"]').driver
+        for source in chunk:
+            variable_copy(source, stage.variables)
+
+        if mode == 'MULTIPLY':
+            stage.type = 'SCRIPTED'
+            stage.expression = "*".join(variable.name for variable in chunk)
+        else:
+            stage.type = mode
+
+        name = stage_variable_name(index)
+        variable = variables.new()
+        variable.type = 'SINGLE_PROP'
+        variable.name = name
+        variable.targets[0].id_type = 'KEY'
+        variable.targets[0].id = key
+        variable.targets[0].data_path = f'["{prop}"]'
+        names.append(name)
+
+    for name in reversed(moved):
+        variables.remove(variables[name])
+
+    manager["stages"] = len(names)
+    return names
+
+
+def driver_compile(manager: 'CombinationShapeKey', fcurve: 'FCurve') -> None:
+    """
+    Writes the combination driver so that it is never evaluated by Python, staging it if the
+    expression would be too long. When enabled and possible the activation curve is folded
+    into the expression, in which case the manager's "folded" flag is set and the fcurve
+    keyframes are no longer needed.
+    """
+    driver = fcurve.driver
+    driver.type = 'SCRIPTED'
+    stages_clear(manager, driver)
+
+    variables = driver.variables
+    factors = (variables[1].name, variables[2].name)
+    shapes = [variable for variable in variables[3:] if is_shape_variable(variable)]
+    expression = combination_expression(manager.mode, factors, [variable.name for variable in shapes])
+
+    if len(expression) > EXPRESSION_MAX_LENGTH:
+        names = stages_build(manager, driver, shapes)
+        expression = "*".join(factors + tuple(names))
+
+    folded = curve_fold(manager, expression) if manager.use_curve_folding else None
+    if folded is not None and len(folded) <= EXPRESSION_MAX_LENGTH:
+        expression = folded
+        manager["folded"] = True
+    else:
+        manager["folded"] = False
+
+    driver.expression = expression
+
+
+def driver_evaluation_path(manager: 'CombinationShapeKey', fcurve: Optional['FCurve']) -> str:
+    """Returns the path Blender uses to evaluate the combination driver, 'NONE' without one"""
+    if fcurve is None:
+        return 'NONE'
+    if manager.get("stages", 0):
+        return 'NATIVE'
+    return 'SIMPLE' if fcurve.driver.is_simple_expression else 'PYTHON'
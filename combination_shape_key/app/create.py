@@ -0,0 +1,199 @@
+
+from typing import Iterable, List, NamedTuple, Optional, Sequence, Tuple, TYPE_CHECKING
+from uuid import uuid4
+from bpy.types import Curve, Lattice
+from ..lib.idprop_utils import idprop_ensure
+from ..lib.driver_utils import driver_ensure
+from ..api.combination_shape_key import MODE_INDEX
+from .graph import combination_graph, downstream
+from .naming import variable_names
+from .store import factor_target, is_store_enabled, store_slots_allocate
+if TYPE_CHECKING:
+    from bpy.types import Driver, Key
+    from ..api.combination_shape_key import CombinationShapeKey
+
+
+class CombinationSpec(NamedTuple):
+    """Describes a combination shape key to be created"""
+    name: str
+    drivers: Sequence[str]
+    mode: str = 'MULTIPLY'
+    radius: float = 1.0
+    target_value: float = 1.0
+    clamp: bool = True
+    # Activation curve points as (x, y, handle_type), None for the default curve
+    curve: Optional[Sequence[Tuple[float, float, str]]] = None
+    use_curve_folding: bool = True
+    mute: bool = False
+
+
+def owner_id_type(key: 'Key') -> str:
+    """The driver target id_type of the ID that owns key"""
+    id = key.user
+    if isinstance(id, Lattice):
+        return 'LATTICE'
+    if isinstance(id, Curve):
+        return 'CURVE'
+    return 'MESH'
+
+
+def manager_create(key: 'Key',
+                   name: str,
+                   slot: Optional[int]=None,
+                   identifier: Optional[str]=None) -> 'CombinationShapeKey':
+    """
+    Adds and initializes a combination shape key manager for the target shape key name. The
+    weight and influence are kept in the shared store if slot is given, otherwise as ID
+    properties of the Key's owner. A new identifier is generated unless one is given.
+    """
+    manager = key.combination_shape_keys.add()
+    manager["name"] = name
+    manager["identifier"] = identifier or f'combination_{uuid4().hex}'
+    manager.activation_curve.__init__()
+    if slot is not None:
+        manager["slot"] = slot
+    else:
+        idprop_ensure(key.user, manager.weight_property_name)
+        idprop_ensure(key.user, manager.influence_property_name)
+    return manager
+
+
+def activation_curve_points(manager: 'CombinationShapeKey') -> List[Tuple[float, float, str]]:
+    """The points of the activation curve of manager as (x, y, handle_type)"""
+    return [(point.location[0], point.location[1], point.handle_type)
+            for point in manager.activation_curve.curve.points]
+
+
+def activation_curve_assign(manager: 'CombinationShapeKey', data: Sequence[Tuple[float, float, str]]) -> None:
+    """Replaces the points of the activation curve of manager with data, as (x, y, handle_type)"""
+    points = manager.activation_curve.curve.points
+    while len(points) > max(len(data), 2):
+        points.remove(points[-1])
+    while len(points) < len(data):
+        points.new(0.0, 0.0)
+    for point, (x, y, handle_type) in zip(points, data):
+        point.location = (x, y)
+        point.handle_type = handle_type
+
+
+def driver_variables_create(driver: 'Driver',
+                            key: 'Key',
+                            manager: 'CombinationShapeKey',
+                            drivers: Sequence[str],
+                            id_type: str) -> None:
+    """Creates the identifier, weight, influence and shape key variables for a combination driver"""
+    variables = driver.variables
+
+    v = variables.new()
+    v.type = 'SINGLE_PROP'
+    v.name = manager["identifier"]
+    v.targets[0].id_type = 'KEY'
+    v.targets[0].id = key
+    v.targets[0].data_path = 'reference_key.value'
+
+    for name, factor in (("w_", "weight"), ("i_", "influence")):
+        id, path, index = factor_target(manager, factor)
+        v = variables.new()
+        v.type = 'SINGLE_PROP'
+        v.name = name
+        v.targets[0].id_type = 'KEY' if id == key else id_type
+        v.targets[0].id = id
+        v.targets[0].data_path = path if index < 0 else f'{path}[{index}]'
+
+    for shape, name in zip(drivers, variable_names(len(drivers))):
+        v = variables.new()
+        v.type = 'SINGLE_PROP'
+        v.name = name
+        v.targets[0].id_type = 'KEY'
+        v.targets[0].id = key
+        v.targets[0].data_path = f'key_blocks["{shape}"].value'
+
+
+def combination_shape_key_create(key: 'Key',
+                                 name: str,
+                                 drivers: Sequence[str],
+                                 **settings) -> 'CombinationShapeKey':
+    """
+    Creates a combination shape key for the existing shape key name, driven by the shape keys
+    named in drivers. Accepts the optional settings of CombinationSpec.
+    """
+    return combination_shape_keys_create(key, (CombinationSpec(name, drivers, **settings),))[0]
+
+
+def combination_specs_validate(key: Optional['Key'],
+                               specs: Sequence[CombinationSpec],
+                               added: Iterable[str]=()) -> List[str]:
+    """
+    Checks specs for combination_shape_keys_create without changing anything, treating the
+    shape keys named in added as if they already existed. key may be None if it has not been
+    created yet. Returns a description of each problem found.
+    """
+    shapes = set(key.key_blocks.keys()) if key is not None else set()
+    shapes.update(added)
+    existing = (set(key.combination_shape_keys.keys())
+                if key is not None and key.is_property_set("combination_shape_keys") else set())
+
+    errors = []
+    for spec in specs:
+        if spec.name not in shapes:
+            errors.append(f'Shape key "{spec.name}" not found')
+        elif spec.name in existing:
+            errors.append(f'Shape key "{spec.name}" is already a combination shape key')
+        if spec.mode not in MODE_INDEX:
+            errors.append(f'Invalid mode "{spec.mode}" for "{spec.name}"')
+        if spec.curve is not None and len(spec.curve) < 2:
+            errors.append(f'Activation curve of "{spec.name}" requires at least 2 points')
+        for name in spec.drivers:
+            if name not in shapes:
+                errors.append(f'Driver shape key "{name}" not found for "{spec.name}"')
+        existing.add(spec.name)
+
+    if not errors:
+        graph = combination_graph(key).dependents.items() if key is not None else ()
+        dependents = {name: set(items) for name, items in graph}
+        for spec in specs:
+            for name in spec.drivers:
+                dependents.setdefault(name, set()).add(spec.name)
+        for spec in specs:
+            if spec.name in downstream(dependents, spec.drivers):
+                errors.append(f'Driving "{spec.name}" with {", ".join(spec.drivers)} creates a dependency cycle')
+
+    return errors
+
+
+def combination_shape_keys_create(key: 'Key', specs: Iterable[CombinationSpec]) -> List['CombinationShapeKey']:
+    """
+    Creates a combination shape key for each item in specs. Target and driver shape keys must
+    already exist and no combination may end up depending on itself. All specs are validated
+    before anything is created and each new combination's driver and fcurve are built once,
+    after all its variables have been added.
+    """
+    specs = tuple(specs)
+    errors = combination_specs_validate(key, specs)
+    if errors:
+        raise ValueError("\n".join(errors))
+
+    id_type = owner_id_type(key)
+    slots = store_slots_allocate(key, len(specs)) if is_store_enabled(key) else [None] * len(specs)
+    managers = []
+
+    for spec, slot in zip(specs, slots):
+        manager = manager_create(key, spec.name, slot)
+        # Assign settings directly so that update callbacks are not triggered
+        manager["mode"] = MODE_INDEX[spec.mode]
+        manager["radius"] = spec.radius
+        manager["target_value"] = spec.target_value
+        manager["clamp"] = spec.clamp
+        manager["use_curve_folding"] = spec.use_curve_folding
+        manager["mute"] = spec.mute
+        if spec.curve:
+            activation_curve_assign(manager, spec.curve)
+
+        fcurve = driver_ensure(key, manager.data_path)
+        driver_variables_create(fcurve.driver, key, manager, spec.drivers, id_type)
+        managers.append(manager)
+
+    for manager in managers:
+        manager.update()
+
+    return managers
@@ -0,0 +1,53 @@
+
+from typing import List, Optional, Sequence, Tuple, TYPE_CHECKING
+import numpy as np
+from ..lib.curve_mapping import to_bezier
+from ..lib.evaluator import CombinationSettings, bezier_array, evaluate
+from .store import factor_value
+if TYPE_CHECKING:
+    from bpy.types import Key
+    from ..api.combination_shape_key import CombinationShapeKey
+
+
+def activation_bezier(manager: 'CombinationShapeKey') -> np.ndarray:
+    """The activation curve of manager as a normalized bezier array"""
+    bezier = to_bezier(manager.activation_curve.curve.points,
+                       x_range=(0.0, 1.0),
+                       y_range=(0.0, 1.0),
+                       extrapolate=not manager.clamp)
+    return bezier_array([(tuple(p.co), tuple(p.handle_left), tuple(p.handle_right)) for p in bezier])
+
+
+def combination_settings(manager: 'CombinationShapeKey') -> CombinationSettings:
+    """Reads the current settings of manager for use with the reference evaluator"""
+    key = manager.id_data
+    shape = key.key_blocks.get(manager.name)
+    return CombinationSettings(mode=manager.mode,
+                               radius=manager.radius,
+                               target_value=manager.target_value,
+                               clamp=manager.clamp,
+                               curve=activation_bezier(manager),
+                               weight=factor_value(manager, "weight"),
+                               influence=factor_value(manager, "influence"),
+                               slider_min=shape.slider_min if shape else 0.0,
+                               slider_max=shape.slider_max if shape else 1.0)
+
+
+def combination_driver_names(manager: 'CombinationShapeKey') -> Tuple[str, ...]:
+    """Names of the shape keys driving manager"""
+    inputs = manager.inputs
+    return inputs.names if inputs is not None else tuple()
+
+
+def combination_values(key: 'Key',
+                       managers: Optional[Sequence['CombinationShapeKey']]=None) -> List[float]:
+    """Evaluates the current value of each combination of key from the current shape key values"""
+    if managers is None:
+        managers = [manager for manager in key.combination_shape_keys if manager.is_valid]
+    blocks = key.key_blocks
+    settings = [combination_settings(manager) for manager in managers]
+    inputs = []
+    for manager in managers:
+        names = combination_driver_names(manager)
+        inputs.append(np.array([[blocks[name].value if name in blocks else 0.0] for name in names]).reshape(-1, 1))
+    return evaluate(settings, inputs, frames=1)[:, 0].tolist()
@@ -0,0 +1,192 @@
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple, TYPE_CHECKING
+import json
+import numpy as np
+from .create import (CombinationSpec,
+                     activation_curve_points,
+                     combination_shape_keys_create,
+                     combination_specs_validate)
+from .evaluate import combination_driver_names
+from .sparse import SPARSE_EPSILON, sparse_delta, sparse_delta_apply
+from .store import factor_assign, factor_value
+if TYPE_CHECKING:
+    from bpy.types import Key, Object
+
+EXCHANGE_VERSION = 1
+
+
+def combinations_export(key: 'Key',
+                        names: Optional[Iterable[str]]=None,
+                        include_deltas: Optional[bool]=False,
+                        epsilon: float=SPARSE_EPSILON) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+    """
+    Returns the combination network of key as a JSON serializable dictionary and, if
+    include_deltas is True, the sparse offsets of each combination's shape key packed into
+    "indices", "deltas" and "offsets" arrays (the offsets delimit each combination's entries)
+    """
+    managers = key.combination_shape_keys
+    if names is None:
+        items = [manager for manager in managers if manager.is_valid]
+    else:
+        items = [managers[name] for name in names if name in managers and managers[name].is_valid]
+
+    blocks = key.key_blocks
+    combinations = []
+    indices = []
+    deltas = []
+
+    for manager in items:
+        shape = blocks[manager.name]
+        combinations.append({
+            "name": manager.name,
+            "drivers": list(combination_driver_names(manager) or manager.get("baked_drivers", ())),
+            "mode": manager.mode,
+            "radius": manager.radius,
+            "target_value": manager.target_value,
+            "clamp": manager.clamp,
+            "use_curve_folding": manager.use_curve_folding,
+            "curve": activation_curve_points(manager),
+            "weight": factor_value(manager, "weight"),
+            "influence": factor_value(manager, "influence"),
+            "slider_min": shape.slider_min,
+            "slider_max": shape.slider_max,
+            "relative_key": shape.relative_key.name,
+            "vertex_group": shape.vertex_group,
+            })
+        if include_deltas:
+            index, delta = sparse_delta(shape, epsilon)
+            indices.append(index.astype(np.int32))
+            deltas.append(delta.astype(np.float32))
+
+    data = {
+        "version": EXCHANGE_VERSION,
+        "points": len(key.reference_key.data),
+        "combinations": combinations,
+        }
+
+    arrays = {}
+    if include_deltas:
+        arrays["offsets"] = np.cumsum([0] + [len(index) for index in indices]).astype(np.int64)
+        arrays["indices"] = np.concatenate(indices) if indices else np.empty(0, dtype=np.int32)
+        arrays["deltas"] = np.concatenate(deltas) if deltas else np.empty((0, 3), dtype=np.float32)
+
+    return data, arrays
+
+
+def combinations_write(filepath: str, data: Dict[str, Any], arrays: Optional[Dict[str, np.ndarray]]=None) -> None:
+    """Writes data as JSON, or as an .npz archive holding the JSON and arrays if there are any"""
+    if arrays:
+        np.savez_compressed(filepath, rig=np.array(json.dumps(data)), **arrays)
+    else:
+        with open(filepath, "w") as file:
+            json.dump(data, file, indent=1)
+
+
+def combinations_read(filepath: str) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+    """Reads a file written by combinations_write"""
+    if filepath.lower().endswith(".npz"):
+        with np.load(filepath, allow_pickle=False) as archive:
+            arrays = {name: archive[name] for name in archive.files}
+        data = json.loads(str(arrays.pop("rig")))
+    else:
+        with open(filepath) as file:
+            data = json.load(file)
+        arrays = {}
+
+    if data.get("version", 0) > EXCHANGE_VERSION:
+        raise ValueError(f'Unsupported combination rig version {data.get("version")}')
+    return data, arrays
+
+
+def combinations_import(object: 'Object',
+                        data: Dict[str, Any],
+                        arrays: Optional[Dict[str, np.ndarray]]=None,
+                        replace_from: Optional[str]="",
+                        replace_to: Optional[str]="") -> Tuple[List[str], Dict[str, str]]:
+    """
+    Rebuilds the combinations in data on object, renaming every shape key name by replacing
+    replace_from with replace_to. All combinations are validated before any shape key is added,
+    raising ValueError if one of them can not be created. Missing target shape keys are then
+    all added before their relative keys are assigned and, if arrays holds sparse offsets for
+    the same point count, their offsets set, so that a relative key may be any imported shape.
+    All combinations are created in a single batch. Returns the names of the created
+    combinations and a dictionary of skipped names with the reason they were skipped.
+    """
+    def rename(name: str) -> str:
+        return name.replace(replace_from, replace_to) if replace_from else name
+
+    key = object.data.shape_keys
+    blocks = key.key_blocks.keys() if key is not None else ()
+    existing = (set(key.combination_shape_keys.keys())
+                if key is not None and key.is_property_set("combination_shape_keys") else set())
+    items = [(index, item, rename(item["name"])) for index, item in enumerate(data.get("combinations", ()))]
+    targets = {name for _, item, name in items}
+    skipped: Dict[str, str] = {}
+    accepted = [(index, item, name, [rename(driver) for driver in item["drivers"]]) for index, item, name in items]
+
+    # Skipping a combination can leave others without a driver, repeat until nothing changes
+    while True:
+        count = len(accepted)
+        for index, item, name, drivers in tuple(accepted):
+            missing = [driver for driver in drivers if driver not in blocks and driver not in targets]
+            if name in existing:
+                skipped[name] = "already a combination shape key"
+            elif missing:
+                skipped[name] = f'driver shape keys not found: {", ".join(missing)}'
+            else:
+                continue
+            accepted.remove((index, item, name, drivers))
+            targets.discard(name)
+        if len(accepted) == count:
+            break
+
+    specs = [CombinationSpec(name, drivers,
+                             mode=item.get("mode", 'MULTIPLY'),
+                             radius=item.get("radius", 1.0),
+                             target_value=item.get("target_value", 1.0),
+                             clamp=item.get("clamp", True),
+                             curve=[tuple(point) for point in item.get("curve", ())] or None,
+                             use_curve_folding=item.get("use_curve_folding", True))
+             for _, item, name, drivers in accepted]
+    added = [name for _, _, name, _ in accepted if name not in blocks]
+
+    errors = combination_specs_validate(key, specs, added)
+    if errors:
+        raise ValueError("\n".join(errors))
+
+    if key is None:
+        object.shape_key_add(name="Basis", from_mix=False)
+        key = object.data.shape_keys
+    blocks = key.key_blocks
+
+    # Add every missing shape first so that relative keys can refer to any of them
+    shapes = {name: object.shape_key_add(name=name, from_mix=False) for name in added}
+
+    use_deltas = bool(arrays) and data.get("points") == len(key.reference_key.data)
+
+    for index, item, name, _ in accepted:
+        shape = shapes.get(name)
+        if shape is not None:
+            relative = blocks.get(rename(item.get("relative_key", "")))
+            if relative is not None and relative != shape:
+                shape.relative_key = relative
+            if use_deltas:
+                start, end = arrays["offsets"][index:index+2]
+                sparse_delta_apply(shape, arrays["indices"][start:end], arrays["deltas"][start:end])
+        else:
+            shape = blocks[name]
+        shape.slider_min = item.get("slider_min", 0.0)
+        shape.slider_max = item.get("slider_max", 1.0)
+        group = rename(item.get("vertex_group", ""))
+        if group in object.vertex_groups:
+            shape.vertex_group = group
+
+    managers = combination_shape_keys_create(key, specs)
+
+    for manager, (_, item, _, _) in zip(managers, accepted):
+        for factor in ("weight", "influence"):
+            value = item.get(factor, 1.0)
+            if value != 1.0:
+                factor_assign(manager, factor, value)
+
+    return [manager.name for manager in managers], skipped
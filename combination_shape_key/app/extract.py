@@ -0,0 +1,105 @@
+
+from typing import Collection, Dict, Mapping, TYPE_CHECKING
+import numpy as np
+from .mirror import shape_coords, shape_coords_set
+if TYPE_CHECKING:
+    from bpy.types import Depsgraph, Key, Object
+
+# Combinations with a current value below this are solved as if fully active
+EXTRACT_MIN_VALUE = 1e-3
+
+
+def object_coords(object: 'Object') -> np.ndarray:
+    """
+    The undeformed coordinates of a mesh object as an (N, 3) array, without modifiers. These
+    are the coordinates of its active shape key if it has shape keys, which is where sculpting
+    writes to, and of its vertices otherwise.
+    """
+    shape = object.active_shape_key
+    if shape is not None:
+        return shape_coords(shape)
+    vertices = object.data.vertices
+    co = np.empty(len(vertices) * 3, dtype=np.float32)
+    vertices.foreach_get("co", co)
+    return co.reshape(-1, 3)
+
+
+def evaluated_coords(object: 'Object', depsgraph: 'Depsgraph') -> np.ndarray:
+    """
+    The coordinates of the object's evaluated mesh as an (N, 3) array, i.e. its current shape
+    key mix deformed by its modifiers. Raises ValueError if modifiers change the number of
+    vertices, since the coordinates would no longer correspond to the shape key's points.
+    """
+    evaluated = object.evaluated_get(depsgraph)
+    mesh = evaluated.to_mesh()
+    try:
+        vertices = mesh.vertices
+        if len(vertices) != len(object.data.vertices):
+            raise ValueError(f'Modifiers of "{object.name}" change its vertex count, '
+                             'disable them to extract from the evaluated mesh')
+        co = np.empty(len(vertices) * 3, dtype=np.float32)
+        vertices.foreach_get("co", co)
+    finally:
+        evaluated.to_mesh_clear()
+    return co.reshape(-1, 3)
+
+
+def shape_mix(key: 'Key', exclude: Collection[str]=()) -> np.ndarray:
+    """
+    The sum of each unmuted shape key's offset from its relative key scaled by its current value,
+    leaving out the shape keys named in exclude. Vertex group weights are not taken into account.
+    """
+    blocks = key.key_blocks
+    reference = key.reference_key
+    mix = np.zeros((len(reference.data), 3), dtype=np.float64)
+    coords = {}
+
+    def coords_get(shape):
+        co = coords.get(shape.name)
+        if co is None:
+            co = coords[shape.name] = shape_coords(shape)
+        return co
+
+    for shape in blocks:
+        if (shape != reference and not shape.mute and shape.value != 0.0
+                and shape.name not in exclude):
+            mix += shape.value * (coords_get(shape) - coords_get(shape.relative_key))
+    return mix
+
+
+def correctives_extract(key: 'Key',
+                        targets: Mapping[str, np.ndarray],
+                        exclude: Collection[str]=()) -> Dict[str, float]:
+    """
+    Solves the offsets of the named combination shape keys so that the current shape key mix
+    reproduces each target's (N, 3) coordinates, i.e. for each combination c:
+
+        offset_c = (target_c - basis - (mix - value_c * offset_c)) / value_c
+
+    Shape keys named in exclude, such as a shape key holding a target, are left out of the
+    mix. The mix is computed once and then kept current as each combination is solved, so a
+    combination solved later is solved against the new offsets of those solved before it.
+    Returns the value each combination was solved for.
+    """
+    blocks = key.key_blocks
+    basis = shape_coords(key.reference_key).astype(np.float64)
+    mix = shape_mix(key, exclude)
+    result = {}
+
+    for name, target in targets.items():
+        shape = blocks[name]
+        target = np.asarray(target, dtype=np.float64).reshape(-1, 3)
+        if target.shape != basis.shape:
+            raise ValueError(f'Target for "{name}" has {len(target)} points, expected {len(basis)}')
+
+        relative = shape_coords(shape.relative_key).astype(np.float64)
+        offset = shape_coords(shape) - relative
+        value = 0.0 if shape.mute or name in exclude else shape.value
+
+        residual = target - basis - (mix - value * offset)
+        solve = value if value >= EXTRACT_MIN_VALUE else 1.0
+        shape_coords_set(shape, relative + residual / solve)
+        mix += value * (residual / solve - offset)
+        result[name] = solve
+
+    return result
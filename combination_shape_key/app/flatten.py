@@ -0,0 +1,131 @@
+
+from typing import TYPE_CHECKING
+from .compile import driver_unstage
+from .fold import curve_preset
+from .graph import combination_graph
+from .index import combination_driver_find
+from .inputs import combination_inputs_invalidate
+from .naming import variable_allocator
+from .store import factor_target, factor_value
+if TYPE_CHECKING:
+    from bpy.types import ID, Key
+    from ..api.combination_shape_key import CombinationShapeKey
+
+# Modes for which combine(a, combine(b, c)) == combine(a, b, c)
+FLATTEN_MODES = {'MULTIPLY', 'MIN', 'MAX'}
+
+
+def is_property_animated(id: 'ID', path: str, index: int=0) -> bool:
+    animdata = id.animation_data
+    if animdata is None:
+        return False
+    if animdata.drivers.find(path, index=index) is not None:
+        return True
+    action = animdata.action
+    return action is not None and action.fcurves.find(path, index=index) is not None
+
+
+def is_combination_identity(manager: 'CombinationShapeKey') -> bool:
+    """
+    Whether or not the value of the combination shape key is exactly the combined value of its
+    driver shape keys, so that it can be replaced by them in another combination of the same mode
+    """
+    key = manager.id_data
+    blocks = key.key_blocks
+    shape = blocks.get(manager.name)
+    if (shape is None
+            or manager.mute
+            or manager.get("baked", False)
+            or manager.radius != 1.0
+            or manager.target_value != 1.0
+            or curve_preset(manager) != 'LINEAR'
+            or shape.slider_min > 0.0
+            or shape.slider_max < 1.0):
+        return False
+
+    for factor in ("weight", "influence"):
+        owner, path, index = factor_target(manager, factor)
+        if factor_value(manager, factor) != 1.0 or is_property_animated(owner, path, max(index, 0)):
+            return False
+
+    inputs = manager.inputs
+    if inputs is None or not inputs.shapes:
+        return False
+
+    # Inputs limited to 0-1 keep the combined value within the clamp and slider range
+    for name in inputs.names:
+        item = blocks.get(name)
+        if item is None or item.slider_min < 0.0 or item.slider_max > 1.0:
+            return False
+    return True
+
+
+def combination_flatten(manager: 'CombinationShapeKey') -> int:
+    """
+    Replaces driver shape keys of manager that are combinations of the same mode, and whose
+    value is their combined inputs, with their own driver shape keys, until no such inputs are
+    left. Returns the number of inputs replaced.
+    """
+    mode = manager.mode
+    key = manager.id_data
+    if mode not in FLATTEN_MODES or manager.name in combination_graph(key).cycles:
+        return 0
+
+    fcurve = combination_driver_find(key, manager.identifier)
+    if fcurve is None:
+        return 0
+
+    driver_unstage(manager, fcurve)
+    managers = key.combination_shape_keys
+    variables = fcurve.driver.variables
+    skipped = set()
+    count = 0
+
+    while True:
+        inputs = manager.inputs
+        names = set(inputs.names)
+        for item in inputs.shapes:
+            nested = managers.get(item.name)
+            if (item.name not in skipped
+                    and nested is not None
+                    and nested.mode == mode
+                    and is_combination_identity(nested)):
+                break
+        else:
+            break
+
+        additions = nested.inputs.names
+        others = names - {item.name}
+        if mode == 'MULTIPLY' and not others.isdisjoint(additions):
+            # Repeated factors would change the product
+            skipped.add(item.name)
+            continue
+
+        additions = [name for name in dict.fromkeys(additions) if name not in others]
+        allocator = variable_allocator(key, manager.identifier, variables)
+
+        allocator.release(item.variable)
+        variables.remove(variables[item.index])
+        for shape in additions:
+            name = allocator.allocate()
+            variable = variables.new()
+            variable.type = 'SINGLE_PROP'
+            variable.name = name
+            variable.targets[0].id_type = 'KEY'
+            variable.targets[0].id = key
+            variable.targets[0].data_path = f'key_blocks["{shape}"].value'
+
+        combination_inputs_invalidate(key, manager.identifier)
+        count += 1
+
+    if count:
+        manager.driver_update()
+    return count
+
+
+def combinations_flatten(key: 'Key') -> int:
+    """Flattens every nested combination of key. Returns the total number of inputs replaced."""
+    graph = combination_graph(key)
+    names = sorted((name for name, depth in graph.depth.items() if depth > 1), key=graph.depth.get)
+    managers = key.combination_shape_keys
+    return sum(combination_flatten(managers[name]) for name in names)
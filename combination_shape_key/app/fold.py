@@ -0,0 +1,75 @@
+
+from typing import Optional, TYPE_CHECKING
+if TYPE_CHECKING:
+    from ..api.combination_shape_key import CombinationShapeKey
+
+# Point locations closer than this are considered equal when matching presets
+FOLD_EPSILON = 1e-5
+
+# Handle types of a two point (0, 0) -> (1, 1) activation curve for each foldable preset
+FOLD_PRESETS = {
+    'LINEAR': {'VECTOR', 'AUTO'},
+    'SMOOTHSTEP': {'AUTO_CLAMPED'},
+    }
+
+
+def _number(value: float) -> str:
+    return format(float(value), ".6g")
+
+
+def curve_preset(manager: 'CombinationShapeKey') -> Optional[str]:
+    """
+    Returns the name of the preset matching the activation curve of manager, one of 'LINEAR'
+    or 'SMOOTHSTEP', or None if the curve has no closed form equivalent
+    """
+    points = manager.activation_curve.curve.points
+    if len(points) != 2:
+        return None
+
+    for point, (x, y) in zip(points, ((0.0, 0.0), (1.0, 1.0))):
+        location = point.location
+        if abs(location[0] - x) > FOLD_EPSILON or abs(location[1] - y) > FOLD_EPSILON:
+            return None
+
+    types = {point.handle_type for point in points}
+    if len(types) == 1:
+        for preset, handles in FOLD_PRESETS.items():
+            if types <= handles:
+                return preset
+    return None
+
+
+def is_curve_foldable(manager: 'CombinationShapeKey') -> bool:
+    """Whether or not folding is enabled and the activation settings of manager can be folded"""
+    return manager.use_curve_folding and manager.radius > 0.0 and curve_preset(manager) is not None
+
+
+def curve_fold(manager: 'CombinationShapeKey', value: str) -> Optional[str]:
+    """
+    Returns an expression applying the activation curve, radius, goal and clamp of manager to
+    the expression value, or None if the activation curve can not be folded. Only uses
+    functions supported by Blender's simple expression evaluator.
+    """
+    radius = manager.radius
+    if radius <= 0.0:
+        return None
+
+    preset = curve_preset(manager)
+    if preset is None:
+        return None
+
+    offset = 1.0 - radius
+    x = f'({value})' if offset == 0.0 else f'({value}-{_number(offset)})'
+    if radius != 1.0:
+        x = f'{x}/{_number(radius)}'
+
+    if preset == 'LINEAR' and not manager.clamp:
+        # The fcurve extends linearly beyond its end points when clamp is disabled
+        curve = x
+    else:
+        # The end handles of a smoothstep curve are flat so it never extrapolates
+        u = f'min(max({x},0.0),1.0)'
+        curve = u if preset == 'LINEAR' else f'{u}*{u}*(3.0-2.0*{u})'
+
+    goal = manager.target_value
+    return curve if goal == 1.0 else f'{curve}*{_number(goal)}'
@@ -0,0 +1,99 @@
+
+from typing import Dict, Iterable, Mapping, Optional, Set, Tuple, TYPE_CHECKING
+from .index import index_stamp
+if TYPE_CHECKING:
+    from bpy.types import Key
+
+_GRAPHS: Dict[int, 'CombinationGraph'] = {}
+
+
+def downstream(dependents: Mapping[str, Iterable[str]], names: Iterable[str]) -> Set[str]:
+    """The names reachable from names (inclusive) by following dependents"""
+    result = set(names)
+    stack = list(result)
+    while stack:
+        for dependent in dependents.get(stack.pop(), ()):
+            if dependent not in result:
+                result.add(dependent)
+                stack.append(dependent)
+    return result
+
+
+class CombinationGraph:
+    """The dependencies between the combination shape keys of a single Key"""
+
+    __slots__ = ("stamp", "inputs", "dependents", "depth", "cycles")
+
+    def __init__(self, key: 'Key') -> None:
+        self.stamp = index_stamp(key)
+        # combination name -> names of all its driver shape keys
+        self.inputs: Dict[str, Tuple[str, ...]] = {}
+        # shape key name -> names of the combinations it directly drives
+        self.dependents: Dict[str, Set[str]] = {}
+
+        for manager in key.combination_shape_keys:
+            inputs = manager.inputs
+            names = inputs.names if inputs is not None else tuple()
+            self.inputs[manager.name] = names
+            for name in names:
+                self.dependents.setdefault(name, set()).add(manager.name)
+
+        # combination name -> length of the longest chain of combinations ending in it
+        self.depth: Dict[str, int] = {}
+        # names of combinations that are part of, or depend on, a dependency cycle
+        self.cycles: Set[str] = set()
+
+        # Kahn's algorithm over the combinations, counting combination inputs only
+        pending = {name: sum(1 for n in set(inputs) if n in self.inputs) for name, inputs in self.inputs.items()}
+        ready = [name for name, count in pending.items() if count == 0]
+        for name in ready:
+            self.depth[name] = 1
+
+        while ready:
+            name = ready.pop()
+            depth = self.depth[name] + 1
+            for dependent in self.dependents.get(name, ()):
+                if dependent in pending:
+                    self.depth[dependent] = max(self.depth.get(dependent, 1), depth)
+                    pending[dependent] -= 1
+                    if pending[dependent] == 0:
+                        ready.append(dependent)
+
+        for name, count in pending.items():
+            if count > 0:
+                self.cycles.add(name)
+                self.depth.pop(name, None)
+
+    def downstream(self, names: Iterable[str]) -> Set[str]:
+        """The names of all the combinations directly or indirectly driven by names, and names"""
+        return downstream(self.dependents, names)
+
+    def is_cyclic(self, name: str, drivers: Iterable[str]) -> bool:
+        """Whether or not driving name with drivers would create a dependency cycle"""
+        return not self.downstream((name,)).isdisjoint(drivers)
+
+
+def combination_graph(key: 'Key') -> CombinationGraph:
+    """Returns the (lazily rebuilt) dependency graph of the combinations of key"""
+    pointer = key.as_pointer()
+    graph = _GRAPHS.get(pointer)
+    if graph is None or graph.stamp != index_stamp(key):
+        graph = _GRAPHS[pointer] = CombinationGraph(key)
+    return graph
+
+
+def combination_graph_invalidate(key: Optional['Key']=None) -> None:
+    """Discards the dependency graph of key, or of all keys if key is None"""
+    if key is None:
+        _GRAPHS.clear()
+    else:
+        _GRAPHS.pop(key.as_pointer(), None)
+
+
+def combination_depth(key: 'Key', name: str) -> Optional[int]:
+    """
+    The evaluation depth of the combination shape key name: 1 if it is only driven by ordinary
+    shape keys, or None if it is part of a dependency cycle
+    """
+    if key.is_property_set("combination_shape_keys"):
+        return combination_graph(key).depth.get(name)
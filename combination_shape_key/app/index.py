@@ -0,0 +1,147 @@
+
+from typing import Dict, Optional, Set, Tuple, TYPE_CHECKING
+if TYPE_CHECKING:
+    from bpy.types import FCurve, Key
+    from ..api.combination_shape_key import CombinationShapeKey
+
+_INDICES: Dict[int, 'CombinationIndex'] = {}
+
+
+def index_stamp(key: 'Key') -> Tuple[int, int]:
+    animdata = key.animation_data
+    return (len(key.combination_shape_keys), len(animdata.drivers) if animdata else 0)
+
+
+def is_combination_driver(key: 'Key', fcurve: 'FCurve') -> bool:
+    """Whether or not fcurve is a driver created for a combination shape key"""
+    if fcurve.data_path.startswith('key_blocks['):
+        variables = fcurve.driver.variables
+        if len(variables):
+            variable = variables[0]
+            if variable.type == 'SINGLE_PROP':
+                target = variable.targets[0]
+                return (target.id_type == 'KEY'
+                        and target.id == key
+                        and target.data_path == "reference_key.value")
+    return False
+
+
+class CombinationIndex:
+    """Lookup tables for the combination shape keys of a single Key"""
+
+    __slots__ = ("stamp", "managers", "drivers", "names", "driven")
+
+    def __init__(self, key: 'Key') -> None:
+        self.stamp = index_stamp(key)
+        # identifier -> index of the manager in key.combination_shape_keys
+        self.managers: Dict[str, int] = {}
+        # identifier -> index of the driver fcurve in key.animation_data.drivers
+        self.drivers: Dict[str, int] = {}
+        # target shape key name -> identifier
+        self.names: Dict[str, str] = {}
+
+        for index, manager in enumerate(key.combination_shape_keys):
+            identifier = manager.get("identifier", "")
+            self.managers[identifier] = index
+            self.names[manager.get("name", "")] = identifier
+
+        animdata = key.animation_data
+        if animdata is not None:
+            for index, fcurve in enumerate(animdata.drivers):
+                if is_combination_driver(key, fcurve):
+                    self.drivers[fcurve.driver.variables[0].name] = index
+
+        # names of target shape keys that have both a manager and a driver
+        self.driven: Set[str] = {name for name, identifier in self.names.items() if identifier in self.drivers}
+
+    def manager(self, key: 'Key', identifier: str) -> Optional['CombinationShapeKey']:
+        index = self.managers.get(identifier)
+        if index is not None:
+            managers = key.combination_shape_keys
+            if index < len(managers):
+                manager = managers[index]
+                if manager.get("identifier", "") == identifier:
+                    return manager
+
+    def driver(self, key: 'Key', identifier: str) -> Optional['FCurve']:
+        index = self.drivers.get(identifier)
+        if index is not None:
+            animdata = key.animation_data
+            if animdata is not None:
+                drivers = animdata.drivers
+                if index < len(drivers):
+                    fcurve = drivers[index]
+                    variables = fcurve.driver.variables
+                    if len(variables) and variables[0].name == identifier:
+                        return fcurve
+
+
+def combination_index(key: 'Key') -> CombinationIndex:
+    """Returns the (lazily rebuilt) combination index for key"""
+    pointer = key.as_pointer()
+    index = _INDICES.get(pointer)
+    if index is None or index.stamp != index_stamp(key):
+        index = _INDICES[pointer] = CombinationIndex(key)
+    return index
+
+
+def combination_index_invalidate(key: Optional['Key']=None) -> None:
+    """Discards the index for key, or for all keys if key is None"""
+    if key is None:
+        _INDICES.clear()
+    else:
+        _INDICES.pop(key.as_pointer(), None)
+
+
+def combination_index_verified(key: 'Key', name: str) -> CombinationIndex:
+    """
+    Returns the combination index for key after checking its entry for name against the
+    managers, rebuilding the index if a rename left the manager and driver counts unchanged
+    """
+    index = combination_index(key)
+    identifier = index.names.get(name)
+    if identifier is None:
+        stale = name in key.combination_shape_keys
+    else:
+        manager = index.manager(key, identifier)
+        stale = (manager is None
+                 or manager.get("name", "") != name
+                 or (identifier in index.drivers and index.driver(key, identifier) is None))
+    if stale:
+        combination_index_invalidate(key)
+        index = combination_index(key)
+    return index
+
+
+def is_combination_shape_key(key: 'Key', name: str) -> bool:
+    """Whether or not name is the target of a combination shape key manager"""
+    return (key.is_property_set("combination_shape_keys")
+            and name in combination_index_verified(key, name).names)
+
+
+def is_combination_driven(key: 'Key', name: str) -> bool:
+    """Whether or not name is the target of a combination shape key manager with a driver"""
+    return (key.is_property_set("combination_shape_keys")
+            and name in combination_index_verified(key, name).driven)
+
+
+def combination_manager_find(key: 'Key', identifier: str) -> Optional['CombinationShapeKey']:
+    manager = combination_index(key).manager(key, identifier)
+    if manager is None:
+        combination_index_invalidate(key)
+        manager = combination_index(key).manager(key, identifier)
+    return manager
+
+
+def combination_driver_find(key: 'Key', identifier: str) -> Optional['FCurve']:
+    """
+    The driver of the combination identifier through the index. The index is only rebuilt if
+    the indexed position no longer holds the driver, a combination without a driver costs a
+    dictionary lookup.
+    """
+    index = combination_index(key)
+    fcurve = index.driver(key, identifier)
+    if fcurve is None and identifier in index.drivers:
+        combination_index_invalidate(key)
+        fcurve = combination_index(key).driver(key, identifier)
+    return fcurve
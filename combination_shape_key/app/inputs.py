@@ -0,0 +1,99 @@
+
+from typing import Dict, NamedTuple, Optional, Tuple, TYPE_CHECKING
+from ..lib.driver_utils import driver_find
+from .graph import combination_graph_invalidate
+from .index import combination_driver_find
+if TYPE_CHECKING:
+    from bpy.types import FCurve, Key
+    from ..api.combination_shape_key import CombinationShapeKey
+
+
+class CombinationInput(NamedTuple):
+    """
+    A shape key driving a combination shape key. index is the position of the variable in
+    the combination driver, or the position it returns to when the driver's stages are cleared.
+    """
+    name: str
+    variable: str
+    index: int
+
+
+class CombinationInputs(NamedTuple):
+    """Parsed view of the driver variables of a combination shape key"""
+    identifier: str
+    weight: str
+    influence: str
+    shapes: Tuple[CombinationInput, ...]
+    variable_count: int
+
+    @property
+    def names(self) -> Tuple[str, ...]:
+        """Names of the driver shape keys"""
+        return tuple(item.name for item in self.shapes)
+
+    @property
+    def variables(self) -> Tuple[str, ...]:
+        """Names of the driver shape key variables"""
+        return tuple(item.variable for item in self.shapes)
+
+
+_INPUTS: Dict[Tuple[int, str], CombinationInputs] = {}
+
+
+def combination_inputs_parse(identifier: str, fcurve: 'FCurve') -> CombinationInputs:
+    variables = fcurve.driver.variables
+    shapes = []
+    position = 3
+    for index, variable in enumerate(variables):
+        if index > 2:
+            path = variable.targets[0].data_path
+            if path.startswith('key_blocks[') and path.endswith('"].value'):
+                shapes.append(CombinationInput(path[12:-8], variable.name, position))
+            elif path.startswith(f'["{identifier}_stage_'):
+                # Staged drivers keep their shape variables on the stage drivers
+                stage = driver_find(fcurve.id_data, path)
+                if stage is not None:
+                    for source in stage.driver.variables:
+                        path = source.targets[0].data_path
+                        if path.startswith('key_blocks[') and path.endswith('"].value'):
+                            shapes.append(CombinationInput(path[12:-8], source.name, position))
+                            position += 1
+                continue
+            position += 1
+    return CombinationInputs(identifier,
+                             variables[1].name if len(variables) > 1 else "",
+                             variables[2].name if len(variables) > 2 else "",
+                             tuple(shapes),
+                             len(variables))
+
+
+def combination_inputs(manager: 'CombinationShapeKey') -> Optional[CombinationInputs]:
+    """
+    Returns the cached inputs of the combination shape key, or None if it has no driver.
+    The cache is invalidated by driver updates and renames, and if the number of driver
+    variables has changed.
+    """
+    key = manager.id_data
+    identifier = manager.identifier
+    fcurve = combination_driver_find(key, identifier)
+    if fcurve is None:
+        return None
+
+    cache_key = (key.as_pointer(), identifier)
+    inputs = _INPUTS.get(cache_key)
+    if inputs is None or inputs.variable_count != len(fcurve.driver.variables):
+        inputs = _INPUTS[cache_key] = combination_inputs_parse(identifier, fcurve)
+    return inputs
+
+
+def combination_inputs_invalidate(key: Optional['Key']=None, identifier: Optional[str]=None) -> None:
+    """Discards cached inputs for the combination identifier, all combinations of key, or everything"""
+    combination_graph_invalidate(key)
+    if key is None:
+        _INPUTS.clear()
+    elif identifier is not None:
+        _INPUTS.pop((key.as_pointer(), identifier), None)
+    else:
+        pointer = key.as_pointer()
+        for cache_key in [item for item in _INPUTS if item[0] == pointer]:
+            del _INPUTS[cache_key]
@@ -0,0 +1,93 @@
+
+from typing import Dict, Sequence, TYPE_CHECKING
+import numpy as np
+import bpy
+from ..lib.curve_mapping import keyframe_points_assign
+if TYPE_CHECKING:
+    from bpy.types import FCurve
+
+# Keyframe values closer than this are considered unchanged
+KEYFRAME_EPSILON = 1e-6
+
+_KEYFRAME_ENUMS = ("handle_left_type", "handle_right_type", "interpolation")
+
+# Keyframe enum property name -> identifier -> integer value
+_ENUM_VALUES: Dict[str, Dict[str, int]] = {}
+
+
+def keyframes_read(fcurve: 'FCurve') -> np.ndarray:
+    """The co, handle_left and handle_right of the fcurve's keyframes as a (N, 3, 2) array"""
+    points = fcurve.keyframe_points
+    data = np.empty((3, len(points) * 2), dtype=np.float32)
+    points.foreach_get("co", data[0])
+    points.foreach_get("handle_left", data[1])
+    points.foreach_get("handle_right", data[2])
+    return data.reshape(3, -1, 2).transpose(1, 0, 2)
+
+
+def keyframes_clear(fcurve: 'FCurve') -> bool:
+    """Removes all keyframes from fcurve. Returns False if there were none."""
+    points = fcurve.keyframe_points
+    if len(points) == 0:
+        return False
+    points.clear()
+    fcurve.id_data.update_tag()
+    return True
+
+
+def keyframe_enum_values(name: str) -> Dict[str, int]:
+    """Maps the identifiers of a Keyframe enum property to the integers foreach_get returns"""
+    values = _ENUM_VALUES.get(name)
+    if values is None:
+        items = bpy.types.Keyframe.bl_rna.properties[name].enum_items
+        values = _ENUM_VALUES[name] = {item.identifier: item.value for item in items}
+    return values
+
+
+def keyframes_sync(fcurve: 'FCurve', bezier: Sequence) -> bool:
+    """
+    Updates the fcurve's keyframes to match bezier. The current keyframes are read in bulk with
+    foreach_get, the changed points are replaced in those arrays and only the arrays that
+    changed are written back with foreach_set. All keyframes are only reassigned when the
+    number of points changes. Returns False if the keyframes already matched and nothing was
+    written.
+    """
+    points = fcurve.keyframe_points
+    if len(points) != len(bezier):
+        keyframe_points_assign(points, bezier)
+        return True
+
+    if len(bezier) == 0:
+        return False
+
+    written = False
+
+    # Handle types are written before the handles so that the handles are not recalculated
+    current = np.empty(len(points), dtype=np.int32)
+    for name in _KEYFRAME_ENUMS:
+        items = [getattr(item, name, None) for item in bezier]
+        if any(value is not None for value in items):
+            values = keyframe_enum_values(name)
+            points.foreach_get(name, current)
+            new = np.array([current[index] if value is None else values[value]
+                            for index, value in enumerate(items)], dtype=np.int32)
+            if (new != current).any():
+                points.foreach_set(name, new)
+                written = True
+
+    new = np.array([(tuple(p.co), tuple(p.handle_left), tuple(p.handle_right)) for p in bezier], dtype=np.float32)
+    old = keyframes_read(fcurve)
+    changed = (np.abs(new - old) > KEYFRAME_EPSILON).any(axis=2)
+
+    for index, name in enumerate(("co", "handle_left", "handle_right")):
+        rows = np.flatnonzero(changed[:, index])
+        if len(rows):
+            data = np.ascontiguousarray(old[:, index])
+            data[rows] = new[rows, index]
+            points.foreach_set(name, data.ravel())
+            written = True
+
+    if written:
+        # foreach_set bypasses RNA updates so the change has to be flagged explicitly
+        fcurve.id_data.update_tag()
+    return written
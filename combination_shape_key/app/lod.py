@@ -0,0 +1,248 @@
+
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+from time import perf_counter
+import numpy as np
+import bpy
+from ..lib.evaluator import activation_evaluate
+from .evaluate import combination_settings
+from .graph import combination_graph
+from .index import combination_driver_find, combination_manager_find, index_stamp
+if TYPE_CHECKING:
+    from bpy.types import Context, FCurve, Key, Scene, WindowManager
+
+# Default value below which a driver shape key counts as inactive
+LOD_EPSILON = 1e-4
+
+# Modes whose value is (near) zero as soon as any input is. Other modes need all inputs inactive.
+LOD_ANY_MODES = {'MULTIPLY', 'MIN'}
+
+# Statistics for the most recent frame change
+LOD_STATS: Dict[str, float] = {"frame": 0, "combinations": 0, "skipped": 0, "seconds": 0.0}
+
+# (key pointer, identifier) -> (driver mute, shape key mute) before the combination was muted
+_MUTED: Dict[Tuple[int, str], Tuple[bool, bool]] = {}
+
+_PLANS: Dict[int, 'LODPlan'] = {}
+
+
+class LODPlan:
+    """The combinations of a Key that can be muted while idle, with their inputs in flat arrays"""
+
+    __slots__ = ("stamp", "graph", "action", "names", "identifiers", "inputs", "fcurves",
+                 "indices", "offsets", "any")
+
+    def __init__(self, key: 'Key') -> None:
+        self.stamp = index_stamp(key)
+        self.graph = combination_graph(key)
+        self.action = action_state(key)
+        animdata = key.animation_data
+        driven = {fcurve.data_path for fcurve in animdata.drivers} if animdata is not None else set()
+        combinations = self.graph.inputs
+
+        # Combinations are only eligible if their inputs are keyframed or static shape keys, so
+        # that their values at the new frame are known before the depsgraph is evaluated, and
+        # if their activation curve is zero while idle
+        self.names: List[str] = []
+        self.identifiers: List[str] = []
+        self.inputs: List[str] = []
+        positions: Dict[str, int] = {}
+        indices = []
+        offsets = []
+        modes = []
+
+        for manager in key.combination_shape_keys:
+            names = combinations.get(manager.name, ())
+            if (not names
+                    or not manager.is_valid
+                    or manager.mute
+                    or manager.get("baked", False)
+                    or any(name in combinations or f'key_blocks["{name}"].value' in driven for name in names)
+                    or abs(float(activation_evaluate(combination_settings(manager), 0.0))) > LOD_EPSILON):
+                continue
+
+            self.names.append(manager.name)
+            self.identifiers.append(manager.identifier)
+            offsets.append(len(indices))
+            modes.append(manager.mode in LOD_ANY_MODES)
+            for name in names:
+                position = positions.get(name)
+                if position is None:
+                    position = positions[name] = len(self.inputs)
+                    self.inputs.append(name)
+                indices.append(position)
+
+        self.indices = np.array(indices, dtype=np.int64)
+        self.offsets = np.array(offsets, dtype=np.int64)
+        self.any = np.array(modes, dtype=bool)
+
+        # The fcurve animating each input, resolved once. The plan is rebuilt if the action or
+        # its number of fcurves changes so these are never used after they were removed.
+        action = animdata.action if animdata is not None else None
+        fcurves = action.fcurves if action is not None else None
+        self.fcurves: List[Optional['FCurve']] = [
+            fcurves.find(f'key_blocks["{name}"].value') if fcurves is not None else None
+            for name in self.inputs]
+
+    def is_current(self, key: 'Key') -> bool:
+        return (self.stamp == index_stamp(key)
+                and self.graph is combination_graph(key)
+                and self.action == action_state(key))
+
+    def idle(self, key: 'Key', frame: float, epsilon: float) -> np.ndarray:
+        """
+        Whether each eligible combination's inputs are inactive at frame. Inputs are read from
+        the active action only, so nothing counts as idle while the Key has NLA tracks.
+        """
+        animdata = key.animation_data
+        if animdata is not None and (len(animdata.nla_tracks) or animdata.use_tweak_mode):
+            return np.zeros(len(self.names), dtype=bool)
+
+        blocks = key.key_blocks
+        values = np.empty(len(self.inputs))
+        for index, fcurve in enumerate(self.fcurves):
+            if fcurve is not None and not fcurve.mute:
+                values[index] = fcurve.evaluate(frame)
+            else:
+                shape = blocks.get(self.inputs[index])
+                values[index] = shape.value if shape is not None else 0.0
+
+        below = np.abs(values[self.indices]) < epsilon
+        return np.where(self.any,
+                        np.logical_or.reduceat(below, self.offsets),
+                        np.logical_and.reduceat(below, self.offsets))
+
+
+def action_state(key: 'Key') -> Optional[Tuple[int, int]]:
+    """Identifies the Key's action and its number of fcurves"""
+    animdata = key.animation_data
+    action = animdata.action if animdata is not None else None
+    return (action.as_pointer(), len(action.fcurves)) if action is not None else None
+
+
+def lod_plan(key: 'Key') -> LODPlan:
+    pointer = key.as_pointer()
+    plan = _PLANS.get(pointer)
+    if plan is None or not plan.is_current(key):
+        plan = _PLANS[pointer] = LODPlan(key)
+    return plan
+
+
+def combination_mute(key: 'Key', name: str, identifier: str) -> None:
+    fcurve = combination_driver_find(key, identifier)
+    shape = key.key_blocks.get(name)
+    if fcurve is not None and shape is not None:
+        _MUTED[(key.as_pointer(), identifier)] = (fcurve.mute, shape.mute)
+        fcurve.mute = True
+        shape.mute = True
+        # Combinations driven by this one read its value
+        shape.value = 0.0
+
+
+def combination_restore(key: 'Key', name: str, identifier: str) -> None:
+    state = _MUTED.pop((key.as_pointer(), identifier), None)
+    if state is not None:
+        fcurve = combination_driver_find(key, identifier)
+        if fcurve is not None:
+            fcurve.mute = state[0]
+        shape = key.key_blocks.get(name)
+        if shape is not None:
+            shape.mute = state[1]
+
+
+def is_lod_enabled(context: Optional['Context']=None) -> bool:
+    wm = getattr(context or bpy.context, "window_manager", None)
+    return bool(getattr(wm, "combination_shape_key_lod", False))
+
+
+def lod_epsilon(context: Optional['Context']=None) -> float:
+    wm = getattr(context or bpy.context, "window_manager", None)
+    return getattr(wm, "combination_shape_key_lod_epsilon", LOD_EPSILON)
+
+
+def lod_update(scene: 'Scene', frame: Optional[float]=None, epsilon: Optional[float]=None) -> int:
+    """
+    Mutes the eligible combinations whose inputs are inactive at frame and restores those whose
+    inputs became active. Returns the number of combinations muted.
+    """
+    start = perf_counter()
+    frame = scene.frame_current + scene.frame_subframe if frame is None else frame
+    epsilon = lod_epsilon() if epsilon is None else epsilon
+    total = 0
+    skipped = 0
+
+    for key in bpy.data.shape_keys:
+        if not key.is_property_set("combination_shape_keys") or not len(key.combination_shape_keys):
+            continue
+        plan = lod_plan(key)
+        if not plan.names:
+            continue
+
+        idle = plan.idle(key, frame, epsilon)
+        total += len(idle)
+        skipped += int(np.count_nonzero(idle))
+        pointer = key.as_pointer()
+        muted = np.fromiter(((pointer, identifier) in _MUTED for identifier in plan.identifiers),
+                            dtype=bool, count=len(idle))
+        for index in np.flatnonzero(idle != muted):
+            if idle[index]:
+                combination_mute(key, plan.names[index], plan.identifiers[index])
+            else:
+                combination_restore(key, plan.names[index], plan.identifiers[index])
+
+    LOD_STATS.update(frame=frame, combinations=total, skipped=skipped, seconds=perf_counter() - start)
+    return skipped
+
+
+def lod_restore() -> None:
+    """Restores every combination muted by lod_update"""
+    keys = {key.as_pointer(): key for key in bpy.data.shape_keys} if _MUTED else {}
+    for (pointer, identifier) in tuple(_MUTED):
+        key = keys.get(pointer)
+        manager = combination_manager_find(key, identifier) if key is not None else None
+        if manager is not None:
+            combination_restore(key, manager.name, identifier)
+        else:
+            _MUTED.pop((pointer, identifier), None)
+    LOD_STATS.update(combinations=0, skipped=0, seconds=0.0)
+
+
+def lod_clear() -> None:
+    """Forgets all state, e.g. after loading a file"""
+    _MUTED.clear()
+    _PLANS.clear()
+
+
+@bpy.app.handlers.persistent
+def lod_frame_change_handler(scene: 'Scene', _=None) -> None:
+    lod_update(scene)
+
+
+@bpy.app.handlers.persistent
+def lod_save_pre_handler(_=None, __=None) -> None:
+    # Never save combinations in their automatically muted state
+    lod_restore()
+
+
+@bpy.app.handlers.persistent
+def lod_undo_pre_handler(_=None, __=None) -> None:
+    # Restore before undo and redo replace the data the muted state refers to
+    lod_restore()
+    _PLANS.clear()
+
+
+def lod_toggle(wm: 'WindowManager', _: Optional['Context']=None) -> None:
+    lod_enable(wm.combination_shape_key_lod)
+
+
+def lod_enable(enable: bool) -> None:
+    handlers = bpy.app.handlers
+    for handler, callback in ((handlers.frame_change_pre, lod_frame_change_handler),
+                              (handlers.save_pre, lod_save_pre_handler),
+                              (handlers.undo_pre, lod_undo_pre_handler),
+                              (handlers.redo_pre, lod_undo_pre_handler)):
+        if enable and callback not in handler:
+            handler.append(callback)
+        elif not enable and callback in handler:
+            handler.remove(callback)
+    if not enable:
+        lod_restore()
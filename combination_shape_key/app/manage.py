@@ -0,0 +1,106 @@
+
+from typing import Any, Dict, Iterable, Mapping, Sequence, Tuple, TYPE_CHECKING
+import bpy
+from ..lib.driver_utils import driver_ensure
+from ..api.combination_shape_key import MODE_INDEX
+from .compile import driver_compile
+from .index import combination_manager_find
+from .inputs import combination_inputs_invalidate
+from .preview import fcurve_updates_defer, is_preview_enabled
+from .setup import key_setup_ensure
+if TYPE_CHECKING:
+    from bpy.types import Key
+    from ..api.combination_shape_key import CombinationShapeKey
+
+# Settings that can be edited in bulk, assigned as ID properties to bypass update callbacks
+BULK_SETTINGS = {
+    "mode": lambda value: MODE_INDEX[value],
+    "radius": float,
+    "target_value": float,
+    "clamp": bool,
+    "mute": bool,
+    }
+
+# Bulk settings that change the driver, the others only change the fcurve keyframes
+BULK_DRIVER_SETTINGS = {"mode", "mute"}
+
+
+def combination_keys() -> Iterable['Key']:
+    """Every Key in the file that has combination shape keys"""
+    for key in bpy.data.shape_keys:
+        if key.is_property_set("combination_shape_keys") and len(key.combination_shape_keys):
+            yield key
+
+
+def combinations_list() -> Iterable[Tuple['Key', 'CombinationShapeKey']]:
+    """Every valid combination shape key in the file, with its Key"""
+    for key in combination_keys():
+        for manager in key.combination_shape_keys:
+            if manager.is_valid:
+                yield key, manager
+
+
+def combinations_edit(targets: Mapping[str, Sequence[str]], settings: Mapping[str, Any]) -> int:
+    """
+    Applies settings to the combinations identified by targets, a mapping of Key names to
+    combination identifiers. All settings are assigned before anything is rebuilt, then each
+    Key is updated in one batch: drivers are only recompiled if a driver setting changed, fcurve
+    keyframes are deferred to the preview timer when fast preview is enabled, and the cached
+    inputs and graph of the Key are invalidated once. Returns the number of combinations edited.
+    """
+    values = {name: BULK_SETTINGS[name](value) for name, value in settings.items()}
+    driver = not BULK_DRIVER_SETTINGS.isdisjoint(values)
+    activation = not BULK_DRIVER_SETTINGS.issuperset(values)
+    preview = is_preview_enabled()
+    keys = bpy.data.shape_keys
+    count = 0
+
+    for name, identifiers in targets.items():
+        key = keys.get(name)
+        if key is None:
+            continue
+
+        key_setup_ensure(key)
+        managers = []
+        for identifier in identifiers:
+            manager = combination_manager_find(key, identifier)
+            if manager is not None:
+                for prop, value in values.items():
+                    manager[prop] = value
+                managers.append(manager)
+
+        deferred = []
+        for manager in managers:
+            if not manager.is_valid:
+                continue
+            if driver:
+                fcurve = driver_ensure(key, manager.data_path)
+                fcurve.mute = manager.mute
+                folded = manager.get("folded", False)
+                driver_compile(manager, fcurve)
+                if not activation and manager.get("folded", False) != folded:
+                    manager.keyframes_write(fcurve)
+            if activation:
+                if preview:
+                    deferred.append(manager)
+                elif driver:
+                    manager.keyframes_write(fcurve)
+                else:
+                    manager.fcurve_apply()
+
+        if deferred:
+            fcurve_updates_defer(deferred)
+        if managers:
+            combination_inputs_invalidate(key)
+        count += len(managers)
+
+    return count
+
+
+def selection_group(items: Iterable[Any]) -> Dict[str, Sequence[str]]:
+    """Groups the identifiers of selected list items by Key name"""
+    result: Dict[str, list] = {}
+    for item in items:
+        if item.is_selected:
+            result.setdefault(item.key, []).append(item.identifier)
+    return result
@@ -0,0 +1,153 @@
+
+from typing import TYPE_CHECKING
+import numpy as np
+from ..lib.idprop_utils import idprop_create, idprop_remove
+from .bake import action_ensure
+from .create import owner_id_type
+from .index import combination_driver_find
+from .store import STORE_PROPERTIES, factor_target, factor_value, store_slots_allocate
+if TYPE_CHECKING:
+    from bpy.types import ID, Driver, FCurve, Key
+    from ..api.combination_shape_key import CombinationShapeKey
+
+_KEYFRAME_VECTORS = ("co", "handle_left", "handle_right")
+_KEYFRAME_FLOATS = ("amplitude", "back", "period")
+_KEYFRAME_ENUMS = ("interpolation", "handle_left_type", "handle_right_type", "easing", "type")
+
+
+def keyframes_copy(source: 'FCurve', target: 'FCurve') -> None:
+    """Copies the keyframes and extrapolation of source to target in bulk"""
+    points = source.keyframe_points
+    count = len(points)
+    target.extrapolation = source.extrapolation
+    target.mute = source.mute
+    if count == 0:
+        return
+
+    copies = target.keyframe_points
+    copies.add(count)
+    for names, size, dtype in ((_KEYFRAME_VECTORS, 2, np.float32),
+                               (_KEYFRAME_FLOATS, 1, np.float32),
+                               (_KEYFRAME_ENUMS, 1, np.int32)):
+        data = np.empty(count * size, dtype=dtype)
+        for name in names:
+            points.foreach_get(name, data)
+            copies.foreach_set(name, data)
+    target.update()
+
+
+def driver_copy(source: 'Driver', target: 'Driver') -> None:
+    target.type = source.type
+    target.expression = source.expression
+    target.use_self = source.use_self
+    for variable in source.variables:
+        copy = target.variables.new()
+        copy.name = variable.name
+        copy.type = variable.type
+        for item, clone in zip(variable.targets, copy.targets):
+            if variable.type == 'SINGLE_PROP':
+                clone.id_type = item.id_type
+            clone.id = item.id
+            clone.data_path = item.data_path
+            clone.bone_target = item.bone_target
+            clone.transform_type = item.transform_type
+            clone.transform_space = item.transform_space
+            clone.rotation_mode = item.rotation_mode
+
+
+def animation_transfer(source: 'ID', path: str, index: int, target: 'ID', target_path: str, target_index: int) -> int:
+    """
+    Moves the keyframed and driven animation of source's property at path (index -1 for
+    non-array properties) to target's property at target_path. Returns the number of fcurves moved.
+    """
+    animdata = source.animation_data
+    if animdata is None:
+        return 0
+
+    count = 0
+    action = animdata.action
+    if action is not None:
+        fcurve = action.fcurves.find(path, index=max(index, 0))
+        if fcurve is not None:
+            fcurves = action_ensure(target).fcurves
+            existing = fcurves.find(target_path, index=max(target_index, 0))
+            if existing is not None:
+                fcurves.remove(existing)
+            copy = fcurves.new(target_path,
+                               index=max(target_index, 0),
+                               action_group=fcurve.group.name if fcurve.group else "")
+            keyframes_copy(fcurve, copy)
+            action.fcurves.remove(fcurve)
+            count += 1
+
+    fcurve = animdata.drivers.find(path, index=max(index, 0))
+    if fcurve is not None:
+        if target_index < 0:
+            copy = target.driver_add(target_path)
+        else:
+            copy = target.driver_add(target_path, target_index)
+        if not len(fcurve.modifiers):
+            for modifier in tuple(copy.modifiers):
+                copy.modifiers.remove(modifier)
+        driver_copy(fcurve.driver, copy.driver)
+        keyframes_copy(fcurve, copy)
+        animdata.drivers.remove(fcurve)
+        count += 1
+
+    return count
+
+
+def factors_retarget(manager: 'CombinationShapeKey', id_type: str) -> None:
+    """Points the weight and influence variables of the combination driver at their storage"""
+    key = manager.id_data
+    fcurve = combination_driver_find(key, manager.identifier)
+    if fcurve is not None:
+        variables = fcurve.driver.variables
+        for variable, factor in zip(variables[1:3], ("weight", "influence")):
+            id, path, index = factor_target(manager, factor)
+            target = variable.targets[0]
+            target.id_type = 'KEY' if id == key else id_type
+            target.id = id
+            target.data_path = path if index < 0 else f'{path}[{index}]'
+
+
+def store_migrate(key: 'Key', shared: bool) -> int:
+    """
+    Moves the weight and influence of every combination of key, including their animation,
+    into the shared store (shared=True) or back to ID properties of the Key's owner. When
+    moving to the shared store it is created even if there is nothing to move, so that new
+    combinations use it. Returns the number of combinations migrated.
+    """
+    owner = key.user
+    id_type = owner_id_type(key)
+    managers = [manager for manager in key.combination_shape_keys if manager.use_shared_store != shared]
+
+    if shared:
+        slots = store_slots_allocate(key, len(managers))
+        for manager, slot in zip(managers, slots):
+            for factor, name in STORE_PROPERTIES.items():
+                _, path, _ = factor_target(manager, factor)
+                key[name][slot] = factor_value(manager, factor)
+                animation_transfer(owner, path, -1, key, f'["{name}"]', slot)
+                idprop_remove(owner, path[2:-2])
+            manager["slot"] = slot
+            factors_retarget(manager, id_type)
+    else:
+        for manager in managers:
+            values = {}
+            for factor in STORE_PROPERTIES:
+                values[factor] = (factor_target(manager, factor), factor_value(manager, factor))
+            del manager["slot"]
+            for factor, ((_, source, slot), value) in values.items():
+                _, path, _ = factor_target(manager, factor)
+                name = path[2:-2]
+                idprop_create(owner, name)
+                owner[name] = value
+                animation_transfer(key, source, slot, owner, path, -1)
+            factors_retarget(manager, id_type)
+
+        if not any(manager.use_shared_store for manager in key.combination_shape_keys):
+            for name in STORE_PROPERTIES.values():
+                idprop_remove(key, name)
+
+    return len(managers)
@@ -0,0 +1,193 @@
+
+from typing import Dict, Iterable, List, Tuple, TYPE_CHECKING
+import numpy as np
+from mathutils.kdtree import KDTree
+from ..lib.symmetry import symmetrical_target
+from .create import (CombinationSpec,
+                     activation_curve_points,
+                     combination_shape_keys_create,
+                     combination_specs_validate)
+from .store import factor_assign, factor_value
+if TYPE_CHECKING:
+    from bpy.types import Key, Object, ShapeKey
+
+# Longest shape key name Blender stores, in bytes
+SHAPE_NAME_LENGTH = 63
+
+# (key pointer, point count, axis) -> (hash of reference coordinates, symmetry map)
+_SYMMETRY_MAPS: Dict[Tuple[int, int, int], Tuple[int, np.ndarray]] = {}
+
+
+def shape_coords(shape: 'ShapeKey') -> np.ndarray:
+    """The coordinates of the shape key's points as an (N, 3) array"""
+    data = shape.data
+    co = np.empty(len(data) * 3, dtype=np.float32)
+    data.foreach_get("co", co)
+    return co.reshape(-1, 3)
+
+
+def shape_coords_set(shape: 'ShapeKey', co: np.ndarray) -> None:
+    shape.data.foreach_set("co", np.ascontiguousarray(co, dtype=np.float32).ravel())
+
+
+def symmetry_map_build(co: np.ndarray, axis: int=0, tolerance: float=1e-4) -> np.ndarray:
+    """
+    Returns an array mapping each point index to the index of the point at its mirrored
+    position across axis, or -1 where there is no such point within tolerance.
+    """
+    count = len(co)
+    tree = KDTree(count)
+    for index, point in enumerate(co.tolist()):
+        tree.insert(point, index)
+    tree.balance()
+
+    mirrored = co.astype(np.float64)
+    mirrored[:, axis] *= -1.0
+
+    result = np.full(count, -1, dtype=np.int64)
+    find = tree.find
+    for index, point in enumerate(mirrored.tolist()):
+        _, match, distance = find(point)
+        if match is not None and distance <= tolerance:
+            result[index] = match
+    return result
+
+
+def symmetry_map(key: 'Key', axis: int=0, tolerance: float=1e-4) -> np.ndarray:
+    """
+    Returns the symmetry map for the reference shape of key. The map is built once and reused
+    for as long as the reference coordinates are unchanged.
+    """
+    co = shape_coords(key.reference_key)
+    digest = hash(co.tobytes())
+    cache_key = (key.as_pointer(), len(co), axis)
+    cached = _SYMMETRY_MAPS.get(cache_key)
+    if cached is not None and cached[0] == digest:
+        return cached[1]
+    result = symmetry_map_build(co, axis, tolerance)
+    _SYMMETRY_MAPS[cache_key] = (digest, result)
+    return result
+
+
+def symmetry_maps_clear() -> None:
+    _SYMMETRY_MAPS.clear()
+
+
+def shape_delta(shape: 'ShapeKey') -> np.ndarray:
+    """The offset of the shape key's points from its relative key"""
+    return shape_coords(shape) - shape_coords(shape.relative_key)
+
+
+def shape_mirror(source: 'ShapeKey', target: 'ShapeKey', smap: np.ndarray, axis: int=0) -> int:
+    """
+    Writes the mirror image of source's offsets from its relative key to target, relative to
+    the same relative key. Returns the number of points without a mirror counterpart, which
+    are left unchanged.
+    """
+    basis = shape_coords(source.relative_key)
+    delta = shape_coords(source) - basis
+
+    valid = smap >= 0
+    mirrored = np.zeros_like(delta)
+    mirrored[valid] = delta[smap[valid]]
+    mirrored[:, axis] *= -1.0
+
+    target.relative_key = source.relative_key
+    shape_coords_set(target, basis + mirrored)
+    return int(len(smap) - np.count_nonzero(valid))
+
+
+def shape_duplicate_mirror(object: 'Object', source: 'ShapeKey', name: str, smap: np.ndarray) -> Tuple['ShapeKey', int]:
+    """
+    Adds a shape key called name to object holding the mirror image of source. Returns the new
+    shape key and the number of points that could not be mirrored.
+    """
+    shape = object.shape_key_add(name=name, from_mix=False)
+    shape.slider_min = source.slider_min
+    shape.slider_max = source.slider_max
+
+    group = source.vertex_group
+    if group:
+        mirror = symmetrical_target(group)
+        shape.vertex_group = mirror if mirror and mirror in object.vertex_groups else group
+
+    return shape, shape_mirror(source, shape, smap)
+
+
+def combinations_mirror(object: 'Object', names: Iterable[str]) -> Tuple[List[str], Dict[str, str], int]:
+    """
+    Duplicates and mirrors the named combination shape keys of object, including their drivers.
+    The mirrored combinations are validated before any shape key is added, raising ValueError
+    if one of them can not be created. The symmetry map is built once and the mirrored
+    combinations are created in a single batch. Returns the names of the created shape keys, a
+    dictionary of skipped names with the reason they were skipped and the number of points
+    that could not be mirrored.
+    """
+    key = object.data.shape_keys
+    managers = key.combination_shape_keys
+    blocks = key.key_blocks
+    shapes = set(blocks.keys())
+    mirrors: Dict[str, str] = {}
+    skipped: Dict[str, str] = {}
+
+    for name in names:
+        manager = managers.get(name)
+        mirror = symmetrical_target(name)
+        if manager is None or not manager.is_valid:
+            skipped[name] = "not a combination shape key"
+        elif not mirror or mirror == name:
+            skipped[name] = "name has no mirrored counterpart"
+        elif mirror in shapes or mirror in mirrors.values():
+            skipped[name] = f'mirror "{mirror}" already exists'
+        elif len(mirror.encode()) > SHAPE_NAME_LENGTH:
+            # Blender would shorten the name, which the validated specs would no longer match
+            skipped[name] = f'mirror "{mirror}" is too long'
+        else:
+            mirrors[name] = mirror
+
+    if not mirrors:
+        return [], skipped, 0
+
+    specs = []
+    factors = []
+
+    # Resolve mirrored driver names against the shape keys that will exist after mirroring
+    shapes.update(mirrors.values())
+
+    for name, mirror in mirrors.items():
+        manager = managers[name]
+        inputs = manager.inputs
+        drivers = []
+        for driver in (inputs.names if inputs is not None else ()):
+            target = symmetrical_target(driver)
+            drivers.append(target if target and target in shapes else driver)
+
+        specs.append(CombinationSpec(mirror, drivers,
+                                     mode=manager.mode,
+                                     radius=manager.radius,
+                                     target_value=manager.target_value,
+                                     clamp=manager.clamp,
+                                     curve=activation_curve_points(manager),
+                                     use_curve_folding=manager.use_curve_folding,
+                                     mute=manager.mute))
+        factors.append({factor: factor_value(manager, factor) for factor in ("weight", "influence")})
+
+    errors = combination_specs_validate(key, specs, mirrors.values())
+    if errors:
+        raise ValueError("\n".join(errors))
+
+    smap = symmetry_map(key)
+    unmatched = 0
+    created = []
+
+    for name, mirror in mirrors.items():
+        shape, count = shape_duplicate_mirror(object, blocks[name], mirror, smap)
+        unmatched = max(unmatched, count)
+        created.append(shape.name)
+
+    for manager, values in zip(combination_shape_keys_create(key, specs), factors):
+        for factor, value in values.items():
+            if value != 1.0:
+                factor_assign(manager, factor, value)
+
+    return created, skipped, unmatched
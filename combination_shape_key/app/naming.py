@@ -0,0 +1,134 @@
+
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, TYPE_CHECKING
+from heapq import heapify, heappop, heappush
+from keyword import kwlist
+from string import ascii_letters
+if TYPE_CHECKING:
+    from bpy.types import DriverVariables, Key
+
+# Names a driver variable must not take: Python keywords and the constants and functions
+# available to driver expressions, which a variable of the same name would shadow
+RESERVED_NAMES = frozenset(kwlist) | {
+    "pi", "tau", "e", "inf", "nan", "frame",
+    "abs", "fabs", "floor", "ceil", "trunc", "round", "int", "float", "bool",
+    "sin", "cos", "tan", "asin", "acos", "atan", "atan2", "exp", "log", "sqrt", "pow", "fmod",
+    "min", "max", "sum", "len", "radians", "degrees", "clamp", "lerp", "smoothstep", "noise",
+    "bpy", "math", "self", "depsgraph",
+    }
+
+_BASE = len(ascii_letters)
+_DIGITS = {char: value for value, char in enumerate(ascii_letters)}
+
+
+def variable_name(index: int) -> str:
+    """The bijective base-52 name of index: a, b, ... Z, aa, ab, ..."""
+    chars = []
+    index += 1
+    while index:
+        index, digit = divmod(index - 1, _BASE)
+        chars.append(ascii_letters[digit])
+    return "".join(reversed(chars))
+
+
+def variable_index(name: str) -> Optional[int]:
+    """The index of a name produced by variable_name, or None for any other name"""
+    index = 0
+    for char in name:
+        digit = _DIGITS.get(char)
+        if digit is None:
+            return None
+        index = index * _BASE + digit + 1
+    return index - 1 if name else None
+
+
+def variable_names(count: int) -> Iterator[str]:
+    """The first count non-reserved variable names"""
+    index = 0
+    while count > 0:
+        name = variable_name(index)
+        index += 1
+        if name not in RESERVED_NAMES:
+            count -= 1
+            yield name
+
+
+class VariableAllocator:
+    """
+    Allocates driver variable names that are not already in use, reusing the lowest released
+    name before generating a new one. Names are expected to be given to variables appended to
+    the driver, and to be released before their variable is removed.
+    """
+
+    __slots__ = ("count", "last", "used", "free", "next", "variables")
+
+    def __init__(self, names: Iterable[str]) -> None:
+        names = tuple(names)
+        # Number of variables and name of the last one, to detect changes made without it
+        self.count = len(names)
+        self.last: Optional[str] = names[-1] if names else None
+        # Indices of names in use beyond next, e.g. names given to variables by hand
+        self.used = {variable_index(name) for name in names}
+        self.used.discard(None)
+        self.next = len(names)
+        self.free: List[int] = [index for index in range(self.next)
+                                if index not in self.used and variable_name(index) not in RESERVED_NAMES]
+        heapify(self.free)
+        # The driver's variables as passed to variable_allocator, to check names before use
+        self.variables: Optional['DriverVariables'] = None
+
+    def is_current(self, variables: 'DriverVariables') -> bool:
+        """Checks that variables still match the allocator without iterating over them"""
+        count = len(variables)
+        return count == self.count and (count == 0 or variables[count - 1].name == self.last)
+
+    def allocate(self) -> str:
+        variables = self.variables
+        while True:
+            if self.free:
+                name = variable_name(heappop(self.free))
+            else:
+                index = self.next
+                self.next += 1
+                name = variable_name(index)
+                if index in self.used or name in RESERVED_NAMES:
+                    continue
+            # Changes that is_current can not detect, e.g. after an undo, may have taken it
+            if variables is None or variables.find(name) < 0:
+                break
+        self.count += 1
+        self.last = name
+        return name
+
+    def release(self, name: str) -> None:
+        variables = self.variables
+        if name == self.last:
+            count = self.count
+            self.last = variables[count - 2].name if variables is not None and count > 1 else None
+        self.count -= 1
+        index = variable_index(name)
+        if index is not None:
+            if index < self.next:
+                heappush(self.free, index)
+            else:
+                self.used.discard(index)
+
+
+_ALLOCATORS: Dict[Tuple[int, str], VariableAllocator] = {}
+
+
+def variable_allocator(key: 'Key', identifier: str, variables: 'DriverVariables') -> VariableAllocator:
+    """
+    Returns the cached allocator for the variables of the driver of the combination identifier.
+    The cache is checked in constant time by the number of variables and the name of the last
+    one, and rebuilt from the variables if they were added or removed without it.
+    """
+    cache_key = (key.as_pointer(), identifier)
+    allocator = _ALLOCATORS.get(cache_key)
+    if allocator is None or not allocator.is_current(variables):
+        allocator = _ALLOCATORS[cache_key] = VariableAllocator(variable.name for variable in variables)
+    allocator.variables = variables
+    return allocator
+
+
+def variable_allocators_clear() -> None:
+    _ALLOCATORS.clear()
@@ -0,0 +1,167 @@
+
+from typing import Dict, Iterable, Optional, Tuple, TYPE_CHECKING
+from time import perf_counter
+import numpy as np
+import bpy
+from ..lib.evaluator import activation_evaluate
+from .evaluate import combination_settings
+from .index import combination_manager_find
+if TYPE_CHECKING:
+    from bpy.types import Context, ShaderNodeFloatCurve
+    from ..api.combination_shape_key import CombinationShapeKey
+
+# Seconds without further changes after which a deferred fcurve update is committed
+PREVIEW_DELAY = 0.25
+
+# Node group holding the curve mapping the response preview is drawn with. It has no users so
+# it is never saved.
+PREVIEW_NODE_TREE = ".combination_shape_key_preview"
+PREVIEW_NODE = "Response"
+
+# Number of points the response is sampled at for the preview
+PREVIEW_SAMPLES = 33
+
+# (key name, combination identifier) -> time of the most recent change
+_PENDING: Dict[Tuple[str, str], float] = {}
+
+# (key name, combination identifier) of the combination shown by the preview curve, and of the
+# combination to show once the refresh timer runs
+_preview_owner: Optional[Tuple[str, str]] = None
+_preview_request: Optional[Tuple[str, str]] = None
+
+
+def is_preview_enabled(context: Optional['Context']=None) -> bool:
+    wm = getattr(context or bpy.context, "window_manager", None)
+    return bool(getattr(wm, "combination_shape_key_preview", False))
+
+
+def is_preview_pending(manager: 'CombinationShapeKey') -> bool:
+    return (manager.id_data.name, manager.identifier) in _PENDING
+
+
+def fcurve_update_defer(manager: 'CombinationShapeKey') -> None:
+    """Schedules the fcurve of manager to be updated once changes stop for PREVIEW_DELAY seconds"""
+    fcurve_updates_defer((manager,))
+    preview_curve_update(manager)
+
+
+def fcurve_updates_defer(managers: Iterable['CombinationShapeKey']) -> None:
+    """Schedules the fcurves of managers to be updated together by a single timer"""
+    now = perf_counter()
+    for manager in managers:
+        _PENDING[(manager.id_data.name, manager.identifier)] = now
+    if not bpy.app.timers.is_registered(preview_commit):
+        bpy.app.timers.register(preview_commit, first_interval=PREVIEW_DELAY)
+
+
+def preview_commit(force: bool=False) -> Optional[float]:
+    """Commits deferred fcurve updates that have settled. Returns the timer's next interval."""
+    now = perf_counter()
+    for item, time in tuple(_PENDING.items()):
+        if force or now - time >= PREVIEW_DELAY:
+            del _PENDING[item]
+            key = bpy.data.shape_keys.get(item[0])
+            if key is not None:
+                manager = combination_manager_find(key, item[1])
+                if manager is not None:
+                    manager.fcurve_apply()
+
+    if _PENDING:
+        return PREVIEW_DELAY
+
+    # Redraw so the panel stops showing the preview as pending
+    properties_redraw()
+
+
+def properties_redraw() -> None:
+    screen = getattr(bpy.context, "screen", None)
+    if screen is not None:
+        for area in screen.areas:
+            if area.type == 'PROPERTIES':
+                area.tag_redraw()
+
+
+def preview_node(create: bool=False) -> Optional['ShaderNodeFloatCurve']:
+    """The node whose curve mapping shows the response preview, created if create is True"""
+    tree = bpy.data.node_groups.get(PREVIEW_NODE_TREE)
+    if tree is None:
+        if not create:
+            return None
+        tree = bpy.data.node_groups.new(PREVIEW_NODE_TREE, 'ShaderNodeTree')
+    node = tree.nodes.get(PREVIEW_NODE)
+    if node is None and create:
+        node = tree.nodes.new('ShaderNodeFloatCurve')
+        node.name = PREVIEW_NODE
+    return node
+
+
+def preview_curve_update(manager: 'CombinationShapeKey') -> None:
+    """
+    Writes the combination's value against its driver value (0 to 1) to the preview curve
+    mapping, computed directly from the current settings. Must not be called while drawing.
+    """
+    global _preview_owner
+    settings = combination_settings(manager)
+    x = np.linspace(0.0, 1.0, PREVIEW_SAMPLES)
+    y = np.clip(activation_evaluate(settings, x), settings.slider_min, settings.slider_max)
+
+    mapping = preview_node(create=True).mapping
+    points = mapping.curves[0].points
+    while len(points) > PREVIEW_SAMPLES:
+        points.remove(points[-1])
+    while len(points) < PREVIEW_SAMPLES:
+        points.new(0.0, 0.0)
+    for point, location in zip(points, zip(x.tolist(), y.tolist())):
+        point.location = location
+        point.handle_type = 'VECTOR'
+
+    mapping.use_clip = True
+    mapping.clip_min_x = 0.0
+    mapping.clip_max_x = 1.0
+    mapping.clip_min_y = min(0.0, settings.slider_min)
+    mapping.clip_max_y = max(1.0, settings.target_value, settings.slider_max)
+    mapping.update()
+    _preview_owner = (manager.id_data.name, manager.identifier)
+
+
+def preview_refresh() -> None:
+    """Timer callback that updates the preview curve for the requested combination"""
+    global _preview_request
+    request = _preview_request
+    _preview_request = None
+    if request is not None:
+        key = bpy.data.shape_keys.get(request[0])
+        if key is not None:
+            manager = combination_manager_find(key, request[1])
+            if manager is not None:
+                preview_curve_update(manager)
+                properties_redraw()
+
+
+def preview_curve(manager: 'CombinationShapeKey') -> Optional['ShaderNodeFloatCurve']:
+    """
+    Returns the node holding the response preview of manager, or None if it is not ready yet,
+    in which case it is updated from a timer as ID data can not be written while drawing
+    """
+    global _preview_request
+    owner = (manager.id_data.name, manager.identifier)
+    node = preview_node()
+    if node is not None and _preview_owner == owner:
+        return node
+    _preview_request = owner
+    if not bpy.app.timers.is_registered(preview_refresh):
+        bpy.app.timers.register(preview_refresh, first_interval=0.0)
+
+
+def preview_clear() -> None:
+    global _preview_owner, _preview_request
+    _PENDING.clear()
+    _preview_owner = None
+    _preview_request = None
+    for callback in (preview_commit, preview_refresh):
+        if bpy.app.timers.is_registered(callback):
+            bpy.app.timers.unregister(callback)
+    tree = bpy.data.node_groups.get(PREVIEW_NODE_TREE)
+    if tree is not None:
+        bpy.data.node_groups.remove(tree)
+
@@ -0,0 +1,141 @@
+
+from typing import List, NamedTuple, Sequence, Tuple, TYPE_CHECKING
+from time import perf_counter
+import csv
+from ..lib.driver_utils import driver_find
+if TYPE_CHECKING:
+    from bpy.types import Key, Scene
+
+PROFILE_CSV_HEADER = ("key", "combination", "evaluation_path", "variables",
+                      "driver_us", "blend_us", "total_us")
+
+# Smallest per-frame cost difference in microseconds that is told apart from noise
+PROFILE_NOISE_FLOOR = 2.0
+
+
+class CombinationProfile(NamedTuple):
+    """Measured per-frame cost of a combination shape key, in microseconds"""
+    key: str
+    name: str
+    evaluation_path: str
+    variable_count: int
+    driver_cost: float
+    blend_cost: float
+
+    @property
+    def total_cost(self) -> float:
+        return self.driver_cost + self.blend_cost
+
+
+def _playback(scene: 'Scene', frames: Sequence[int]) -> float:
+    start = perf_counter()
+    for frame in frames:
+        scene.frame_set(frame)
+    return (perf_counter() - start) / len(frames) * 1e6
+
+
+def profile_frames(frame_start: int, frame_end: int, samples: int) -> List[int]:
+    count = max(1, min(samples, frame_end - frame_start + 1))
+    step = (frame_end - frame_start) / max(1, count - 1)
+    return sorted({int(round(frame_start + step * index)) for index in range(count)})
+
+
+def combinations_profile(scene: 'Scene',
+                         key: 'Key',
+                         frame_start: int,
+                         frame_end: int,
+                         samples: int=10) -> List[CombinationProfile]:
+    """
+    Samples the per-frame cost of each combination of key over the frame range against a
+    baseline with every combination disabled. Combinations are measured in groups, first with
+    only their drivers enabled and then with their shape keys blended as well, starting with
+    all of them. Groups that cost more than the measurement noise are split in halves, groups
+    that do not have their cost shared equally between their members. Only the first half of
+    a split is measured, the second half costs the group's cost minus that of the first.
+
+    Each measurement takes 2 playbacks, after 3 for warming up and the baseline. With E of the
+    K combinations above the noise, that is 5 + 2 * S playbacks for S splits, where S is at
+    most E * ceil(log2(K)) and never more than K - 1. Every combination being expensive is the
+    worst case at 2 * K + 3 playbacks, about the same as measuring each one on its own, while
+    cheap combinations are measured together where their individual cost would be lost in the
+    noise. Mute states and the current frame are restored afterwards.
+    """
+    managers = [manager for manager in key.combination_shape_keys if manager.is_valid]
+    blocks = key.key_blocks
+    entries = []
+    for manager in managers:
+        fcurve = driver_find(key, manager.data_path)
+        if fcurve is not None:
+            entries.append((manager, fcurve, blocks[manager.name]))
+
+    if not entries:
+        return []
+
+    frames = profile_frames(frame_start, frame_end, samples)
+    current = scene.frame_current
+    states = [(fcurve.mute, shape.mute) for _, fcurve, shape in entries]
+    costs: List[Tuple[float, float]] = [(0.0, 0.0)] * len(entries)
+
+    def measure(group: Sequence[int]) -> Tuple[float, float]:
+        for index in group:
+            entries[index][1].mute = False
+        driver = _playback(scene, frames)
+        for index in group:
+            entries[index][2].mute = False
+        blended = _playback(scene, frames)
+        for index in group:
+            _, fcurve, shape = entries[index]
+            fcurve.mute = True
+            shape.mute = True
+        return max(0.0, driver - baseline), max(0.0, blended - driver)
+
+    def bisect(group: Sequence[int], driver: float, blend: float) -> None:
+        if len(group) == 1 or driver + blend <= noise:
+            share = (driver / len(group), blend / len(group))
+            for index in group:
+                costs[index] = share
+            return
+        half = len(group) // 2
+        first_driver, first_blend = measure(group[:half])
+        bisect(group[:half], first_driver, first_blend)
+        bisect(group[half:], max(0.0, driver - first_driver), max(0.0, blend - first_blend))
+
+    try:
+        for _, fcurve, shape in entries:
+            fcurve.mute = True
+            shape.mute = True
+
+        # Warm up then measure the baseline twice, the difference estimates the noise
+        _playback(scene, frames)
+        baseline = _playback(scene, frames)
+        repeat = _playback(scene, frames)
+        noise = max(PROFILE_NOISE_FLOOR, abs(repeat - baseline))
+        baseline = min(baseline, repeat)
+
+        group = range(len(entries))
+        bisect(group, *measure(group))
+    finally:
+        for (_, fcurve, shape), (fcurve_mute, shape_mute) in zip(entries, states):
+            fcurve.mute = fcurve_mute
+            shape.mute = shape_mute
+        scene.frame_set(current)
+
+    results = []
+    for (manager, _, _), (driver, blend) in zip(entries, costs):
+        inputs = manager.inputs
+        results.append(CombinationProfile(key.name,
+                                          manager.name,
+                                          manager.evaluation_path,
+                                          len(inputs.shapes) if inputs is not None else 0,
+                                          driver,
+                                          blend))
+    return results
+
+
+def profile_export_csv(filepath: str, rows: Sequence[CombinationProfile]) -> None:
+    with open(filepath, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(PROFILE_CSV_HEADER)
+        for row in rows:
+            writer.writerow((row.key, row.name, row.evaluation_path, row.variable_count,
+                             f'{row.driver_cost:.3f}', f'{row.blend_cost:.3f}', f'{row.total_cost:.3f}'))
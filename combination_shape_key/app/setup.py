@@ -1,20 +1,158 @@
 
+from typing import Callable, Dict, List, Optional, Set, Tuple, TYPE_CHECKING
+from time import perf_counter
 import bpy
 from ..lib.curve_mapping import nodetree_node_ensure
-from ..lib.idprop_utils import idprop_ensure
+from .store import factors_ensure
+if TYPE_CHECKING:
+    from bpy.types import Key
 
-def setup_combination_shape_keys():
-    keys = bpy.data.shape_keys
-    if keys:
-        for key in keys:
-            if key.is_property_set("combination_shape_keys"):
-                for item in key.combination_shape_keys:
-                    curve = item.falloff
-                    nodetree_node_ensure(curve.node_identifier, curve)
-                    idprop_ensure(key.user, item.weight_property_name)
-                    idprop_ensure(key.user, item.influence_property_name)
-
-def try_setup_combination_shape_keys():
+# Maximum time in seconds spent setting up combinations per timer step
+SETUP_TIME_SLICE = 0.005
+
+# Interval in seconds between attempts while bpy.data is not yet available
+SETUP_RETRY_INTERVAL = 0.1
+
+# Callables invoked with (key name, combination count, seconds) after each Key is set up
+SETUP_TIMING_HOOKS: List[Callable[[str, int, float], None]] = []
+
+# Totals for the most recent load
+SETUP_STATS: Dict[str, float] = {"keys": 0, "combinations": 0, "seconds": 0.0}
+
+_READY: Set[int] = set()
+
+# (key name, index of the next combination to set up, seconds spent so far)
+_QUEUE: List[Tuple[str, int, float]] = []
+
+# Whether bpy.data.shape_keys still has to be scanned for keys to set up
+_scan_pending = False
+
+# Name of the Key a panel is waiting on, redrawn once it is set up
+_requested: Optional[str] = None
+
+
+def combination_setup(key: 'Key', start: int, deadline: Optional[float]=None) -> int:
+    """
+    Sets up the combinations of key from index start until done or until deadline is reached.
+    Returns the index of the next combination to set up.
+    """
+    managers = key.combination_shape_keys
+    count = len(managers)
+    index = start
+    while index < count:
+        manager = managers[index]
+        curve = manager.activation_curve
+        nodetree_node_ensure(curve.node_identifier, curve)
+        factors_ensure(manager)
+        index += 1
+        if deadline is not None and perf_counter() >= deadline:
+            break
+    return index
+
+
+def setup_report(key: 'Key', seconds: float) -> None:
+    count = len(key.combination_shape_keys)
+    SETUP_STATS["keys"] += 1
+    SETUP_STATS["combinations"] += count
+    SETUP_STATS["seconds"] += seconds
+    for hook in SETUP_TIMING_HOOKS:
+        hook(key.name, count, seconds)
+
+
+def key_setup_ensure(key: 'Key') -> None:
+    """Sets up the combinations of key now if that has not happened yet"""
+    pointer = key.as_pointer()
+    if pointer not in _READY and key.is_property_set("combination_shape_keys"):
+        start = perf_counter()
+        combination_setup(key, 0)
+        _READY.add(pointer)
+        for item in _QUEUE:
+            if item[0] == key.name:
+                _QUEUE.remove(item)
+                break
+        setup_report(key, perf_counter() - start)
+
+
+def key_setup_request(key: 'Key') -> bool:
+    """
+    For use while drawing, where ID data can not be written: moves key to the front of the
+    setup queue once so the timer sets it up next. Returns True if key is already set up.
+    """
+    global _requested
+    if key.as_pointer() in _READY or not key.is_property_set("combination_shape_keys"):
+        return True
+    if _requested != key.name:
+        _requested = key.name
+        for item in _QUEUE:
+            if item[0] == key.name:
+                _QUEUE.remove(item)
+                _QUEUE.insert(0, item)
+                break
+        else:
+            _QUEUE.insert(0, (key.name, 0, 0.0))
+        if not bpy.app.timers.is_registered(setup_step):
+            bpy.app.timers.register(setup_step, first_interval=0.0)
+    return False
+
+
+def setup_redraw() -> None:
+    for window in bpy.context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == 'PROPERTIES':
+                area.tag_redraw()
+
+
+def setup_step() -> Optional[float]:
+    """Timer callback that sets up queued keys in small time slices"""
+    global _scan_pending, _requested
     try:
-        setup_combination_shape_keys()
-    except AttributeError: pass
+        keys = bpy.data.shape_keys
+    except AttributeError:
+        # bpy.data is not accessible during the initial load
+        return SETUP_RETRY_INTERVAL
+
+    if _scan_pending:
+        _scan_pending = False
+        for key in keys:
+            if key.is_property_set("combination_shape_keys") and len(key.combination_shape_keys):
+                _QUEUE.append((key.name, 0, 0.0))
+
+    deadline = perf_counter() + SETUP_TIME_SLICE
+
+    while _QUEUE and perf_counter() < deadline:
+        name, index, seconds = _QUEUE[0]
+        key = keys.get(name)
+        if key is None or key.as_pointer() in _READY:
+            _QUEUE.pop(0)
+            continue
+
+        now = perf_counter()
+        index = combination_setup(key, index, deadline)
+        seconds += perf_counter() - now
+
+        if index >= len(key.combination_shape_keys):
+            _QUEUE.pop(0)
+            _READY.add(key.as_pointer())
+            setup_report(key, seconds)
+            if name == _requested:
+                _requested = None
+                setup_redraw()
+        else:
+            _QUEUE[0] = (name, index, seconds)
+
+    return 0.0 if _QUEUE else None
+
+
+def setup_combination_shape_keys() -> None:
+    """
+    Schedules every Key with combinations to be set up incrementally from a timer. Keys that
+    are accessed by an operator before then are set up on demand by key_setup_ensure.
+    """
+    global _scan_pending, _requested
+    _READY.clear()
+    _QUEUE.clear()
+    _scan_pending = True
+    _requested = None
+    SETUP_STATS.update(keys=0, combinations=0, seconds=0.0)
+    if not bpy.app.timers.is_registered(setup_step):
+        bpy.app.timers.register(setup_step, first_interval=0.0)
@@ -0,0 +1,72 @@
+
+from typing import Optional, Tuple, TYPE_CHECKING
+import numpy as np
+from .mirror import shape_coords, shape_coords_set
+if TYPE_CHECKING:
+    from bpy.types import Object, ShapeKey, VertexGroup
+
+# Offsets shorter than this are treated as noise
+SPARSE_EPSILON = 1e-5
+
+
+def sparse_delta(shape: 'ShapeKey', epsilon: float=SPARSE_EPSILON) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the indices of the points the shape key moves further than epsilon from its relative
+    key and their (len(indices), 3) offsets
+    """
+    delta = shape_coords(shape) - shape_coords(shape.relative_key)
+    indices = np.flatnonzero(np.einsum("ij,ij->i", delta, delta) > epsilon * epsilon)
+    return indices, delta[indices]
+
+
+def sparse_delta_apply(shape: 'ShapeKey', indices: np.ndarray, deltas: np.ndarray) -> None:
+    """Sets the shape key to its relative key offset by deltas at indices"""
+    co = shape_coords(shape.relative_key)
+    co[indices] += deltas
+    shape_coords_set(shape, co)
+
+
+def shape_compact(shape: 'ShapeKey', epsilon: float=SPARSE_EPSILON) -> Tuple[int, int]:
+    """
+    Snaps points the shape key moves less than epsilon back onto its relative key. Returns the
+    number of points snapped and the number of points that remain affected.
+    """
+    basis = shape_coords(shape.relative_key)
+    co = shape_coords(shape)
+    delta = co - basis
+    length = np.einsum("ij,ij->i", delta, delta)
+    noise = (length > 0.0) & (length <= epsilon * epsilon)
+    count = int(np.count_nonzero(noise))
+    if count:
+        co[noise] = basis[noise]
+        shape_coords_set(shape, co)
+    return count, int(np.count_nonzero(length > epsilon * epsilon))
+
+
+def shape_region_assign(object: 'Object',
+                        shape: 'ShapeKey',
+                        epsilon: float=SPARSE_EPSILON,
+                        name: str="",
+                        overwrite: bool=False) -> Tuple[Optional['VertexGroup'], int]:
+    """
+    Restricts the shape key to the points it affects by assigning them to a vertex group and
+    setting it as the shape key's vertex group, so that unaffected points are skipped when
+    blending. A vertex group the shape key already uses is only replaced if overwrite is True,
+    except for the region group of an earlier call, which is always rebuilt. Returns the vertex
+    group, or None if the shape key was left unchanged, and the number of affected points.
+    """
+    indices, _ = sparse_delta(shape, epsilon)
+    name = name or f'{shape.name}_region'
+    if shape.vertex_group and shape.vertex_group != name and not overwrite:
+        return None, len(indices)
+
+    groups = object.vertex_groups
+    group = groups.get(name)
+    if group is not None:
+        groups.remove(group)
+    group = groups.new(name=name)
+    if len(indices):
+        group.add(indices.tolist(), 1.0, 'REPLACE')
+
+    shape.vertex_group = group.name
+    return group, len(indices)
@@ -0,0 +1,117 @@
+
+from typing import List, Tuple, TYPE_CHECKING
+from ..lib.idprop_utils import idprop_array_assign, idprop_ensure
+if TYPE_CHECKING:
+    from bpy.types import ID, Key
+    from ..api.combination_shape_key import CombinationShapeKey
+
+# Key array properties holding the weight and influence of combinations using the shared store
+STORE_PROPERTIES = {
+    "weight": "combination_weights",
+    "influence": "combination_influences",
+    }
+
+
+def is_store_enabled(key: 'Key') -> bool:
+    """Whether or not new combinations of key keep their weight and influence in the shared store"""
+    return key.get(STORE_PROPERTIES["weight"]) is not None
+
+
+def store_size(key: 'Key') -> int:
+    return len(key.get(STORE_PROPERTIES["weight"], ()))
+
+
+def store_resize(key: 'Key', size: int) -> None:
+    """
+    Grows the store arrays of key to at least size slots (and at least one, so that the store
+    exists). New slots default to 1.0.
+    """
+    size = max(size, 1)
+    for name in STORE_PROPERTIES.values():
+        values = list(key.get(name, ()))
+        if len(values) < size or key.get(name) is None:
+            values.extend([1.0] * (size - len(values)))
+            idprop_array_assign(key, name, values)
+
+
+def is_slot_animated(key: 'Key', slot: int) -> bool:
+    animdata = key.animation_data
+    if animdata is not None:
+        action = animdata.action
+        for name in STORE_PROPERTIES.values():
+            path = f'["{name}"]'
+            if animdata.drivers.find(path, index=slot) is not None:
+                return True
+            if action is not None and action.fcurves.find(path, index=slot) is not None:
+                return True
+    return False
+
+
+def store_slots_allocate(key: 'Key', count: int) -> List[int]:
+    """
+    Reserves count slots in the store of key, reusing slots that no combination or animation
+    refers to before growing the arrays. Reused slots are reset to 1.0.
+    """
+    size = store_size(key)
+    used = {manager.get("slot") for manager in key.combination_shape_keys}
+    slots = [slot for slot in range(size) if slot not in used and not is_slot_animated(key, slot)][:count]
+
+    for name in STORE_PROPERTIES.values():
+        values = key.get(name)
+        if values is not None:
+            for slot in slots:
+                values[slot] = 1.0
+
+    slots.extend(range(size, size + count - len(slots)))
+    store_resize(key, max(size, slots[-1] + 1 if slots else 0))
+    return slots
+
+
+def factor_target(manager: 'CombinationShapeKey', factor: str) -> Tuple['ID', str, int]:
+    """
+    Where the "weight" or "influence" of manager is stored, as the owning ID, the data path of
+    the property and the array index within it (-1 if the property is not an array)
+    """
+    key = manager.id_data
+    slot = manager.get("slot")
+    if slot is None:
+        return key.user, f'["{factor}_{manager.identifier}"]', -1
+    return key, f'["{STORE_PROPERTIES[factor]}"]', slot
+
+
+def factor_path(manager: 'CombinationShapeKey', factor: str) -> str:
+    """The data path of the "weight" or "influence" of manager for use by driver variables"""
+    _, path, index = factor_target(manager, factor)
+    return path if index < 0 else f'{path}[{index}]'
+
+
+def factor_value(manager: 'CombinationShapeKey', factor: str) -> float:
+    """The current value of the "weight" or "influence" of manager (1.0 if it is missing)"""
+    owner, path, index = factor_target(manager, factor)
+    value = owner.get(path[2:-2])
+    if value is None:
+        return 1.0
+    if index < 0:
+        return float(value)
+    return float(value[index]) if index < len(value) else 1.0
+
+
+def factor_assign(manager: 'CombinationShapeKey', factor: str, value: float) -> None:
+    """Sets the "weight" or "influence" of manager, wherever it is stored"""
+    owner, path, index = factor_target(manager, factor)
+    if index < 0:
+        owner[path[2:-2]] = value
+    else:
+        owner[path[2:-2]][index] = value
+
+
+def factors_ensure(manager: 'CombinationShapeKey') -> None:
+    """Ensures the weight and influence properties of manager exist"""
+    key = manager.id_data
+    slot = manager.get("slot")
+    if slot is None:
+        owner = key.user
+        idprop_ensure(owner, manager.weight_property_name)
+        idprop_ensure(owner, manager.influence_property_name)
+    elif store_size(key) <= slot:
+        store_resize(key, slot + 1)
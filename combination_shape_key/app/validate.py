@@ -0,0 +1,344 @@
+
+from typing import Dict, Iterable, List, Optional, Set, TYPE_CHECKING
+import re
+import numpy as np
+import bpy
+from ..lib.driver_utils import driver_ensure, driver_find, driver_remove
+from ..lib.idprop_utils import idprop_remove
+from ..api.combination_shape_key import MODE_INDEX
+from .compile import driver_unstage, is_shape_variable
+from .create import activation_curve_assign, driver_variables_create, manager_create, owner_id_type
+from .index import combination_index_invalidate, is_combination_driver
+from .inputs import combination_inputs_invalidate, combination_inputs_parse
+from .keyframes import keyframes_read
+from .store import STORE_PROPERTIES, store_size
+if TYPE_CHECKING:
+    from bpy.types import FCurve, Key
+    from ..api.combination_shape_key import CombinationShapeKey
+
+# Problems detected by combinations_validate
+VALIDATION_ISSUES = {
+    'RENAMED'         : "Combinations whose shape key was renamed",
+    'MISSING_TARGET'  : "Combinations whose shape key no longer exists",
+    'DUPLICATE'       : "Duplicate combinations",
+    'ORPHAN_DRIVER'   : "Combination drivers without a combination",
+    'MISSING_DRIVER'  : "Combinations without a driver",
+    'MISSING_INPUT'   : "Driver variables referencing missing shape keys",
+    'MISSING_PROPERTY': "Combinations missing their weight or influence",
+    'ORPHAN_PROPERTY' : "Weight, influence and stage properties without a combination",
+    }
+
+# Only properties named as by manager_create and stages_build are considered, so that user
+# properties with similar names are never touched
+_FACTOR_PROPERTY = re.compile(r'^(?:weight|influence)_(combination_\w+)$')
+_STAGE_PROPERTY = re.compile(r'^(combination_\w+)_stage_(\d+)$')
+_STAGE_PATH = re.compile(r'^\["(combination_\w+_stage_\d+)"\]$')
+_SLOT_PATH = re.compile(r'^\["' + STORE_PROPERTIES["weight"] + r'"\]\[(\d+)\]$')
+
+# Innermost function call or parenthesized group of a driver expression
+_EXPRESSION_GROUP = re.compile(r'(min|max|)\(([^()]*)\)')
+_GROUP_MODES = {"min": 'MIN', "max": 'MAX', "": 'AVERAGE'}
+
+# Keyframe handle types the activation curve supports
+_CURVE_HANDLE_TYPES = {'AUTO', 'AUTO_CLAMPED', 'VECTOR'}
+
+
+def driver_target_name(fcurve: 'FCurve') -> str:
+    """The name of the shape key whose value fcurve drives, or an empty string"""
+    path = fcurve.data_path
+    return path[12:-8] if path.startswith('key_blocks["') and path.endswith('"].value') else ""
+
+
+def driver_stage_count(fcurve: 'FCurve') -> int:
+    return sum(1 for variable in fcurve.driver.variables
+               if _STAGE_PATH.match(variable.targets[0].data_path))
+
+
+def driver_mode_infer(key: 'Key', fcurve: 'FCurve') -> str:
+    """
+    Infers the combination mode of a combination driver from its stage drivers, or from its
+    expression if it is not staged. Returns 'MULTIPLY' if no other mode is recognized.
+    """
+    driver = fcurve.driver
+    shapes = set()
+    for variable in driver.variables:
+        path = variable.targets[0].data_path
+        if _STAGE_PATH.match(path):
+            stage = driver_find(key, path)
+            if stage is not None:
+                type = stage.driver.type
+                return type if type in MODE_INDEX else 'MULTIPLY'
+        elif is_shape_variable(variable):
+            shapes.add(variable.name)
+
+    for match in _EXPRESSION_GROUP.finditer(driver.expression):
+        function, arguments = match.groups()
+        items = [item.strip() for item in arguments.split("," if function else "+")]
+        if len(items) > 1 and all(item in shapes for item in items):
+            return _GROUP_MODES[function]
+    return 'MULTIPLY'
+
+
+def driver_slot(key: 'Key', fcurve: 'FCurve') -> Optional[int]:
+    """The shared store slot the weight variable of a combination driver reads, if any"""
+    variables = fcurve.driver.variables
+    if len(variables) > 1:
+        target = variables[1].targets[0]
+        match = _SLOT_PATH.match(target.data_path)
+        if match is not None and target.id == key:
+            return int(match.group(1))
+
+
+def activation_infer(manager: 'CombinationShapeKey', fcurve: 'FCurve') -> None:
+    """
+    Sets the radius, goal, clamp and activation curve of an adopted combination from the
+    keyframes of its driver, so that they describe the curve the driver already has. Handle
+    types the activation curve does not support are approximated with auto clamped handles.
+    """
+    points = fcurve.keyframe_points
+    if len(points) < 2:
+        return
+    co = keyframes_read(fcurve)[:, 0].astype(np.float64)
+    first = co[0, 0]
+    radius = co[-1, 0] - first
+    goal = co[-1, 1]
+    if radius <= 0.0 or goal == 0.0:
+        return
+
+    types = [point.handle_left_type for point in points]
+    manager["radius"] = min(radius, 1.0)
+    manager["target_value"] = goal
+    manager["clamp"] = fcurve.extrapolation == 'CONSTANT'
+    activation_curve_assign(manager, [((x - first) / radius,
+                                       y / goal,
+                                       type if type in _CURVE_HANDLE_TYPES else 'AUTO_CLAMPED')
+                                      for (x, y), type in zip(co.tolist(), types)])
+
+
+def combinations_validate(key: 'Key', repair: Optional[bool]=False) -> Dict[str, int]:
+    """
+    Checks the combination shape keys of key for the problems in VALIDATION_ISSUES, visiting
+    each manager, driver and ID property once. Returns the number of each problem found. When
+    repair is True all problems are fixed in bulk:
+
+    - renamed combinations are resolved through their drivers, others are removed
+    - duplicates are removed, keeping the combination that owns the driver
+    - orphaned drivers of existing shape keys get a new combination with the mode and
+      activation curve inferred from the driver, whose keyframes are kept, other orphaned
+      drivers are removed
+    - missing drivers and properties are recreated, variables of missing shape keys and
+      orphaned properties are removed
+    """
+    counts = dict.fromkeys(VALIDATION_ISSUES, 0)
+    shapes = set(key.key_blocks.keys())
+    managers = key.combination_shape_keys
+    animdata = key.animation_data
+    owner = key.user
+
+    # Combination drivers by identifier and stage drivers by property name
+    drivers: Dict[str, 'FCurve'] = {}
+    stages: Dict[str, 'FCurve'] = {}
+    if animdata is not None:
+        for fcurve in animdata.drivers:
+            match = _STAGE_PATH.match(fcurve.data_path)
+            if match is not None:
+                stages[match.group(1)] = fcurve
+            elif is_combination_driver(key, fcurve):
+                drivers[fcurve.driver.variables[0].name] = fcurve
+
+    def owns(identifier: str, name: str) -> bool:
+        fcurve = drivers.get(identifier)
+        return fcurve is not None and driver_target_name(fcurve) == name
+
+    # Managers to keep by identifier and by target name, each as an index into managers
+    kept: Dict[str, int] = {}
+    names: Dict[str, str] = {}
+    known: Set[str] = set()
+    removed: List[int] = []
+    renamed: Dict[int, str] = {}
+
+    for index, manager in enumerate(managers):
+        identifier = manager.get("identifier", "")
+        name = manager.get("name", "")
+        known.add(identifier)
+
+        if name not in shapes:
+            fcurve = drivers.get(identifier)
+            target = driver_target_name(fcurve) if fcurve is not None else ""
+            if target not in shapes:
+                counts['MISSING_TARGET'] += 1
+                removed.append(index)
+                continue
+            name = renamed[index] = target
+
+        if identifier in kept:
+            counts['DUPLICATE'] += 1
+            removed.append(index)
+            continue
+
+        if name in names:
+            counts['DUPLICATE'] += 1
+            other = names[name]
+            if owns(identifier, name) and not owns(other, name):
+                # This copy owns the driver so it replaces the one kept so far
+                removed.append(kept.pop(other))
+            else:
+                removed.append(index)
+                continue
+
+        kept[identifier] = index
+        names[name] = identifier
+
+    for index in removed:
+        renamed.pop(index, None)
+    counts['RENAMED'] = len(renamed)
+
+    # Drivers of combinations that were never there, as opposed to those of removed ones
+    adopt: Dict[str, str] = {}
+    dead: Set[str] = known - kept.keys()
+    for identifier, fcurve in drivers.items():
+        if identifier not in known:
+            counts['ORPHAN_DRIVER'] += 1
+            name = driver_target_name(fcurve)
+            if name in shapes and name not in names:
+                adopt[identifier] = name
+                names[name] = identifier
+            else:
+                dead.add(identifier)
+
+    size = store_size(key)
+    missing_drivers: Set[str] = set()
+    missing_factors: List[int] = []
+    missing_inputs: Dict[str, List[str]] = {}
+    stage_counts: Dict[str, int] = {}
+
+    for identifier in kept.keys() | adopt.keys():
+        fcurve = drivers.get(identifier)
+        if identifier in kept:
+            manager = managers[kept[identifier]]
+            stage_counts[identifier] = manager.get("stages", 0)
+            slot = manager.get("slot")
+            if (slot >= size if slot is not None else
+                    owner.get(f'weight_{identifier}') is None or owner.get(f'influence_{identifier}') is None):
+                counts['MISSING_PROPERTY'] += 1
+                missing_factors.append(kept[identifier])
+            if fcurve is None:
+                # The driver is rebuilt without stages
+                counts['MISSING_DRIVER'] += 1
+                missing_drivers.add(identifier)
+                stage_counts[identifier] = 0
+                continue
+        else:
+            stage_counts[identifier] = driver_stage_count(fcurve)
+
+        # Staged drivers keep their shape variables on the stage drivers
+        variables = [item.variable for item in combination_inputs_parse(identifier, fcurve).shapes
+                     if item.name not in shapes]
+        if variables:
+            counts['MISSING_INPUT'] += len(variables)
+            missing_inputs[identifier] = variables
+
+    # Properties of removed combinations are cleaned up with them without being counted
+    properties: List[str] = []
+    for name in owner.keys():
+        match = _FACTOR_PROPERTY.match(name)
+        if match is not None:
+            identifier = match.group(1)
+            if identifier in dead:
+                properties.append(name)
+            elif identifier not in stage_counts:
+                counts['ORPHAN_PROPERTY'] += 1
+                properties.append(name)
+
+    stage_properties: List[str] = []
+    for name in set(key.keys()) | stages.keys():
+        match = _STAGE_PROPERTY.match(name)
+        if match is not None:
+            identifier = match.group(1)
+            if identifier in dead:
+                stage_properties.append(name)
+            elif int(match.group(2)) >= stage_counts.get(identifier, 0):
+                counts['ORPHAN_PROPERTY'] += 1
+                stage_properties.append(name)
+
+    if not repair or not any(counts.values()):
+        return counts
+
+    for index, name in renamed.items():
+        managers[index]["name"] = name
+
+    for index in missing_factors:
+        managers[index].id_properties_create()
+
+    for name in properties:
+        idprop_remove(owner, name)
+
+    for name in stage_properties:
+        driver_remove(key, f'["{name}"]')
+        idprop_remove(key, name)
+
+    for identifier in dead:
+        fcurve = drivers.get(identifier)
+        if fcurve is not None:
+            animdata.drivers.remove(fcurve)
+
+    for index in sorted(removed, reverse=True):
+        managers.remove(index)
+
+    # Managers are looked up by identifier from here on as removals have shifted the indices
+    rebuild: Set[str] = set()
+    id_type = owner_id_type(key)
+
+    for manager in managers:
+        identifier = manager.identifier
+        # A driver that is not a combination driver belongs to the user and is left alone
+        if identifier in missing_drivers and driver_find(key, manager.data_path) is None:
+            manager["stages"] = 0
+            fcurve = driver_ensure(key, manager.data_path)
+            driver_variables_create(fcurve.driver, key, manager, (), id_type)
+            rebuild.add(identifier)
+
+    for identifier, name in adopt.items():
+        fcurve = drivers[identifier]
+        manager = manager_create(key, name, driver_slot(key, fcurve), identifier)
+        manager["mode"] = MODE_INDEX[driver_mode_infer(key, fcurve)]
+        manager["stages"] = stage_counts[identifier]
+        activation_infer(manager, fcurve)
+
+    for manager in managers:
+        identifier = manager.identifier
+        variables = missing_inputs.get(identifier)
+        if variables:
+            fcurve = drivers[identifier]
+            driver_unstage(manager, fcurve)
+            collection = fcurve.driver.variables
+            for name in variables:
+                collection.remove(collection[name])
+
+    combination_index_invalidate(key)
+    combination_inputs_invalidate(key)
+
+    for manager in managers:
+        identifier = manager.identifier
+        if identifier in rebuild:
+            manager.update()
+        elif identifier in adopt:
+            # Adopted drivers keep their keyframes, which the inferred curve may only approximate
+            manager.id_properties_create()
+            manager.driver_update()
+        elif identifier in missing_inputs:
+            manager.driver_update()
+
+    return counts
+
+
+def validation_keys() -> Iterable['Key']:
+    """Every Key in the file that may hold combination shape keys or their drivers"""
+    for key in bpy.data.shape_keys:
+        if key.is_property_set("combination_shape_keys") or key.animation_data is not None:
+            yield key
+
+
+def validation_summary(counts: Dict[str, int]) -> str:
+    """A one line description of the problems in counts, e.g. for operator reports"""
+    return ", ".join(f'{VALIDATION_ISSUES[issue]}: {count}' for issue, count in counts.items() if count)
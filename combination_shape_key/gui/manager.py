@@ -0,0 +1,122 @@
+
+from typing import TYPE_CHECKING
+import bpy
+from bpy.types import Panel, UIList
+from bpy.props import BoolProperty, EnumProperty
+from ..app.lod import LOD_STATS, is_lod_enabled
+from ..ops.validate import CombinationShapeKeysValidate
+from ..ops.manage import (CombinationShapeKeysBulkEdit,
+                          CombinationShapeKeysListRefresh,
+                          CombinationShapeKeysListSelect)
+if TYPE_CHECKING:
+    from bpy.types import Context, UILayout
+    from ..api.combination_shape_key_list import CombinationShapeKeyListItem
+
+
+class CombinationShapeKeyManagerList(UIList):
+
+    bl_idname = 'VIEW3D_UL_combination_shape_keys'
+
+    sort_key: EnumProperty(
+        name="Sort By",
+        items=[
+            ('name'          , "Name"   , "Sort by name"                    ),
+            ('key'           , "Key"    , "Sort by shape key datablock"     ),
+            ('mode'          , "Mode"   , "Sort by mode"                    ),
+            ('radius'        , "Radius" , "Sort by radius"                  ),
+            ('variable_count', "Drivers", "Sort by number of driver keys"   ),
+            ],
+        default='name'
+        )
+
+    sort_descending: BoolProperty(
+        name="Descending",
+        default=False
+        )
+
+    selected_only: BoolProperty(
+        name="Selected Only",
+        description="Only show selected combinations",
+        default=False
+        )
+
+    def draw_item(self,
+                  context: 'Context',
+                  layout: 'UILayout', _1,
+                  item: 'CombinationShapeKeyListItem', _2, _3, _4, _5, _6) -> None:
+        row = layout.row()
+        row.prop(item, "is_selected", text="")
+        row.label(icon='SHAPEKEY_DATA', text=item.name)
+        row = row.row()
+        row.alignment = 'RIGHT'
+        row.label(text=item.key)
+        row.label(text=item.mode.title())
+
+    def draw_filter(self, _: 'Context', layout: 'UILayout') -> None:
+        row = layout.row(align=True)
+        row.prop(self, "filter_name", text="")
+        row.prop(self, "selected_only", text="", icon='CHECKBOX_HLT')
+        row.prop(self, "sort_key", text="")
+        row.prop(self, "sort_descending", text="", icon='SORT_DESC' if self.sort_descending else 'SORT_ASC')
+
+    def filter_items(self, context: 'Context', data, propname: str):
+        items = getattr(data, propname)
+        helper = bpy.types.UI_UL_list
+        flag = self.bitflag_filter_item
+
+        flags = [flag if item.is_selected or not self.selected_only else 0 for item in items]
+        if self.filter_name:
+            named = helper.filter_items_by_name(self.filter_name, flag, items, "name")
+            keyed = helper.filter_items_by_name(self.filter_name, flag, items, "key")
+            flags = [a & (b | c) for a, b, c in zip(flags, named, keyed)]
+
+        attr = self.sort_key
+        order = sorted(range(len(items)), key=lambda index: getattr(items[index], attr), reverse=self.sort_descending)
+        indices = [0] * len(items)
+        for position, index in enumerate(order):
+            indices[index] = position
+        return flags, indices
+
+
+class CombinationShapeKeyManager(Panel):
+
+    bl_idname = "VIEW3D_PT_combination_shape_keys"
+    bl_label = "Combinations"
+    bl_description = "Combination shape keys of every shape key datablock in the file"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = "Combinations"
+
+    def draw(self, context: 'Context') -> None:
+        layout = self.layout
+        wm = context.window_manager
+        items = wm.combination_shape_key_list
+
+        row = layout.row(align=True)
+        row.operator(CombinationShapeKeysListRefresh.bl_idname, icon='FILE_REFRESH', text="Refresh")
+        row.operator(CombinationShapeKeysListSelect.bl_idname, icon='CHECKBOX_HLT', text="").action = 'SELECT'
+        row.operator(CombinationShapeKeysListSelect.bl_idname, icon='CHECKBOX_DEHLT', text="").action = 'DESELECT'
+        row.operator(CombinationShapeKeysListSelect.bl_idname, icon='ARROW_LEFTRIGHT', text="").action = 'INVERT'
+
+        layout.template_list(CombinationShapeKeyManagerList.bl_idname, "",
+                             wm, "combination_shape_key_list",
+                             wm, "combination_shape_key_list_index")
+
+        count = sum(1 for item in items if item.is_selected)
+        row = layout.row()
+        row.label(text=f'{count} of {len(items)} selected')
+        row.operator(CombinationShapeKeysBulkEdit.bl_idname, icon='PREFERENCES', text="Edit Selected")
+
+        layout.operator(CombinationShapeKeysValidate.bl_idname,
+                        icon='CHECKMARK',
+                        text="Validate & Repair All").all_keys = True
+
+        layout.separator()
+        layout.prop(wm, "combination_shape_key_lod")
+        if is_lod_enabled(context):
+            layout.prop(wm, "combination_shape_key_lod_epsilon")
+            stats = LOD_STATS
+            box = layout.box()
+            box.scale_y = 0.6
+            box.label(text=f'Frame {stats["frame"]:g}: muted {stats["skipped"]} of {stats["combinations"]}')
+            box.label(text=f'Check took {stats["seconds"] * 1000.0:.2f} ms')
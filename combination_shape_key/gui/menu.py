@@ -5,6 +5,16 @@ from ..ops.drivers_select import CombinationShapeKeyDriversSelect
 from ..ops.duplicate_mirror import CombinationShapeKeyDuplicateMirror
 from ..ops.drivers_remove import CombinationShapeKeyDriversRemove
 from ..ops.drivers_solo import CombinationShapeKeyDriversSolo
+from ..ops.mirror_all import CombinationShapeKeysMirror
+from ..ops.bake import CombinationShapeKeysBake, CombinationShapeKeysUnbake
+from ..ops.sparse import CombinationShapeKeyRegionAssign, CombinationShapeKeysCompact
+from ..ops.extract import CombinationShapeKeyCorrectiveExtract
+from ..ops.flatten import CombinationShapeKeyFlatten
+from ..ops.store import CombinationShapeKeysStoreMigrate
+from ..ops.exchange import CombinationShapeKeysExport, CombinationShapeKeysImport
+from ..ops.validate import CombinationShapeKeysValidate
+from ..app.index import is_combination_shape_key
+from ..app.store import is_store_enabled
 if TYPE_CHECKING:
     from bpy.types import Context, Menu
 
@@ -17,24 +27,67 @@ def draw_menu_items(menu: 'Menu', context: 'Context') -> None:
         layout.operator(CombinationShapeKeyNew.bl_idname,
                         icon='ADD',
                         text="New Combination")
+        layout.operator(CombinationShapeKeysImport.bl_idname,
+                        icon='IMPORT',
+                        text="Import Combinations")
 
         shape = object.active_shape_key
         if shape is not None:
             key = shape.id_data
             if shape != key.reference_key:
-                data = key.combination_shape_keys if key.is_property_set("combination_shape_keys") else None
-                name = shape.name
-                if data is None or name not in data:
+                if not is_combination_shape_key(key, shape.name):
                     layout.operator(CombinationShapeKeyDriversSelect.bl_idname,
                                     icon='ANIM',
                                     text="Select Combination Drivers")
-                elif data is not None:
+                else:
                     layout.operator(CombinationShapeKeyDriversSolo.bl_idname,
                                     icon='ZOOM_SELECTED',
                                     text="Activate Combination")
                     layout.operator(CombinationShapeKeyDuplicateMirror.bl_idname,
                                     icon='MOD_MIRROR',
                                     text="Duplicate & Mirror Combination")
+                    layout.operator(CombinationShapeKeyCorrectiveExtract.bl_idname,
+                                    icon='SCULPTMODE_HLT',
+                                    text="Extract Corrective Shape")
+                    layout.operator(CombinationShapeKeyRegionAssign.bl_idname,
+                                    icon='GROUP_VERTEX',
+                                    text="Restrict Combination to Affected Region")
                     layout.operator(CombinationShapeKeyDriversRemove.bl_idname,
                                     icon='REMOVE',
                                     text="Remove Combination Drivers")
+
+        key = object.data.shape_keys
+        if key is not None and key.is_property_set("combination_shape_keys") and len(key.combination_shape_keys):
+            layout.separator()
+            layout.operator(CombinationShapeKeysMirror.bl_idname,
+                            icon='MOD_MIRROR',
+                            text="Mirror Combinations")
+            layout.operator(CombinationShapeKeyFlatten.bl_idname,
+                            icon='MOD_SIMPLIFY',
+                            text="Flatten Combinations").all_combinations = True
+            layout.operator(CombinationShapeKeysCompact.bl_idname,
+                            icon='MOD_DECIM',
+                            text="Compact Combinations")
+            layout.operator(CombinationShapeKeysValidate.bl_idname,
+                            icon='CHECKMARK',
+                            text="Validate Combinations").repair = False
+            layout.operator(CombinationShapeKeysValidate.bl_idname,
+                            icon='TOOL_SETTINGS',
+                            text="Repair Combinations").repair = True
+            if is_store_enabled(key):
+                layout.operator(CombinationShapeKeysStoreMigrate.bl_idname,
+                                icon='PROPERTIES',
+                                text="Store Combination Properties on Object Data").store = 'OWNER'
+            else:
+                layout.operator(CombinationShapeKeysStoreMigrate.bl_idname,
+                                icon='SHAPEKEY_DATA',
+                                text="Store Combination Properties on Shape Keys").store = 'SHARED'
+            layout.operator(CombinationShapeKeysExport.bl_idname,
+                            icon='EXPORT',
+                            text="Export Combinations")
+            layout.operator(CombinationShapeKeysBake.bl_idname,
+                            icon='KEYTYPE_KEYFRAME_VEC',
+                            text="Bake Combinations")
+            layout.operator(CombinationShapeKeysUnbake.bl_idname,
+                            icon='DRIVER',
+                            text="Restore Combination Drivers")
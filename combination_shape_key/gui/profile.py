@@ -0,0 +1,112 @@
+
+from typing import TYPE_CHECKING
+import bpy
+from bpy.types import Panel, UIList
+from bpy.props import BoolProperty, EnumProperty
+from ..app.compile import EVALUATION_PATHS
+from ..ops.profile import CombinationShapeKeysProfile, CombinationShapeKeysProfileExport
+if TYPE_CHECKING:
+    from bpy.types import Context, UILayout
+    from ..api.combination_shape_key_profile import CombinationShapeKeyProfileItem
+
+
+class CombinationShapeKeyProfileList(UIList):
+
+    bl_idname = 'DATA_UL_combination_shape_key_profile'
+
+    sort_key: EnumProperty(
+        name="Sort By",
+        items=[
+            ('total_cost'    , "Total"    , "Sort by total cost"            ),
+            ('driver_cost'   , "Driver"   , "Sort by driver cost"           ),
+            ('blend_cost'    , "Blend"    , "Sort by blend cost"            ),
+            ('variable_count', "Variables", "Sort by number of driver keys" ),
+            ('name'          , "Name"     , "Sort by name"                  ),
+            ],
+        default='total_cost'
+        )
+
+    sort_descending: BoolProperty(
+        name="Descending",
+        default=True
+        )
+
+    def draw_item(self,
+                  context: 'Context',
+                  layout: 'UILayout',
+                  data,
+                  item: 'CombinationShapeKeyProfileItem',
+                  icon: int,
+                  active_data,
+                  active_propname: str,
+                  index: int,
+                  flt_flag: int) -> None:
+        row = layout.row()
+        row.alert = item.evaluation_path == 'PYTHON'
+        row.label(icon='SHAPEKEY_DATA', text=item.name)
+        row = row.row()
+        row.alignment = 'RIGHT'
+        row.label(text=EVALUATION_PATHS.get(item.evaluation_path, item.evaluation_path))
+        row.label(text=str(item.variable_count))
+        row.label(text=f'{item.driver_cost:.1f}')
+        row.label(text=f'{item.blend_cost:.1f}')
+        row.label(text=f'{item.total_cost:.1f} µs')
+
+    def draw_filter(self, _: 'Context', layout: 'UILayout') -> None:
+        row = layout.row(align=True)
+        row.prop(self, "filter_name", text="")
+        row.prop(self, "sort_key", text="")
+        row.prop(self, "sort_descending", text="", icon='SORT_DESC' if self.sort_descending else 'SORT_ASC')
+
+    def filter_items(self, context: 'Context', data, propname: str):
+        items = getattr(data, propname)
+        helper = bpy.types.UI_UL_list
+
+        object = context.object
+        key = object.data.shape_keys.name if object is not None and object.data.shape_keys else ""
+
+        flags = [self.bitflag_filter_item if item.key == key else 0 for item in items]
+        if self.filter_name:
+            named = helper.filter_items_by_name(self.filter_name, self.bitflag_filter_item, items, "name")
+            flags = [a & b for a, b in zip(flags, named)]
+
+        attr = self.sort_key
+        order = sorted(range(len(items)), key=lambda index: getattr(items[index], attr), reverse=self.sort_descending)
+        indices = [0] * len(items)
+        for position, index in enumerate(order):
+            indices[index] = position
+        return flags, indices
+
+
+class CombinationShapeKeyProfile(Panel):
+
+    bl_parent_id = "DATA_PT_shape_keys"
+    bl_idname = "DATA_PT_combination_shape_key_profile"
+    bl_label = "Combination Profile"
+    bl_description = "Per-frame evaluation cost of combination shape keys"
+    bl_space_type = 'PROPERTIES'
+    bl_region_type = 'WINDOW'
+    bl_context = 'data'
+    bl_options = {'DEFAULT_CLOSED'}
+
+    @classmethod
+    def poll(cls, context: 'Context') -> bool:
+        object = context.object
+        if object is not None:
+            key = getattr(object.data, "shape_keys", None)
+            return key is not None and key.is_property_set("combination_shape_keys")
+        return False
+
+    def draw(self, context: 'Context') -> None:
+        layout = self.layout
+        row = layout.row()
+        row.operator(CombinationShapeKeysProfile.bl_idname, icon='TIME', text="Profile Playback Range")
+        row.operator(CombinationShapeKeysProfileExport.bl_idname, icon='EXPORT', text="Export CSV")
+
+        wm = context.window_manager
+        row = layout.row()
+        row.alignment = 'RIGHT'
+        row.label(text="Evaluation / Variables / Driver / Blend / Total")
+        layout.template_list(CombinationShapeKeyProfileList.bl_idname, "",
+                             wm, "combination_shape_key_profile",
+                             wm, "combination_shape_key_profile_index")
@@ -1,10 +1,17 @@
 
 from typing import TYPE_CHECKING
 from bpy.types import Panel
-from ..lib.driver_utils import driver_find
 from ..lib.curve_mapping import draw_curve_manager_ui
+from ..app.compile import EVALUATION_PATHS
+from ..app.graph import combination_depth
+from ..app.index import is_combination_shape_key
+from ..app.store import factor_target
+from ..app.setup import key_setup_request
+from ..app.preview import is_preview_enabled, is_preview_pending, preview_curve
 from ..ops.driver_add import CombinationShapeKeyDriverAdd
 from ..ops.driver_remove import CombinationShapeKeyDriverRemove
+from ..ops.flatten import CombinationShapeKeyFlatten
+from ..ops.sparse import CombinationShapeKeyAnalyse
 if TYPE_CHECKING:
     from bpy.types import Context, UILayout
 
@@ -24,9 +31,7 @@ class CombinationShapeKeySettings(Panel):
         if object is not None:
             shape = object.active_shape_key
             if shape is not None:
-                key = shape.id_data
-                return (key.is_property_set("combination_shape_keys")
-                        and shape.name in key.combination_shape_keys)
+                return is_combination_shape_key(shape.id_data, shape.name)
         return False
 
     def section(self, label: str) -> 'UILayout':
@@ -43,22 +48,19 @@ class CombinationShapeKeySettings(Panel):
         settings = key.combination_shape_keys[object.active_shape_key.name]
 
         column = self.section('Combination Of')
-        fcurve = driver_find(key, settings.data_path)
-        if fcurve:
-            for index, variable in enumerate(fcurve.driver.variables):
-                target = variable.targets[0]
-                if target.data_path.startswith('key_blocks['):
-                    name = target.data_path[12:-8]
-                    shape = key.key_blocks.get(name)
-                    row = column.row(align=True)
-                    box = row.box()
-                    box.scale_y = 0.5
-                    subrow = box.row(align=True)
-                    subrow.alert = shape is None
-                    subrow.label(icon='SHAPEKEY_DATA', text=name)
-                    row.operator(CombinationShapeKeyDriverRemove.bl_idname,
-                                 text="",
-                                 icon='X').index = index
+        inputs = settings.inputs
+        if inputs is not None:
+            blocks = key.key_blocks
+            for item in inputs.shapes:
+                row = column.row(align=True)
+                box = row.box()
+                box.scale_y = 0.5
+                subrow = box.row(align=True)
+                subrow.alert = item.name not in blocks
+                subrow.label(icon='SHAPEKEY_DATA', text=item.name)
+                row.operator(CombinationShapeKeyDriverRemove.bl_idname,
+                             text="",
+                             icon='X').index = item.index
 
         subrow = column.row()
         subrow.operator(CombinationShapeKeyDriverAdd.bl_idname,
@@ -74,10 +76,34 @@ class CombinationShapeKeySettings(Panel):
         subrow.separator(factor=2.0)
 
         subrow = column.row()
-        subrow.prop(settings.id_data.user,
-                    settings.influence_property_path,
-                    text="Influence",
-                    slider=True)
+        owner, path, index = factor_target(settings, "influence")
+        subrow.prop(owner, path, index=index, text="Influence", slider=True)
+        subrow.separator(factor=2.0)
+
+        subrow = column.row()
+        subrow.label(text=EVALUATION_PATHS[settings.evaluation_path])
+        subrow.separator(factor=2.0)
+
+        subrow = column.row()
+        depth = combination_depth(key, settings.name)
+        if depth is None:
+            subrow.alert = True
+            subrow.label(icon='ERROR', text="Dependency cycle")
+        else:
+            subrow.label(text=f'Evaluation depth {depth}')
+            if depth > 1:
+                subrow.operator(CombinationShapeKeyFlatten.bl_idname, text="", icon='MOD_SIMPLIFY')
+        subrow.separator(factor=2.0)
+
+        if settings.is_folded:
+            subrow = column.row()
+            subrow.label(icon='CHECKMARK', text="Curve folded into expression")
+            subrow.separator(factor=2.0)
+
+        subrow = column.row()
+        touched = settings.get("touched")
+        subrow.label(text=f'Affects {touched} points' if touched is not None else "Affected points unknown")
+        subrow.operator(CombinationShapeKeyAnalyse.bl_idname, text="", icon='VIEWZOOM')
         subrow.separator(factor=2.0)
 
         subrow = column.row()
@@ -91,7 +117,10 @@ class CombinationShapeKeySettings(Panel):
         column = self.section("Activation")
         subrow = column.row()
         column = subrow.column()
-        draw_curve_manager_ui(column, settings.activation_curve)
+        if key_setup_request(key):
+            draw_curve_manager_ui(column, settings.activation_curve)
+        else:
+            column.label(icon='TIME', text="Loading curve...")
         subrow.separator(factor=2.0)
 
         column.prop(settings, "radius", text="Radius")
@@ -101,3 +130,21 @@ class CombinationShapeKeySettings(Panel):
         subrow.alignment = 'RIGHT'
         subrow.label(text="Clamp")
         subrow.prop(settings, "clamp", text="")
+
+        subrow = column.row()
+        subrow.alignment = 'RIGHT'
+        subrow.label(text="Fold Curve")
+        subrow.prop(settings, "use_curve_folding", text="")
+
+        subrow = column.row()
+        subrow.alignment = 'RIGHT'
+        subrow.label(text="Fast Preview")
+        subrow.prop(context.window_manager, "combination_shape_key_preview", text="")
+
+        if is_preview_enabled(context):
+            box = column.box()
+            node = preview_curve(settings)
+            if node is not None:
+                box.template_curve_mapping(node, "mapping")
+            if node is None or is_preview_pending(settings):
+                box.label(icon='TIME', text="Updating...")
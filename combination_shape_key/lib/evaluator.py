@@ -0,0 +1,366 @@
+
+"""
+Reference evaluator for combination shape key values.
+
+Depends only on NumPy so it can be imported without Blender, e.g. to validate or bake
+animation offline. Mirrors what Blender evaluates for a combination shape key:
+
+    x     = weight * influence * combine(mode, driver shape values)
+    value = activation_curve(x)   # bezier fcurve mapped to (1-radius, 1) -> (0, goal)
+    value = clip(value, slider_min, slider_max)
+
+evaluate solves the activation curves exactly by default. Passing exact=False interpolates
+shared lookup tables of LOOKUP_SAMPLES samples per curve instead, which is faster for many
+frames but approximate: the error is about 1e-6 of the goal on smoothly eased curves, grows
+to around 1e-5 for steep ease-in or ease-out handles, and is negligible for linear curves.
+"""
+
+from typing import Container, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+from functools import lru_cache
+import numpy as np
+
+# Bezier keyframes are stored as an array of shape (points, 3, 2) holding
+# the co, handle_left and handle_right of each keyframe.
+BezierArray = np.ndarray
+
+LINEAR_BEZIER = np.array([[[0.0, 0.0], [-1.0/3.0, -1.0/3.0], [1.0/3.0, 1.0/3.0]],
+                          [[1.0, 1.0], [ 2.0/3.0,  2.0/3.0], [4.0/3.0, 4.0/3.0]]])
+
+
+class CombinationSettings(NamedTuple):
+    """Settings of a single combination shape key"""
+    mode: str = 'MULTIPLY'
+    radius: float = 1.0
+    target_value: float = 1.0
+    clamp: bool = True
+    # Activation curve as bezier keyframes normalized to the unit square
+    curve: BezierArray = LINEAR_BEZIER
+    weight: float = 1.0
+    influence: float = 1.0
+    slider_min: float = 0.0
+    slider_max: float = 1.0
+
+
+def bezier_array(points: Sequence[Tuple[Sequence[float], Sequence[float], Sequence[float]]]) -> BezierArray:
+    """Converts a sequence of (co, handle_left, handle_right) to a bezier array"""
+    array = np.asarray(points, dtype=np.float64).reshape(-1, 3, 2)
+    if len(array) == 0:
+        raise ValueError("bezier curve requires at least one point")
+    return array
+
+
+def _segment_solve(x0, h0, h1, x1, x, tolerance=1e-12, iterations=64):
+    """
+    Finds t such that the cubic bezier x(t) == x, for x-monotonic segments (vectorised). Stops
+    once every t is within tolerance and returns exactly 0 and 1 at the segment's end points.
+    """
+    lo = np.zeros_like(x)
+    hi = np.ones_like(x)
+    for _ in range(iterations):
+        t = (lo + hi) * 0.5
+        s = 1.0 - t
+        xt = s*s*s*x0 + 3.0*s*s*t*h0 + 3.0*s*t*t*h1 + t*t*t*x1
+        below = xt < x
+        converged = np.abs(xt - x) <= tolerance
+        lo = np.where(converged | below, t, lo)
+        hi = np.where(converged | ~below, t, hi)
+        if np.all(hi - lo <= tolerance):
+            break
+    t = (lo + hi) * 0.5
+    t = np.where(x <= x0, 0.0, t)
+    return np.where(x >= x1, 1.0, t)
+
+
+def _handles_correct(bezier: BezierArray) -> BezierArray:
+    """Scales handles so that no segment overlaps itself in x, as Blender does for fcurves"""
+    bezier = bezier.copy()
+    for k in range(len(bezier) - 1):
+        x0 = bezier[k, 0, 0]
+        x1 = bezier[k+1, 0, 0]
+        width = x1 - x0
+        if width <= 0.0:
+            continue
+        right = bezier[k, 2] - bezier[k, 0]
+        left = bezier[k+1, 0] - bezier[k+1, 1]
+        span = right[0] + left[0]
+        if span > width and span > 0.0:
+            factor = width / span
+            bezier[k, 2] = bezier[k, 0] + right * factor
+            bezier[k+1, 1] = bezier[k+1, 0] - left * factor
+    return bezier
+
+
+def bezier_evaluate(bezier: BezierArray, x: np.ndarray, extrapolate: bool=False) -> np.ndarray:
+    """
+    Evaluates the bezier curve at x (any shape). Outside the curve's range the value is held
+    constant, or extended along the end handles when extrapolate is True.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    bezier = _handles_correct(np.asarray(bezier, dtype=np.float64))
+    co = bezier[:, 0]
+    result = np.empty_like(x)
+
+    if len(bezier) == 1:
+        result.fill(co[0, 1])
+        return result
+
+    xs = co[:, 0]
+    segment = np.clip(np.searchsorted(xs, x, side="right") - 1, 0, len(bezier) - 2)
+
+    p0 = bezier[segment, 0]
+    p1 = bezier[segment, 2]
+    p2 = bezier[segment + 1, 1]
+    p3 = bezier[segment + 1, 0]
+
+    t = _segment_solve(p0[..., 0], p1[..., 0], p2[..., 0], p3[..., 0], x)
+    s = 1.0 - t
+    result = s*s*s*p0[..., 1] + 3.0*s*s*t*p1[..., 1] + 3.0*s*t*t*p2[..., 1] + t*t*t*p3[..., 1]
+
+    first = co[0]
+    last = co[-1]
+    before = x < first[0]
+    after = x > last[0]
+
+    if extrapolate:
+        dx, dy = first - bezier[0, 1]
+        slope = dy / dx if dx != 0.0 else 0.0
+        result = np.where(before, first[1] + (x - first[0]) * slope, result)
+        dx, dy = bezier[-1, 2] - last
+        slope = dy / dx if dx != 0.0 else 0.0
+        result = np.where(after, last[1] + (x - last[0]) * slope, result)
+    else:
+        result = np.where(before, first[1], result)
+        result = np.where(after, last[1], result)
+
+    return result
+
+
+# Keyframe interpolation modes as stored by Blender (Keyframe.interpolation)
+INTERPOLATION_CONSTANT = 0
+INTERPOLATION_LINEAR = 1
+INTERPOLATION_BEZIER = 2
+
+
+def keyframes_evaluate(bezier: BezierArray,
+                       interpolation: np.ndarray,
+                       x: np.ndarray,
+                       extrapolate: bool=False) -> np.ndarray:
+    """
+    Evaluates fcurve keyframes with per-keyframe CONSTANT, LINEAR or BEZIER interpolation at x,
+    matching an fcurve with constant (or linear when extrapolate is True) extrapolation
+    """
+    x = np.asarray(x, dtype=np.float64)
+    bezier = np.asarray(bezier, dtype=np.float64)
+    interpolation = np.asarray(interpolation)
+    xs = bezier[:, 0, 0]
+    ys = bezier[:, 0, 1]
+
+    if len(bezier) == 1:
+        return np.full_like(x, ys[0])
+
+    segment = np.clip(np.searchsorted(xs, x, side="right") - 1, 0, len(bezier) - 2)
+    modes = interpolation[segment]
+
+    result = np.interp(x, xs, ys)
+    if np.any(modes == INTERPOLATION_BEZIER):
+        result = np.where(modes == INTERPOLATION_BEZIER, bezier_evaluate(bezier, x), result)
+    result = np.where(modes == INTERPOLATION_CONSTANT, ys[segment], result)
+    result = np.where(x >= xs[-1], ys[-1], result)
+    result = np.where(x < xs[0], ys[0], result)
+
+    if extrapolate:
+        if interpolation[0] == INTERPOLATION_BEZIER:
+            dx, dy = bezier[0, 0] - bezier[0, 1]
+        else:
+            dx, dy = bezier[1, 0] - bezier[0, 0]
+        slope = dy / dx if dx != 0.0 else 0.0
+        result = np.where(x < xs[0], ys[0] + (x - xs[0]) * slope, result)
+        if interpolation[-2] == INTERPOLATION_BEZIER:
+            dx, dy = bezier[-1, 2] - bezier[-1, 0]
+        else:
+            dx, dy = bezier[-1, 0] - bezier[-2, 0]
+        slope = dy / dx if dx != 0.0 else 0.0
+        result = np.where(x > xs[-1], ys[-1] + (x - xs[-1]) * slope, result)
+
+    return result
+
+
+# How the values of input shape keys are sampled for offline evaluation
+SOURCE_STATIC = 'STATIC'
+SOURCE_FCURVE = 'FCURVE'
+SOURCE_FRAMES = 'FRAMES'
+
+
+def input_sources(names: Iterable[str],
+                  animated: Container[str],
+                  driven: Container[str],
+                  layered: bool=False) -> Dict[str, str]:
+    """
+    Decides how the value of each named input shape key is sampled. Inputs whose value only the
+    depsgraph can produce, because they are driven or because the Key's animation is layered
+    through NLA, are SOURCE_FRAMES and have to be sampled by stepping through the frames.
+    Inputs animated by an fcurve of the action are SOURCE_FCURVE, others SOURCE_STATIC.
+    """
+    result = {}
+    for name in names:
+        if layered or name in driven:
+            result[name] = SOURCE_FRAMES
+        elif name in animated:
+            result[name] = SOURCE_FCURVE
+        else:
+            result[name] = SOURCE_STATIC
+    return result
+
+
+def combine(mode: str, inputs: np.ndarray) -> np.ndarray:
+    """
+    Combines driver shape values along the second to last axis, i.e. inputs of shape
+    (..., drivers, frames) produce (..., frames)
+    """
+    inputs = np.asarray(inputs, dtype=np.float64)
+    if inputs.shape[-2] == 0:
+        return np.zeros(inputs.shape[:-2] + inputs.shape[-1:])
+    if mode == 'MULTIPLY':
+        return np.prod(inputs, axis=-2)
+    if mode == 'MIN':
+        return np.min(inputs, axis=-2)
+    if mode == 'MAX':
+        return np.max(inputs, axis=-2)
+    if mode == 'AVERAGE':
+        return np.mean(inputs, axis=-2)
+    raise ValueError(f'Invalid combination mode {mode}')
+
+
+def activation_evaluate(settings: CombinationSettings, x: np.ndarray) -> np.ndarray:
+    """Maps driver values x through the activation curve of settings"""
+    radius = settings.radius
+    x = np.asarray(x, dtype=np.float64)
+    if radius <= 0.0:
+        # Zero width curve, switches to the goal at 1.0
+        u = np.where(x >= 1.0, 2.0, -1.0)
+    else:
+        u = (x - (1.0 - radius)) / radius
+    return bezier_evaluate(settings.curve, u, extrapolate=not settings.clamp) * settings.target_value
+
+
+# Samples per activation lookup table and the number of tables kept
+LOOKUP_SAMPLES = 1025
+LOOKUP_CACHE_SIZE = 256
+
+
+class ActivationLookup(NamedTuple):
+    """An activation curve sampled over its keyframe range, with its extrapolation slopes"""
+    xs: np.ndarray
+    ys: np.ndarray
+    slope_left: float
+    slope_right: float
+
+
+@lru_cache(maxsize=LOOKUP_CACHE_SIZE)
+def _lookup_build(curve: bytes, extrapolate: bool) -> ActivationLookup:
+    bezier = np.frombuffer(curve, dtype=np.float64).reshape(-1, 3, 2)
+    first = bezier[0, 0, 0]
+    last = bezier[-1, 0, 0]
+    if last > first:
+        xs = np.linspace(first, last, LOOKUP_SAMPLES)
+    else:
+        xs = np.array([first])
+    ys = bezier_evaluate(bezier, xs)
+
+    slope_left = slope_right = 0.0
+    if extrapolate and len(xs) > 1:
+        # Sample one unit beyond each end, extrapolation is linear so this gives the slope
+        ends = bezier_evaluate(bezier, np.array([first - 1.0, last + 1.0]), extrapolate=True)
+        slope_left = ys[0] - ends[0]
+        slope_right = ends[1] - ys[-1]
+
+    return ActivationLookup(xs, ys, slope_left, slope_right)
+
+
+def activation_lookup(settings: CombinationSettings) -> ActivationLookup:
+    """
+    Returns the lookup table for the activation curve of settings. Tables are built once per
+    distinct curve and clamp setting and shared regardless of radius and goal.
+    """
+    curve = np.ascontiguousarray(settings.curve, dtype=np.float64)
+    return _lookup_build(curve.tobytes(), not settings.clamp)
+
+
+def activation_lookup_evaluate(settings: CombinationSettings, x: np.ndarray) -> np.ndarray:
+    """
+    Maps driver values x through the activation curve of settings by interpolating its lookup
+    table. Agrees with activation_evaluate to within the table's sampling error.
+    """
+    lookup = activation_lookup(settings)
+    radius = settings.radius
+    x = np.asarray(x, dtype=np.float64)
+    if radius <= 0.0:
+        u = np.where(x >= 1.0, 2.0, -1.0)
+    else:
+        u = (x - (1.0 - radius)) / radius
+
+    xs = lookup.xs
+    ys = lookup.ys
+    result = np.interp(u, xs, ys)
+    if lookup.slope_left != 0.0:
+        result = np.where(u < xs[0], ys[0] + (u - xs[0]) * lookup.slope_left, result)
+    if lookup.slope_right != 0.0:
+        result = np.where(u > xs[-1], ys[-1] + (u - xs[-1]) * lookup.slope_right, result)
+    return result * settings.target_value
+
+
+def _curve_key(settings: CombinationSettings) -> Tuple:
+    return (np.asarray(settings.curve, dtype=np.float64).tobytes(),
+            settings.radius,
+            settings.target_value,
+            settings.clamp)
+
+
+def evaluate(settings: Sequence[CombinationSettings],
+             inputs: Sequence[np.ndarray],
+             frames: Optional[int]=None,
+             exact: bool=True) -> np.ndarray:
+    """
+    Evaluates many combinations over many frames.
+
+    settings: one CombinationSettings per combination
+    inputs:   one array of shape (drivers, frames) per combination holding driver shape values
+    exact:    solve the activation curves directly, False uses the approximate lookup tables
+    Returns an array of shape (combinations, frames)
+    """
+    if len(settings) != len(inputs):
+        raise ValueError("settings and inputs must have the same length")
+
+    arrays = [np.atleast_2d(np.asarray(item, dtype=np.float64)) for item in inputs]
+    if frames is None:
+        frames = max((array.shape[-1] for array in arrays), default=0)
+
+    driver_values = np.zeros((len(settings), frames))
+
+    # Combine inputs of combinations sharing a mode and driver count in one operation
+    groups: Dict[Tuple[str, int], List[int]] = {}
+    for index, (item, array) in enumerate(zip(settings, arrays)):
+        groups.setdefault((item.mode, array.shape[0] if array.size else 0), []).append(index)
+
+    for (mode, count), indices in groups.items():
+        if count == 0:
+            continue
+        stack = np.stack([np.broadcast_to(arrays[index], (count, frames)) for index in indices])
+        driver_values[indices] = combine(mode, stack)
+
+    scale = np.array([item.weight * item.influence for item in settings]).reshape(-1, 1)
+    driver_values *= scale
+
+    # Evaluate each distinct activation curve once for all combinations using it
+    result = np.empty_like(driver_values)
+    curves: Dict[Tuple, List[int]] = {}
+    for index, item in enumerate(settings):
+        curves.setdefault(_curve_key(item), []).append(index)
+
+    function = activation_evaluate if exact else activation_lookup_evaluate
+    for indices in curves.values():
+        result[indices] = function(settings[indices[0]], driver_values[indices])
+
+    lo = np.array([item.slider_min for item in settings]).reshape(-1, 1)
+    hi = np.array([item.slider_max for item in settings]).reshape(-1, 1)
+    return np.clip(result, lo, hi)
@@ -1,5 +1,5 @@
 
-from typing import Union, TYPE_CHECKING
+from typing import Sequence, Union, TYPE_CHECKING
 from rna_prop_ui import rna_idprop_ui_create
 import bpy
 if TYPE_CHECKING:
@@ -21,4 +21,8 @@ def idprop_remove(owner: Union['ID', 'PoseBone', 'Bone'], name: str) -> None:
     if bpy.app.version[0] < 3:
         try:
             del owner["_RNA_UI"][name]
-        except KeyError: pass
\ No newline at end of file
+        except KeyError: pass
+
+def idprop_array_assign(owner: Union['ID', 'PoseBone', 'Bone'], name: str, values: Sequence[float]) -> None:
+    owner[name] = [float(value) for value in values]
+    owner.id_properties_ui(name).update(default=1.0, min=0.0, max=1.0, soft_min=0.0, soft_max=1.0)
@@ -0,0 +1,102 @@
+
+from typing import Set, TYPE_CHECKING
+from bpy.types import Operator
+from bpy.props import EnumProperty, IntProperty
+from ..app.bake import BAKE_DRIVER_ACTIONS, combinations_bake, combinations_unbake
+from ..app.setup import key_setup_ensure
+from .base import COMPAT_ENGINES, COMPAT_OBJECTS
+if TYPE_CHECKING:
+    from bpy.types import Context, Event
+
+
+def combination_key_poll(context: 'Context') -> bool:
+    if context.engine in COMPAT_ENGINES:
+        object = context.object
+        if object is not None and object.type in COMPAT_OBJECTS:
+            key = object.data.shape_keys
+            return (key is not None
+                    and key.is_property_set("combination_shape_keys")
+                    and len(key.combination_shape_keys) > 0)
+    return False
+
+
+class CombinationShapeKeysBake(Operator):
+    bl_idname = 'combination_shape_key.bake'
+    bl_label = "Bake Combination Shape Keys"
+    bl_description = "Bake the values of all combination shape keys to keyframes"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    frame_start: IntProperty(
+        name="Start Frame",
+        description="First frame to bake",
+        default=1,
+        options=set()
+        )
+
+    frame_end: IntProperty(
+        name="End Frame",
+        description="Last frame to bake",
+        default=250,
+        options=set()
+        )
+
+    frame_step: IntProperty(
+        name="Frame Step",
+        description="Number of frames between baked keyframes",
+        min=1,
+        default=1,
+        options=set()
+        )
+
+    driver_action: EnumProperty(
+        name="Drivers",
+        description="What to do with the combination shape key drivers once baked",
+        items=BAKE_DRIVER_ACTIONS,
+        default='MUTE',
+        options=set()
+        )
+
+    @classmethod
+    def poll(cls, context: 'Context') -> bool:
+        return combination_key_poll(context)
+
+    def invoke(self, context: 'Context', _: 'Event') -> Set[str]:
+        scene = context.scene
+        self.frame_start = scene.frame_start
+        self.frame_end = scene.frame_end
+        return context.window_manager.invoke_props_dialog(self)
+
+    def execute(self, context: 'Context') -> Set[str]:
+        if self.frame_end < self.frame_start:
+            self.report({'ERROR'}, "End frame is before start frame")
+            return {'CANCELLED'}
+
+        key = context.object.data.shape_keys
+        key_setup_ensure(key)
+        count = combinations_bake(key,
+                                  self.frame_start,
+                                  self.frame_end,
+                                  step=self.frame_step,
+                                  driver_action=self.driver_action,
+                                  scene=context.scene)
+
+        self.report({'INFO'}, f'Baked {count} combination shape keys')
+        return {'FINISHED'}
+
+
+class CombinationShapeKeysUnbake(Operator):
+    bl_idname = 'combination_shape_key.unbake'
+    bl_label = "Restore Combination Shape Key Drivers"
+    bl_description = "Remove baked keyframes and restore the drivers of baked combination shape keys"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, context: 'Context') -> bool:
+        return combination_key_poll(context)
+
+    def execute(self, context: 'Context') -> Set[str]:
+        key = context.object.data.shape_keys
+        key_setup_ensure(key)
+        count = combinations_unbake(key)
+        self.report({'INFO'}, f'Restored {count} combination shape keys')
+        return {'FINISHED'}
@@ -0,0 +1,68 @@
+
+from typing import Set, TYPE_CHECKING
+from bpy.types import Operator
+from bpy.props import CollectionProperty
+from ..api.combination_shape_key_spec import CombinationShapeKeySpec
+from ..app.create import CombinationSpec, combination_shape_keys_create, combination_specs_validate
+from .base import COMPAT_ENGINES, COMPAT_OBJECTS
+if TYPE_CHECKING:
+    from bpy.types import Context
+
+
+class CombinationShapeKeyBatchNew(Operator):
+    """
+    Creates many combination shape keys in a single pass. Intended to be called from Python:
+
+        bpy.ops.combination_shape_key.batch_new(combinations=[
+            {"name": "jawOpen_lipsPucker", "drivers": [{"name": "jawOpen"}, {"name": "lipsPucker"}]},
+            {"name": "browsUp_eyesWide", "drivers": [{"name": "browsUp"}, {"name": "eyesWide"}], "mode": 'MIN'},
+            ])
+
+    Missing target shape keys are added to the active object.
+    """
+    bl_idname = 'combination_shape_key.batch_new'
+    bl_label = "New Combination Shape Keys"
+    bl_description = "Create multiple combination shape keys"
+    bl_options = {'INTERNAL', 'UNDO'}
+
+    combinations: CollectionProperty(
+        name="Combinations",
+        type=CombinationShapeKeySpec,
+        options=set()
+        )
+
+    @classmethod
+    def poll(cls, context: 'Context') -> bool:
+        if context.engine in COMPAT_ENGINES:
+            object = context.object
+            if object is not None and object.type in COMPAT_OBJECTS:
+                key = object.data.shape_keys
+                return key is not None and key.use_relative
+        return False
+
+    def execute(self, context: 'Context') -> Set[str]:
+        object = context.object
+        key = object.data.shape_keys
+        blocks = key.key_blocks
+
+        specs = [CombinationSpec(item.name,
+                                 tuple(driver.name for driver in item.drivers),
+                                 mode=item.mode,
+                                 radius=item.radius,
+                                 target_value=item.target_value,
+                                 clamp=item.clamp)
+                 for item in self.combinations]
+        added = [name for name in dict.fromkeys(spec.name for spec in specs) if name not in blocks]
+
+        # Validate before adding any shape key so that nothing is left behind on failure
+        errors = combination_specs_validate(key, specs, added)
+        if errors:
+            self.report({'ERROR'}, "\n".join(errors))
+            return {'CANCELLED'}
+
+        for name in added:
+            object.shape_key_add(name=name, from_mix=False)
+
+        managers = combination_shape_keys_create(key, specs)
+        self.report({'INFO'}, f'Created {len(managers)} combination shape keys')
+        return {'FINISHED'}
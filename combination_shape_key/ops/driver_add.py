@@ -1,11 +1,13 @@
 
 from typing import Set, TYPE_CHECKING
-from string import ascii_letters
-from itertools import islice, product
 from bpy.types import Operator
 from bpy.props import CollectionProperty, StringProperty
-from ..lib.driver_utils import driver_find
 from ..api.combination_shape_key_target import CombinationShapeKeyTarget
+from ..app.compile import driver_unstage
+from ..app.graph import combination_graph
+from ..app.index import combination_driver_find, is_combination_driven
+from ..app.naming import variable_allocator
+from ..app.setup import key_setup_ensure
 from .base import COMPAT_ENGINES, COMPAT_OBJECTS
 if TYPE_CHECKING:
     from bpy.types import Context, Event
@@ -31,22 +33,27 @@ class CombinationShapeKeyDriverAdd(Operator):
 
     @classmethod
     def poll(cls, context: 'Context') -> bool:
-        return (context.engine in COMPAT_ENGINES
-                and context.object is not None
-                and context.object.type in COMPAT_OBJECTS
-                and context.object.active_shape_key is not None
-                and context.object.data.shape_keys.use_relative
-                and context.object.active_shape_key != context.object.data.shape_keys.reference_key
-                and context.object.data.shape_keys.is_property_set("combination_shape_keys")
-                and context.object.active_shape_key.name in context.object.data.shape_keys.combination_shape_keys)
+        if context.engine in COMPAT_ENGINES:
+            object = context.object
+            if object is not None and object.type in COMPAT_OBJECTS:
+                shape = object.active_shape_key
+                if shape is not None:
+                    key = shape.id_data
+                    return (key.use_relative
+                            and shape != key.reference_key
+                            and is_combination_driven(key, shape.name))
+        return False
 
     def invoke(self, context: 'Context', _: 'Event') -> Set[str]:
         shape = context.object.active_shape_key
         key = shape.id_data
-        ignore = [key.reference_key.name, shape.name]
-        
-        for variable in driver_find(key, f'key_blocks["{shape.name}"].value').driver.variables[1:]:
-            ignore.append(variable.targets[0].data_path[12:-8])
+        # Combinations that depend on the shape key would create a dependency cycle
+        ignore = combination_graph(key).downstream((shape.name,))
+        ignore.add(key.reference_key.name)
+
+        inputs = key.combination_shape_keys[shape.name].inputs
+        if inputs is not None:
+            ignore.update(inputs.names)
 
         shapes = self.shapes
         shapes.clear()
@@ -66,18 +73,23 @@ class CombinationShapeKeyDriverAdd(Operator):
     def execute(self, context: 'Context') -> Set[str]:
         shape = context.object.active_shape_key
         key = shape.id_data
+        key_setup_ensure(key)
         target = key.key_blocks.get(self.name)
         manager = key.combination_shape_keys.get(shape.name)
 
+        if target and manager and combination_graph(key).is_cyclic(shape.name, (target.name,)):
+            self.report({'ERROR'}, f'"{target.name}" depends on "{shape.name}" and can not drive it')
+            return {'CANCELLED'}
+
         if target and manager:
-            variables = driver_find(key, f'key_blocks["{shape.name}"].value').driver.variables
+            fcurve = combination_driver_find(key, manager.identifier)
+            driver_unstage(manager, fcurve)
+            variables = fcurve.driver.variables
+            name = variable_allocator(key, manager.identifier, variables).allocate()
             variable = variables.new()
-            
-            chars = ascii_letters
-            names = islice(product(chars, repeat=len(variables)//len(chars)+1), len(variables))
 
             variable.type = 'SINGLE_PROP'
-            variable.name = "".join(tuple(names)[len(variables)-1])
+            variable.name = name
             variable.targets[0].id_type = 'KEY'
             variable.targets[0].id = key
             variable.targets[0].data_path = f'key_blocks["{target.name}"].value'
@@ -3,6 +3,10 @@ from typing import Set, TYPE_CHECKING
 from bpy.types import Operator
 from bpy.props import IntProperty
 from ..lib.driver_utils import driver_find
+from ..app.compile import driver_unstage
+from ..app.index import is_combination_driven
+from ..app.naming import variable_allocator
+from ..app.setup import key_setup_ensure
 from .base import COMPAT_ENGINES, COMPAT_OBJECTS
 if TYPE_CHECKING:
     from bpy.types import Context
@@ -28,16 +32,13 @@ class CombinationShapeKeyDriverRemove(Operator):
             if object is not None and object.type in COMPAT_OBJECTS:
                 shape = object.active_shape_key
                 if shape is not None:
-                    key = shape.id_data
-                    if key.is_property_set("combination_shape_keys"):
-                        data = key.combination_shape_keys.get(shape.name)
-                        if data is not None:
-                            fcurve = driver_find(key, f'key_blocks["{shape.name}"].value')
-                            return fcurve is not None
+                    return is_combination_driven(shape.id_data, shape.name)
+        return False
 
     def execute(self, context: 'Context') -> Set[str]:
         shape = context.object.active_shape_key
         key = shape.id_data
+        key_setup_ensure(key)
 
         fcurve = driver_find(key, f'key_blocks["{shape.name}"].value')
         if fcurve is None:
@@ -49,6 +50,13 @@ class CombinationShapeKeyDriverRemove(Operator):
             self.report({'ERROR'}, "")
             return {'CANCELLED'}
 
+        settings = key.combination_shape_keys.get(shape.name)
+        if settings is None:
+            self.report({'ERROR'}, "")
+            return {'CANCELLED'}
+
+        # The index is the variable's position once the driver's stages are cleared
+        driver_unstage(settings, fcurve)
         variables = driver.variables
 
         index = self.index
@@ -62,11 +70,7 @@ class CombinationShapeKeyDriverRemove(Operator):
             self.report({'ERROR'}, f'invalid variable index {index}')
             return {'CANCELLED'}
 
-        settings = key.combination_shape_keys.get(shape.name)
-        if settings is None:
-            self.report({'ERROR'}, "")
-            return {'CANCELLED'}
-
+        variable_allocator(key, settings.identifier, variables).release(variables[index].name)
         variables.remove(variables[index])
         settings.driver_update()
         return {'FINISHED'}
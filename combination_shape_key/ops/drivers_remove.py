@@ -1,7 +1,9 @@
 
 from typing import Set, TYPE_CHECKING
 from bpy.types import Operator
-from ..lib.driver_utils import driver_remove
+from ..lib.driver_utils import driver_find, driver_remove
+from ..app.compile import stages_clear
+from ..app.index import is_combination_shape_key
 from .base import COMPAT_ENGINES, COMPAT_OBJECTS
 if TYPE_CHECKING:
     from bpy.types import Context
@@ -20,15 +22,16 @@ class CombinationShapeKeyDriversRemove(Operator):
             if object is not None and object.type in COMPAT_OBJECTS:
                 shape = object.active_shape_key
                 if shape is not None:
-                    key = shape.id_data
-                    return (key.is_property_set("combination_shape_keys")
-                            and shape.name in key.combination_shape_keys)
+                    return is_combination_shape_key(shape.id_data, shape.name)
         return False
 
     def execute(self, context: 'Context') -> Set[str]:
         shape = context.object.active_shape_key
         key = shape.id_data
-        driver_remove(key, f'key_blocks["{shape.name}"].value')
         collection = key.combination_shape_keys
+        fcurve = driver_find(key, f'key_blocks["{shape.name}"].value')
+        if fcurve is not None:
+            stages_clear(collection[shape.name], fcurve.driver)
+        driver_remove(key, f'key_blocks["{shape.name}"].value')
         collection.remove(collection.find(shape.name))
         return {'FINISHED'}
@@ -3,6 +3,8 @@ from typing import Set, TYPE_CHECKING
 from bpy.types import Operator
 from .base import CombinationShapeKeyCreate, COMPAT_ENGINES, COMPAT_OBJECTS
 from ..gui.target_list import CombinationShapeKeyTargetList
+from ..app.graph import combination_graph
+from ..app.index import is_combination_shape_key
 if TYPE_CHECKING:
     from bpy.types import Context, Event
 
@@ -20,13 +22,15 @@ class CombinationShapeKeyDriversSelect(CombinationShapeKeyCreate, Operator):
             if object is not None and object.type in COMPAT_OBJECTS:
                 shape = object.active_shape_key
                 if shape is not None:
-                    key = shape.id_data
-                    return (not key.is_property_set("combination_shape_keys")
-                            or shape.name not in key.combination_shape_keys)
+                    return not is_combination_shape_key(shape.id_data, shape.name)
         return False
 
     def invoke(self, context: 'Context', event: 'Event') -> Set[str]:
-        self.invoke_internal(context.object.data.shape_keys, exclude=(context.object.active_shape_key,))
+        shape = context.object.active_shape_key
+        key = shape.id_data
+        # Combinations that already depend on the shape key can not drive it
+        dependents = combination_graph(key).downstream((shape.name,))
+        self.invoke_internal(key, exclude=[block for block in key.key_blocks if block.name in dependents])
         return context.window_manager.invoke_props_dialog(self, width=300)
 
     def draw(self, context: 'Context') -> None:
@@ -35,5 +39,9 @@ class CombinationShapeKeyDriversSelect(CombinationShapeKeyCreate, Operator):
                                   self, "active_index")
 
     def execute(self, context: 'Context') -> Set[str]:
-        self.execute_internal(context.object.active_shape_key)
+        try:
+            self.execute_internal(context.object.active_shape_key)
+        except ValueError as error:
+            self.report({'ERROR'}, str(error))
+            return {'CANCELLED'}
         return {'FINISHED'}
@@ -1,7 +1,7 @@
 
 from typing import Set, TYPE_CHECKING
 from bpy.types import Operator
-from ..lib.driver_utils import driver_find
+from ..app.index import is_combination_driven
 from .base import COMPAT_ENGINES, COMPAT_OBJECTS
 if TYPE_CHECKING:
     from bpy.types import Context
@@ -20,19 +20,17 @@ class CombinationShapeKeyDriversSolo(Operator):
             if object is not None and object.type in COMPAT_OBJECTS:
                 shape = object.active_shape_key
                 if shape is not None:
-                    key = shape.id_data
-                    return (key.is_property_set("combination_shape_keys")
-                            and shape.name in key.combination_shape_keys
-                            and driver_find(key, f'key_blocks["{shape.name}"].value') is not None)
+                    return is_combination_driven(shape.id_data, shape.name)
         return False
 
     def execute(self, context: 'Context') -> Set[str]:
         shape = context.object.active_shape_key
         key = shape.id_data
 
-        names = [shape.name]
-        for variable in driver_find(key, f'key_blocks["{shape.name}"].value').driver.variables[2:]:
-            names.append(variable.targets[0].data_path[12:-8])
+        names = {shape.name}
+        inputs = key.combination_shape_keys[shape.name].inputs
+        if inputs is not None:
+            names.update(inputs.names)
 
         for item in key.key_blocks[1:]:
             name = item.name
@@ -0,0 +1,101 @@
+
+from typing import Set, TYPE_CHECKING
+import os
+from bpy.types import Operator
+from bpy.props import BoolProperty, StringProperty
+from bpy_extras.io_utils import ExportHelper, ImportHelper
+from ..app.exchange import combinations_export, combinations_import, combinations_read, combinations_write
+from ..app.setup import key_setup_ensure
+from .bake import combination_key_poll
+from .base import COMPAT_ENGINES, COMPAT_OBJECTS
+if TYPE_CHECKING:
+    from bpy.types import Context
+
+
+class CombinationShapeKeysExport(ExportHelper, Operator):
+    bl_idname = 'combination_shape_key.export'
+    bl_label = "Export Combinations"
+    bl_description = "Export the combination shape keys of the active object"
+    bl_options = {'REGISTER'}
+
+    filename_ext = ".json"
+
+    filter_glob: StringProperty(
+        default="*.json;*.npz",
+        options={'HIDDEN'}
+        )
+
+    include_deltas: BoolProperty(
+        name="Include Shapes",
+        description="Store the sparse offsets of each combination shape key (saved as .npz)",
+        default=False,
+        options=set()
+        )
+
+    @classmethod
+    def poll(cls, context: 'Context') -> bool:
+        return combination_key_poll(context)
+
+    def execute(self, context: 'Context') -> Set[str]:
+        key = context.object.data.shape_keys
+        key_setup_ensure(key)
+        data, arrays = combinations_export(key, include_deltas=self.include_deltas)
+        # The file browser appends filename_ext, swap it rather than appending another one
+        root, ext = os.path.splitext(self.filepath)
+        if ext.lower() not in (".json", ".npz"):
+            root += ext
+        filepath = root + (".npz" if self.include_deltas else ".json")
+        combinations_write(filepath, data, arrays)
+        self.report({'INFO'}, f'Exported {len(data["combinations"])} combinations')
+        return {'FINISHED'}
+
+
+class CombinationShapeKeysImport(ImportHelper, Operator):
+    bl_idname = 'combination_shape_key.import'
+    bl_label = "Import Combinations"
+    bl_description = "Import combination shape keys to the active object"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    filter_glob: StringProperty(
+        default="*.json;*.npz",
+        options={'HIDDEN'}
+        )
+
+    replace_from: StringProperty(
+        name="Replace",
+        description="Text to replace in imported shape key names",
+        default="",
+        options=set()
+        )
+
+    replace_to: StringProperty(
+        name="With",
+        description="Replacement text for imported shape key names",
+        default="",
+        options=set()
+        )
+
+    @classmethod
+    def poll(cls, context: 'Context') -> bool:
+        if context.engine in COMPAT_ENGINES:
+            object = context.object
+            return object is not None and object.type in COMPAT_OBJECTS
+        return False
+
+    def execute(self, context: 'Context') -> Set[str]:
+        object = context.object
+        if object.data.shape_keys is not None:
+            key_setup_ensure(object.data.shape_keys)
+
+        try:
+            data, arrays = combinations_read(self.filepath)
+            created, skipped = combinations_import(object, data, arrays, self.replace_from, self.replace_to)
+        except (OSError, ValueError, KeyError) as error:
+            self.report({'ERROR'}, str(error))
+            return {'CANCELLED'}
+
+        for name, reason in skipped.items():
+            self.report({'WARNING'}, f'Skipped {name}: {reason}')
+
+        self.report({'INFO'}, f'Imported {len(created)} combinations')
+        return {'FINISHED'}
@@ -0,0 +1,91 @@
+
+from typing import Set, TYPE_CHECKING
+from bpy.types import Operator
+from bpy.props import EnumProperty, StringProperty
+from ..app.extract import correctives_extract, evaluated_coords, object_coords
+from ..app.mirror import shape_coords
+from ..app.index import is_combination_shape_key
+from .base import COMPAT_ENGINES
+if TYPE_CHECKING:
+    from bpy.types import Context
+
+
+class CombinationShapeKeyCorrectiveExtract(Operator):
+    bl_idname = 'combination_shape_key.corrective_extract'
+    bl_label = "Extract Corrective Shape"
+    bl_description = ("Set the combination shape key so that the current shape key mix matches a "
+                      "sculpted target or the evaluated mesh, removing the contribution of the "
+                      "other shape keys")
+    bl_options = {'REGISTER', 'UNDO'}
+
+    source: EnumProperty(
+        name="Target",
+        description="Where the target pose is read from",
+        items=[
+            ('SELECTED' , "Selected Object", "Another selected mesh with the same vertex count, its active shape key if it has any, without modifiers", 'NONE', 0),
+            ('SHAPE'    , "Shape Key"      , "A shape key of the active object holding the whole pose, e.g. from New Shape from Mix"                 , 'NONE', 1),
+            ('EVALUATED', "Evaluated Mesh" , "The active object's evaluated mesh. Bakes the deformation of all enabled modifiers, including armatures, into the combination", 'NONE', 2),
+            ],
+        default='SELECTED',
+        options=set()
+        )
+
+    shape: StringProperty(
+        name="Shape Key",
+        description="The shape key holding the sculpted pose",
+        default="",
+        options=set()
+        )
+
+    @classmethod
+    def poll(cls, context: 'Context') -> bool:
+        if context.engine in COMPAT_ENGINES:
+            object = context.object
+            if object is not None and object.type == 'MESH':
+                shape = object.active_shape_key
+                return (shape is not None
+                        and shape != shape.id_data.reference_key
+                        and is_combination_shape_key(shape.id_data, shape.name))
+        return False
+
+    def draw(self, context: 'Context') -> None:
+        layout = self.layout
+        layout.prop(self, "source")
+        if self.source == 'SHAPE':
+            layout.prop_search(self, "shape", context.object.data.shape_keys, "key_blocks")
+
+    def execute(self, context: 'Context') -> Set[str]:
+        object = context.object
+        shape = object.active_shape_key
+        key = shape.id_data
+        exclude = ()
+
+        if self.source == 'SELECTED':
+            source = next((item for item in context.selected_objects
+                           if item != object and item.type == 'MESH'), None)
+            if source is None:
+                self.report({'ERROR'}, "Select a sculpted target mesh as well as the active object")
+                return {'CANCELLED'}
+            target = object_coords(source)
+        elif self.source == 'EVALUATED':
+            try:
+                target = evaluated_coords(object, context.evaluated_depsgraph_get())
+            except ValueError as error:
+                self.report({'ERROR'}, str(error))
+                return {'CANCELLED'}
+        else:
+            sculpt = key.key_blocks.get(self.shape)
+            if sculpt is None or sculpt == shape:
+                self.report({'ERROR'}, "Choose the shape key holding the sculpted pose")
+                return {'CANCELLED'}
+            target = shape_coords(sculpt)
+            exclude = (sculpt.name,)
+
+        try:
+            values = correctives_extract(key, {shape.name: target}, exclude)
+        except ValueError as error:
+            self.report({'ERROR'}, str(error))
+            return {'CANCELLED'}
+
+        self.report({'INFO'}, f'Extracted {shape.name} at value {values[shape.name]:.3f}')
+        return {'FINISHED'}
@@ -0,0 +1,53 @@
+
+from typing import Set, TYPE_CHECKING
+from bpy.types import Operator
+from bpy.props import BoolProperty
+from ..app.flatten import combination_flatten, combinations_flatten
+from ..app.index import is_combination_driven
+from ..app.setup import key_setup_ensure
+from .base import COMPAT_ENGINES, COMPAT_OBJECTS
+if TYPE_CHECKING:
+    from bpy.types import Context
+
+
+class CombinationShapeKeyFlatten(Operator):
+    bl_idname = 'combination_shape_key.flatten'
+    bl_label = "Flatten Combination"
+    bl_description = ("Drive the combination directly by the inputs of nested combinations with the "
+                      "same mode and a linear activation, so it no longer waits on them to evaluate")
+    bl_options = {'REGISTER', 'UNDO'}
+
+    all_combinations: BoolProperty(
+        name="All Combinations",
+        description="Flatten every combination shape key of the active object",
+        default=False,
+        options=set()
+        )
+
+    @classmethod
+    def poll(cls, context: 'Context') -> bool:
+        if context.engine in COMPAT_ENGINES:
+            object = context.object
+            if object is not None and object.type in COMPAT_OBJECTS:
+                key = object.data.shape_keys
+                return (key is not None
+                        and key.is_property_set("combination_shape_keys")
+                        and len(key.combination_shape_keys) > 0)
+        return False
+
+    def execute(self, context: 'Context') -> Set[str]:
+        object = context.object
+        key = object.data.shape_keys
+        key_setup_ensure(key)
+
+        if self.all_combinations:
+            count = combinations_flatten(key)
+        else:
+            shape = object.active_shape_key
+            if shape is None or not is_combination_driven(key, shape.name):
+                self.report({'ERROR'}, "The active shape key is not a combination shape key")
+                return {'CANCELLED'}
+            count = combination_flatten(key.combination_shape_keys[shape.name])
+
+        self.report({'INFO'}, f'Replaced {count} nested combinations' if count else "Nothing to flatten")
+        return {'FINISHED'}
@@ -0,0 +1,134 @@
+
+from typing import Set, TYPE_CHECKING
+from bpy.types import Operator
+from bpy.props import BoolProperty, EnumProperty, FloatProperty
+from ..api.combination_shape_key import MODE_ITEMS
+from ..app.manage import combinations_edit, combinations_list, selection_group
+if TYPE_CHECKING:
+    from bpy.types import Context, Event
+
+
+def combination_list_refresh(context: 'Context') -> None:
+    """Rebuilds the scene-wide combination list, keeping the selection"""
+    items = context.window_manager.combination_shape_key_list
+    selected = {(item.key, item.identifier) for item in items if item.is_selected}
+    items.clear()
+    for key, manager in combinations_list():
+        inputs = manager.inputs
+        item = items.add()
+        item.name = manager.name
+        item.key = key.name
+        item.identifier = manager.identifier
+        item.mode = manager.mode
+        item.radius = manager.radius
+        item.variable_count = len(inputs.shapes) if inputs is not None else 0
+        item.is_selected = (key.name, manager.identifier) in selected
+
+
+class CombinationShapeKeysListRefresh(Operator):
+    bl_idname = 'combination_shape_key.list_refresh'
+    bl_label = "Refresh Combinations"
+    bl_description = "List the combination shape keys of every shape key datablock in the file"
+    bl_options = {'INTERNAL'}
+
+    def execute(self, context: 'Context') -> Set[str]:
+        combination_list_refresh(context)
+        return {'FINISHED'}
+
+
+class CombinationShapeKeysListSelect(Operator):
+    bl_idname = 'combination_shape_key.list_select'
+    bl_label = "Select Combinations"
+    bl_description = "Change the selection of listed combination shape keys"
+    bl_options = {'INTERNAL'}
+
+    action: EnumProperty(
+        name="Action",
+        items=[
+            ('SELECT'  , "Select"  , "Select all combinations"        , 'NONE', 0),
+            ('DESELECT', "Deselect", "Deselect all combinations"      , 'NONE', 1),
+            ('INVERT'  , "Invert"  , "Invert the selection"           , 'NONE', 2),
+            ],
+        default='SELECT',
+        options=set()
+        )
+
+    def execute(self, context: 'Context') -> Set[str]:
+        action = self.action
+        for item in context.window_manager.combination_shape_key_list:
+            item.is_selected = action == 'SELECT' or (action == 'INVERT' and not item.is_selected)
+        return {'FINISHED'}
+
+
+class CombinationShapeKeysBulkEdit(Operator):
+    bl_idname = 'combination_shape_key.bulk_edit'
+    bl_label = "Edit Selected Combinations"
+    bl_description = "Change the settings of every selected combination shape key at once"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    use_mode: BoolProperty(name="Set Mode", default=False, options=set())
+
+    mode: EnumProperty(
+        name="Mode",
+        items=MODE_ITEMS,
+        default='MULTIPLY',
+        options=set()
+        )
+
+    use_radius: BoolProperty(name="Set Radius", default=False, options=set())
+
+    radius: FloatProperty(
+        name="Radius",
+        min=0.0,
+        max=1.0,
+        default=1.0,
+        precision=3,
+        options=set()
+        )
+
+    use_target_value: BoolProperty(name="Set Goal", default=False, options=set())
+
+    target_value: FloatProperty(
+        name="Goal",
+        min=0.0,
+        max=10.0,
+        default=1.0,
+        precision=3,
+        options=set()
+        )
+
+    use_clamp: BoolProperty(name="Set Clamp", default=False, options=set())
+
+    clamp: BoolProperty(name="Clamp", default=True, options=set())
+
+    use_mute: BoolProperty(name="Set Mute", default=False, options=set())
+
+    mute: BoolProperty(name="Mute", default=False, options=set())
+
+    @classmethod
+    def poll(cls, context: 'Context') -> bool:
+        return any(item.is_selected for item in context.window_manager.combination_shape_key_list)
+
+    def invoke(self, context: 'Context', _: 'Event') -> Set[str]:
+        return context.window_manager.invoke_props_dialog(self, width=300)
+
+    def draw(self, _: 'Context') -> None:
+        layout = self.layout
+        for name in ("mode", "radius", "target_value", "clamp", "mute"):
+            row = layout.row(heading=self.bl_rna.properties[name].name)
+            row.prop(self, f'use_{name}', text="")
+            subrow = row.row()
+            subrow.enabled = getattr(self, f'use_{name}')
+            subrow.prop(self, name, text="")
+
+    def execute(self, context: 'Context') -> Set[str]:
+        settings = {name: getattr(self, name)
+                    for name in ("mode", "radius", "target_value", "clamp", "mute")
+                    if getattr(self, f'use_{name}')}
+        if not settings:
+            return {'CANCELLED'}
+
+        count = combinations_edit(selection_group(context.window_manager.combination_shape_key_list), settings)
+        combination_list_refresh(context)
+        self.report({'INFO'}, f'Edited {count} combinations')
+        return {'FINISHED'}
@@ -0,0 +1,87 @@
+
+from typing import Set, TYPE_CHECKING
+from bpy.types import Operator
+from bpy.props import CollectionProperty, IntProperty
+from ..api.combination_shape_key_target import CombinationShapeKeyTarget
+from ..app.mirror import combinations_mirror
+from ..app.setup import key_setup_ensure
+from ..gui.target_list import CombinationShapeKeyTargetList
+from ..lib.symmetry import symmetrical_target
+from .base import COMPAT_ENGINES, COMPAT_OBJECTS
+if TYPE_CHECKING:
+    from bpy.types import Context, Event
+
+
+class CombinationShapeKeysMirror(Operator):
+    bl_idname = 'combination_shape_key.mirror_all'
+    bl_label = "Mirror Combination Shape Keys"
+    bl_description = "Duplicate and mirror all or selected combination shape keys and their drivers"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    active_index: IntProperty(
+        name="Combination",
+        min=0,
+        default=0,
+        options={'HIDDEN'}
+        )
+
+    shapes: CollectionProperty(
+        name="Combinations",
+        description="Combination shape keys to mirror. Mirrors all combinations if empty",
+        type=CombinationShapeKeyTarget,
+        options=set()
+        )
+
+    @classmethod
+    def poll(cls, context: 'Context') -> bool:
+        if context.engine in COMPAT_ENGINES:
+            object = context.object
+            if object is not None and object.type in COMPAT_OBJECTS:
+                key = object.data.shape_keys
+                return (key is not None
+                        and key.is_property_set("combination_shape_keys")
+                        and len(key.combination_shape_keys) > 0)
+        return False
+
+    def invoke(self, context: 'Context', _: 'Event') -> Set[str]:
+        key = context.object.data.shape_keys
+        blocks = key.key_blocks
+        shapes = self.shapes
+        shapes.clear()
+        for manager in key.combination_shape_keys:
+            mirror = symmetrical_target(manager.name)
+            if manager.is_valid and mirror and mirror not in blocks:
+                item = shapes.add()
+                item["name"] = manager.name
+                item.is_selected = True
+        self.active_index = 0
+        return context.window_manager.invoke_props_dialog(self, width=300)
+
+    def draw(self, _: 'Context') -> None:
+        self.layout.template_list(CombinationShapeKeyTargetList.bl_idname, "",
+                                  self, "shapes",
+                                  self, "active_index")
+
+    def execute(self, context: 'Context') -> Set[str]:
+        object = context.object
+        key_setup_ensure(object.data.shape_keys)
+        if len(self.shapes):
+            names = [item.name for item in self.shapes if item.is_selected]
+        else:
+            names = [manager.name for manager in object.data.shape_keys.combination_shape_keys]
+
+        try:
+            created, skipped, unmatched = combinations_mirror(object, names)
+        except ValueError as error:
+            self.report({'ERROR'}, str(error))
+            return {'CANCELLED'}
+
+        message = f'Mirrored {len(created)} combination shape keys'
+        if skipped:
+            message += f', skipped {len(skipped)}: ' + "; ".join(f'{name} ({reason})' for name, reason in skipped.items())
+        self.report({'WARNING'} if skipped or unmatched else {'INFO'}, message)
+
+        if unmatched:
+            self.report({'WARNING'}, f'{unmatched} points have no mirrored counterpart and were not mirrored')
+
+        return {'FINISHED'}
@@ -0,0 +1,73 @@
+
+from typing import Set, TYPE_CHECKING
+from bpy.types import Operator
+from bpy.props import IntProperty, StringProperty
+from bpy_extras.io_utils import ExportHelper
+from ..app.profiler import CombinationProfile, combinations_profile, profile_export_csv
+from .bake import combination_key_poll
+if TYPE_CHECKING:
+    from bpy.types import Context, Event
+
+
+class CombinationShapeKeysProfile(Operator):
+    bl_idname = 'combination_shape_key.profile'
+    bl_label = "Profile Combination Shape Keys"
+    bl_description = "Measure the per-frame evaluation cost of each combination shape key over the playback range"
+    bl_options = {'REGISTER'}
+
+    samples: IntProperty(
+        name="Samples",
+        description="Number of frames sampled per measurement",
+        min=1,
+        default=10,
+        options=set()
+        )
+
+    @classmethod
+    def poll(cls, context: 'Context') -> bool:
+        return combination_key_poll(context)
+
+    def execute(self, context: 'Context') -> Set[str]:
+        scene = context.scene
+        key = context.object.data.shape_keys
+        results = combinations_profile(scene, key, scene.frame_start, scene.frame_end, self.samples)
+
+        profile = context.window_manager.combination_shape_key_profile
+        profile.clear()
+        for result in results:
+            item = profile.add()
+            item.name = result.name
+            item.key = result.key
+            item.evaluation_path = result.evaluation_path
+            item.variable_count = result.variable_count
+            item.driver_cost = result.driver_cost
+            item.blend_cost = result.blend_cost
+            item.total_cost = result.total_cost
+
+        self.report({'INFO'}, f'Profiled {len(results)} combination shape keys')
+        return {'FINISHED'}
+
+
+class CombinationShapeKeysProfileExport(ExportHelper, Operator):
+    bl_idname = 'combination_shape_key.profile_export'
+    bl_label = "Export Combination Profile"
+    bl_description = "Export the combination shape key profile as CSV"
+    bl_options = {'REGISTER'}
+
+    filename_ext = ".csv"
+
+    filter_glob: StringProperty(
+        default="*.csv",
+        options={'HIDDEN'}
+        )
+
+    @classmethod
+    def poll(cls, context: 'Context') -> bool:
+        return len(context.window_manager.combination_shape_key_profile) > 0
+
+    def execute(self, context: 'Context') -> Set[str]:
+        rows = [CombinationProfile(item.key, item.name, item.evaluation_path, item.variable_count,
+                                   item.driver_cost, item.blend_cost)
+                for item in context.window_manager.combination_shape_key_profile]
+        profile_export_csv(self.filepath, rows)
+        return {'FINISHED'}
@@ -0,0 +1,141 @@
+
+from typing import Set, TYPE_CHECKING
+from bpy.types import Operator
+from bpy.props import BoolProperty, FloatProperty
+from ..app.index import is_combination_shape_key
+from ..app.sparse import SPARSE_EPSILON, shape_compact, shape_region_assign, sparse_delta
+from .base import COMPAT_ENGINES
+from .bake import combination_key_poll
+if TYPE_CHECKING:
+    from bpy.types import Context
+
+# Vertex groups are only available to meshes and lattices
+REGION_OBJECTS = {'MESH', 'LATTICE'}
+
+
+def epsilon_property():
+    return FloatProperty(
+        name="Threshold",
+        description="Points moved less than this distance are considered unaffected",
+        min=0.0,
+        default=SPARSE_EPSILON,
+        precision=6,
+        options=set()
+        )
+
+
+def overwrite_property():
+    return BoolProperty(
+        name="Replace Vertex Groups",
+        description="Replace vertex groups already assigned to shape keys instead of skipping them",
+        default=False,
+        options=set()
+        )
+
+
+class CombinationShapeKeyRegionAssign(Operator):
+    bl_idname = 'combination_shape_key.region_assign'
+    bl_label = "Restrict Combination to Affected Region"
+    bl_description = ("Assign the points moved by the combination shape key to a vertex group "
+                      "and restrict the shape key to it so unaffected points are skipped")
+    bl_options = {'REGISTER', 'UNDO'}
+
+    epsilon: epsilon_property()
+
+    overwrite: overwrite_property()
+
+    @classmethod
+    def poll(cls, context: 'Context') -> bool:
+        if context.engine in COMPAT_ENGINES:
+            object = context.object
+            if object is not None and object.type in REGION_OBJECTS:
+                shape = object.active_shape_key
+                return shape is not None and is_combination_shape_key(shape.id_data, shape.name)
+        return False
+
+    def execute(self, context: 'Context') -> Set[str]:
+        object = context.object
+        shape = object.active_shape_key
+        group, count = shape_region_assign(object, shape, self.epsilon, overwrite=self.overwrite)
+        shape.id_data.combination_shape_keys[shape.name]["touched"] = count
+        if group is None:
+            self.report({'WARNING'}, f'{shape.name} already uses vertex group {shape.vertex_group}')
+            return {'CANCELLED'}
+        self.report({'INFO'}, f'{shape.name} affects {count} of {len(shape.data)} points ({group.name})')
+        return {'FINISHED'}
+
+
+class CombinationShapeKeysCompact(Operator):
+    bl_idname = 'combination_shape_key.compact'
+    bl_label = "Compact Combination Shape Keys"
+    bl_description = ("Remove sub-threshold noise from all combination shape keys and optionally "
+                      "restrict each to the region it affects")
+    bl_options = {'REGISTER', 'UNDO'}
+
+    epsilon: epsilon_property()
+
+    use_regions: BoolProperty(
+        name="Restrict to Regions",
+        description="Restrict each combination shape key to a vertex group of the points it affects",
+        default=False,
+        options=set()
+        )
+
+    overwrite: overwrite_property()
+
+    @classmethod
+    def poll(cls, context: 'Context') -> bool:
+        return combination_key_poll(context)
+
+    def execute(self, context: 'Context') -> Set[str]:
+        object = context.object
+        key = object.data.shape_keys
+        blocks = key.key_blocks
+        regions = self.use_regions and object.type in REGION_OBJECTS
+
+        snapped = 0
+        touched = 0
+        total = 0
+        kept = 0
+        for manager in key.combination_shape_keys:
+            shape = blocks.get(manager.name)
+            if shape is None:
+                continue
+            count, remaining = shape_compact(shape, self.epsilon)
+            if regions:
+                group, _ = shape_region_assign(object, shape, self.epsilon, overwrite=self.overwrite)
+                kept += group is None
+            manager["touched"] = remaining
+            snapped += count
+            touched += remaining
+            total += len(shape.data)
+
+        self.report({'INFO'}, f'Snapped {snapped} noisy points, combinations affect {touched} of {total} points')
+        if kept:
+            self.report({'WARNING'}, f'{kept} combination shape keys already use a vertex group and were not restricted')
+        return {'FINISHED'}
+
+
+class CombinationShapeKeyAnalyse(Operator):
+    bl_idname = 'combination_shape_key.analyse'
+    bl_label = "Analyse Combination Shape Key"
+    bl_description = "Count the points moved by the combination shape key"
+    bl_options = {'INTERNAL', 'UNDO'}
+
+    epsilon: epsilon_property()
+
+    @classmethod
+    def poll(cls, context: 'Context') -> bool:
+        if context.engine in COMPAT_ENGINES:
+            object = context.object
+            if object is not None:
+                shape = object.active_shape_key
+                return shape is not None and is_combination_shape_key(shape.id_data, shape.name)
+        return False
+
+    def execute(self, context: 'Context') -> Set[str]:
+        shape = context.object.active_shape_key
+        indices, _ = sparse_delta(shape, self.epsilon)
+        shape.id_data.combination_shape_keys[shape.name]["touched"] = len(indices)
+        self.report({'INFO'}, f'{shape.name} affects {len(indices)} of {len(shape.data)} points')
+        return {'FINISHED'}
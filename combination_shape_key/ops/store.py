@@ -0,0 +1,42 @@
+
+from typing import Set, TYPE_CHECKING
+from bpy.types import Operator
+from bpy.props import EnumProperty
+from ..app.migrate import store_migrate
+from ..app.setup import key_setup_ensure
+from .base import COMPAT_ENGINES, COMPAT_OBJECTS
+if TYPE_CHECKING:
+    from bpy.types import Context
+
+
+class CombinationShapeKeysStoreMigrate(Operator):
+    bl_idname = 'combination_shape_key.store_migrate'
+    bl_label = "Migrate Combination Properties"
+    bl_description = "Move the weight and influence of all combinations, including their animation"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    store: EnumProperty(
+        name="Store",
+        description="Where to keep the weight and influence of each combination",
+        items=[
+            ('SHARED', "Shared", "Array properties on the shape key datablock, indexed per combination", 'NONE', 0),
+            ('OWNER' , "Owner" , "A weight and an influence property per combination on the object data", 'NONE', 1),
+            ],
+        default='SHARED',
+        options=set()
+        )
+
+    @classmethod
+    def poll(cls, context: 'Context') -> bool:
+        if context.engine in COMPAT_ENGINES:
+            object = context.object
+            if object is not None and object.type in COMPAT_OBJECTS:
+                return object.data.shape_keys is not None
+        return False
+
+    def execute(self, context: 'Context') -> Set[str]:
+        key = context.object.data.shape_keys
+        key_setup_ensure(key)
+        count = store_migrate(key, self.store == 'SHARED')
+        self.report({'INFO'}, f'Migrated {count} combinations')
+        return {'FINISHED'}
@@ -0,0 +1,61 @@
+
+from typing import Set, TYPE_CHECKING
+import bpy
+from bpy.types import Operator
+from bpy.props import BoolProperty
+from ..app.setup import key_setup_ensure
+from ..app.validate import VALIDATION_ISSUES, combinations_validate, validation_keys, validation_summary
+from .base import COMPAT_ENGINES, COMPAT_OBJECTS
+if TYPE_CHECKING:
+    from bpy.types import Context
+
+
+class CombinationShapeKeysValidate(Operator):
+    bl_idname = 'combination_shape_key.validate'
+    bl_label = "Validate Combinations"
+    bl_description = ("Check combination shape keys for missing shape keys, duplicates, orphaned "
+                      "drivers and properties, reporting them or optionally repairing them")
+    bl_options = {'REGISTER', 'UNDO'}
+
+    all_keys: BoolProperty(
+        name="All Shape Keys",
+        description="Check the combinations of every shape key datablock in the file",
+        default=False,
+        options=set()
+        )
+
+    repair: BoolProperty(
+        name="Repair",
+        description="Fix the problems that are found",
+        default=False,
+        options=set()
+        )
+
+    @classmethod
+    def poll(cls, context: 'Context') -> bool:
+        # Properties are not available here, all_keys runs without an active object
+        return context.engine in COMPAT_ENGINES and len(bpy.data.shape_keys) > 0
+
+    def execute(self, context: 'Context') -> Set[str]:
+        if self.all_keys:
+            keys = tuple(validation_keys())
+        else:
+            object = context.object
+            if object is None or object.type not in COMPAT_OBJECTS or object.data.shape_keys is None:
+                self.report({'ERROR'}, "The active object has no shape keys")
+                return {'CANCELLED'}
+            keys = (object.data.shape_keys,)
+
+        counts = dict.fromkeys(VALIDATION_ISSUES, 0)
+        for key in keys:
+            key_setup_ensure(key)
+            for issue, count in combinations_validate(key, self.repair).items():
+                counts[issue] += count
+
+        if not any(counts.values()):
+            self.report({'INFO'}, f'No problems found in {len(keys)} shape key datablocks')
+        elif self.repair:
+            self.report({'INFO'}, f'Repaired {validation_summary(counts)}')
+        else:
+            self.report({'WARNING'}, f'Found {validation_summary(counts)}')
+        return {'FINISHED'}
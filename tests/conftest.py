@@ -0,0 +1,27 @@
+"""
+The add-on package imports bpy on import, so modules that only depend on the standard
+library and NumPy are loaded directly from their files to test them without Blender.
+"""
+
+import importlib.util
+import os
+import pytest
+
+PACKAGE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "combination_shape_key")
+
+
+def module_load(path: str):
+    spec = importlib.util.spec_from_file_location(path.replace("/", "_")[:-3], os.path.join(PACKAGE, path))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="session")
+def evaluator():
+    return module_load("lib/evaluator.py")
+
+
+@pytest.fixture(scope="session")
+def naming():
+    return module_load("app/naming.py")
@@ -0,0 +1,127 @@
+import numpy as np
+import pytest
+
+# Flat handles at a third of the segment width make x(t) == t and y(t) smoothstep
+SMOOTHSTEP_BEZIER = np.array([[[0.0, 0.0], [-1.0/3.0, 0.0], [1.0/3.0, 0.0]],
+                              [[1.0, 1.0], [ 2.0/3.0, 1.0], [4.0/3.0, 1.0]]])
+
+
+def smoothstep(x):
+    x = np.clip(x, 0.0, 1.0)
+    return x * x * (3.0 - 2.0 * x)
+
+
+def test_bezier_linear(evaluator):
+    x = np.linspace(0.0, 1.0, 101)
+    np.testing.assert_allclose(evaluator.bezier_evaluate(evaluator.LINEAR_BEZIER, x), x, atol=1e-12)
+
+
+def test_bezier_exact_at_knots(evaluator):
+    for bezier in (evaluator.LINEAR_BEZIER, SMOOTHSTEP_BEZIER):
+        result = evaluator.bezier_evaluate(bezier, np.array([0.0, 1.0]))
+        assert result[0] == 0.0
+        assert result[1] == 1.0
+
+
+def test_bezier_smoothstep(evaluator):
+    x = np.linspace(0.0, 1.0, 257)
+    np.testing.assert_allclose(evaluator.bezier_evaluate(SMOOTHSTEP_BEZIER, x), smoothstep(x), atol=1e-10)
+
+
+def test_bezier_outside_range(evaluator):
+    x = np.array([-0.5, 1.5])
+    np.testing.assert_array_equal(evaluator.bezier_evaluate(evaluator.LINEAR_BEZIER, x), [0.0, 1.0])
+    np.testing.assert_allclose(evaluator.bezier_evaluate(evaluator.LINEAR_BEZIER, x, extrapolate=True), x)
+    np.testing.assert_array_equal(evaluator.bezier_evaluate(SMOOTHSTEP_BEZIER, x, extrapolate=True), [0.0, 1.0])
+
+
+def test_keyframes_interpolation(evaluator):
+    bezier = np.array([[[0.0, 0.0], [-0.5, 0.0], [0.5, 0.0]],
+                       [[1.0, 1.0], [ 0.5, 1.0], [1.5, 1.0]],
+                       [[2.0, 3.0], [ 1.5, 3.0], [2.5, 3.0]]])
+    x = np.array([0.5, 1.5, 2.5])
+    constant = [evaluator.INTERPOLATION_CONSTANT] * 3
+    linear = [evaluator.INTERPOLATION_LINEAR] * 3
+    np.testing.assert_array_equal(evaluator.keyframes_evaluate(bezier, constant, x), [0.0, 1.0, 3.0])
+    np.testing.assert_allclose(evaluator.keyframes_evaluate(bezier, linear, x), [0.5, 2.0, 3.0])
+    np.testing.assert_allclose(evaluator.keyframes_evaluate(bezier, linear, x, extrapolate=True), [0.5, 2.0, 4.0])
+
+
+@pytest.mark.parametrize("mode, expected", [
+    ('MULTIPLY', [0.0, 0.25, 0.5]),
+    ('MIN'     , [0.0, 0.5, 0.5]),
+    ('MAX'     , [0.5, 0.5, 1.0]),
+    ('AVERAGE' , [0.25, 0.5, 0.75]),
+    ])
+def test_combine(evaluator, mode, expected):
+    inputs = np.array([[0.0, 0.5, 1.0],
+                       [0.5, 0.5, 0.5]])
+    np.testing.assert_allclose(evaluator.combine(mode, inputs), expected)
+
+
+def test_combine_invalid(evaluator):
+    with pytest.raises(ValueError):
+        evaluator.combine('SUM', np.ones((2, 1)))
+    np.testing.assert_array_equal(evaluator.combine('MULTIPLY', np.empty((0, 3))), np.zeros(3))
+
+
+def test_activation_radius_and_goal(evaluator):
+    settings = evaluator.CombinationSettings(radius=0.5, target_value=2.0)
+    x = np.array([0.0, 0.5, 0.75, 1.0])
+    np.testing.assert_allclose(evaluator.activation_evaluate(settings, x), [0.0, 0.0, 1.0, 2.0])
+
+
+def test_activation_zero_radius(evaluator):
+    settings = evaluator.CombinationSettings(radius=0.0)
+    x = np.array([0.0, 0.999, 1.0])
+    np.testing.assert_array_equal(evaluator.activation_evaluate(settings, x), [0.0, 0.0, 1.0])
+
+
+def test_activation_clamp(evaluator):
+    x = np.array([1.5])
+    clamped = evaluator.CombinationSettings(clamp=True)
+    unclamped = evaluator.CombinationSettings(clamp=False)
+    assert evaluator.activation_evaluate(clamped, x)[0] == 1.0
+    assert evaluator.activation_evaluate(unclamped, x)[0] == pytest.approx(1.5)
+
+
+def test_evaluate(evaluator):
+    settings = [
+        evaluator.CombinationSettings(mode='MULTIPLY', weight=0.5),
+        evaluator.CombinationSettings(mode='MAX', curve=SMOOTHSTEP_BEZIER),
+        evaluator.CombinationSettings(mode='MIN', clamp=False, slider_max=1.2),
+        ]
+    inputs = [np.array([[1.0, 0.5], [1.0, 1.0]]),
+              np.array([[0.5, 0.0], [0.25, 0.0]]),
+              np.array([[2.0, 0.5], [3.0, 1.0]])]
+    expected = [[0.5, 0.25],
+                [smoothstep(0.5), 0.0],
+                [1.2, 0.5]]
+    np.testing.assert_allclose(evaluator.evaluate(settings, inputs, exact=True), expected, atol=1e-10)
+
+
+def test_evaluate_length_mismatch(evaluator):
+    with pytest.raises(ValueError):
+        evaluator.evaluate([evaluator.CombinationSettings()], [])
+
+
+def test_lookup_matches_exact(evaluator):
+    x = np.linspace(-0.5, 1.5, 4001)
+    for clamp in (True, False):
+        settings = evaluator.CombinationSettings(curve=SMOOTHSTEP_BEZIER, radius=0.5, target_value=2.0, clamp=clamp)
+        np.testing.assert_allclose(evaluator.activation_lookup_evaluate(settings, x),
+                                   evaluator.activation_evaluate(settings, x), atol=2e-6)
+
+
+def test_input_sources(evaluator):
+    names = ["static", "keyed", "driven", "keyed_driven"]
+    animated = {"keyed", "keyed_driven"}
+    driven = {"driven", "keyed_driven"}
+    assert evaluator.input_sources(names, animated, driven) == {
+        "static": evaluator.SOURCE_STATIC,
+        "keyed": evaluator.SOURCE_FCURVE,
+        "driven": evaluator.SOURCE_FRAMES,
+        "keyed_driven": evaluator.SOURCE_FRAMES,
+        }
+    layered = evaluator.input_sources(names, animated, driven, layered=True)
+    assert set(layered.values()) == {evaluator.SOURCE_FRAMES}
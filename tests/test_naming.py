@@ -0,0 +1,102 @@
+from types import SimpleNamespace
+import pytest
+
+
+def test_variable_name(naming):
+    assert [naming.variable_name(index) for index in (0, 1, 25, 26, 51, 52, 53)] == \
+        ["a", "b", "z", "A", "Z", "aa", "ab"]
+
+
+def test_variable_name_round_trip(naming):
+    for index in range(3000):
+        assert naming.variable_index(naming.variable_name(index)) == index
+
+
+@pytest.mark.parametrize("name", ["", "a1", "w_", "combination_abc"])
+def test_variable_index_invalid(naming, name):
+    assert naming.variable_index(name) is None
+
+
+def test_variable_names_skip_reserved(naming):
+    names = list(naming.variable_names(3000))
+    assert len(names) == len(set(names)) == 3000
+    assert naming.RESERVED_NAMES.isdisjoint(names)
+    assert names[:5] == ["a", "b", "c", "d", "f"]
+
+
+def test_allocator_reuses_lowest_released(naming):
+    allocator = naming.VariableAllocator(["combination_x", "w_", "i_", "a", "b", "c"])
+    allocator.release("c")
+    allocator.release("a")
+    assert allocator.allocate() == "a"
+    assert allocator.allocate() == "c"
+    assert allocator.allocate() not in {"a", "b", "c"}
+
+
+def test_allocator_skips_used_and_reserved(naming):
+    allocator = naming.VariableAllocator(["a", "c", "d"])
+    assert allocator.allocate() == "b"
+    # "e" is a driver expression constant
+    assert allocator.allocate() == "f"
+
+
+class Variables:
+    """Stands in for DriverVariables, counting how often it is iterated over"""
+
+    def __init__(self, *names):
+        self.items = [SimpleNamespace(name=name) for name in names]
+        self.iterations = 0
+
+    def __len__(self):
+        return len(self.items)
+
+    def __getitem__(self, index):
+        return self.items[index]
+
+    def __iter__(self):
+        self.iterations += 1
+        return iter(self.items)
+
+    def find(self, name):
+        return next((index for index, item in enumerate(self.items) if item.name == name), -1)
+
+    def new(self, name):
+        self.items.append(SimpleNamespace(name=name))
+
+    def remove(self, name):
+        self.items.remove(next(item for item in self.items if item.name == name))
+
+
+KEY = SimpleNamespace(as_pointer=lambda: 1)
+
+
+def test_allocator_rebuilt_after_outside_changes(naming):
+    naming.variable_allocators_clear()
+    variables = Variables("a", "b", "c")
+    naming.variable_allocator(KEY, "combination_x", variables).release("b")
+    variables.remove("b")
+    # Undo restores "b", then "a" is removed by hand, keeping the count and the last name
+    variables = Variables("b", "c")
+    name = naming.variable_allocator(KEY, "combination_x", variables).allocate()
+    assert name not in {"b", "c"}
+    variables.new(name)
+    # A variable added by hand changes the count
+    variables.new("d" if name != "d" else "f")
+    assert naming.variable_allocator(KEY, "combination_x", variables).allocate() not in {item.name for item in variables}
+    naming.variable_allocators_clear()
+
+
+def test_allocator_constant_per_add(naming):
+    naming.variable_allocators_clear()
+    variables = Variables("combination_x", "w_", "i_")
+    for _ in range(2000):
+        variables.new(naming.variable_allocator(KEY, "combination_x", variables).allocate())
+    allocator = naming.variable_allocator(KEY, "combination_x", variables)
+    for name in ("a", variables[-1].name):
+        allocator.release(name)
+        variables.remove(name)
+        allocator = naming.variable_allocator(KEY, "combination_x", variables)
+    assert allocator.allocate() == "a"
+    assert variables.iterations == 1
+    assert len({item.name for item in variables.items}) == 2001
+    naming.variable_allocators_clear()